@@ -23,13 +23,24 @@ def main(argv):
     file_dir = os.path.split(os.path.realpath(__file__))[0]
     bin_dir = os.path.join(file_dir, "bin")
 
-    # Call Bash Py, except don't take SIGINT KeyboardInterrupt's from it
-
     bin_bash_py = os.path.join(bin_dir, "bash.py")
+    bash_argv = [bin_bash_py] + ["-i"] + argv[1:]
+
+    # Call Bash Py in a fork of this process, the same way Bash Py calls "vi.py"
+
+    if hasattr(os, "fork"):
+        sys.path.insert(0, bin_dir)
+        import bash
+
+        returncode = bash.fork_verb_module(bash, argv=bash_argv)
+        sys.exit(returncode)
+
+    # Else call Bash Py, except don't take SIGINT KeyboardInterrupt's from it
+
     handler = signal.SIG_IGN  # no KwArgs for 'signal.signal' till later Python
     with_handler = signal.signal(signal.SIGINT, handler)
     try:
-        ran = subprocess_run([bin_bash_py] + ["-i"] + argv[1:])
+        ran = subprocess_run(bash_argv)
     finally:
         signal.signal(signal.SIGINT, with_handler)
     sys.exit(ran.returncode)
@@ -1,104 +1,290 @@
 #!/usr/bin/env python3
 
-r"""
-usage: _base58.py
-
-demo SNakamoto/ MSporny https://tools.ietf.org/html/draft-msporny-base58-02
-
-wrong-headed because Ietf draft doesn't make clear:
+"""
+usage: _base58.py [-h] [-d] [-c] [-x] [FILE ...]
 
-  it's about converting a wide natural numbers between Base 2^N and Base 58
+encode each line as base58 chars, or decode them back, like for bitcoin addresses
 
-  like correctly encoding the b"\xFF\xFF" of Base 100 into Base 58 gives us b"LUv"
+positional arguments:
+  FILE          a file of lines to encode or decode (default: stdin)
 
-    65535 % 58 = 53  # b"v"
-    65535 // 58 = 1129
-    1129 % 58 = 27  # b"U"
-    1129 // 58 = 19  # b"L"
+options:
+  -h, --help    show this help message and exit
+  -d, --decode  decode base58 chars back into bytes
+  -c, --check   add a 4 byte checksum when encoding, or check and drop it when decoding
+  -x, --hex     take or give the bytes spelled as hex digits, not as they are
 
-wrong answers from revisions of "def b58encode":
+quirks:
+  spells each leading zero byte as one "1" char, and each leading "1" as one zero byte
+  converts long lines between base 2**8 and base 58 by divide and conquer, not digit by digit
+  checksums with the first 4 bytes of two rounds of sha256, like the bitcoin base58check
+  writes an empty line in place of each line it can't decode, and then exits nonzero
+  follows SNakamoto/ MSporny https://tools.ietf.org/html/draft-msporny-base58-02
 
-  b'oGU3JqabjWkQ'
-  b'mRp4L4W7xW8gjqimnjEXTX9oF9XKv14bur4GQ1VcyaC2'
-  b'11ZbCh'
+unsurprising quirks:
+  prompts for stdin, like mac bash "grep -R .", unlike bash "base58"
+  accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
+  takes "-" as meaning "/dev/stdin"
 
 examples:
-
-  black bin/_base58.py && python3 -i bin/_base58.py
-
+  echo -n 'Hello World!' |_base58.py  # 2NEpo7TZRRrLZSi2U
+  echo 2NEpo7TZRRrLZSi2U |_base58.py -d  # Hello World!
+  echo 0000287FB4CD |_base58.py -x  # 11233QC4
+  echo 00010966776006953D5567439E5E39F86A0D273BEE |_base58.py -cx  # 16UwLL9Risc...
+  _base58.py -dcx addresses.txt >hashes.txt  # decode millions of addresses
 """
 
+
+import contextlib
+import hashlib
+import os
 import string
+import sys
+
+import argdoc
+
 
 B58 = set(string.digits + string.ascii_uppercase + string.ascii_lowercase)
 B58 = "".join(sorted(B58 - set("0OIl"))).encode()
 assert B58 == b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
 assert len(B58) == 58 == 10 + 26 + 26 - 4
 
+B58_PAIRS = list(bytes([B58[_ // 58], B58[_ % 58]]) for _ in range(58 * 58))
+B58_DIGITS = bytes.maketrans(B58, bytes(range(58)))  # look up the value of each char
 
-def b58decode(coded_bytes):
+SMALL_DIGITS = 64  # convert up to this many base58 digits digit by digit
+SMALL_BITS = 384  # convert up to this many bits digit by digit, two digits at a time
 
-    carry = 0
+B58_POWERS = [58]  # the powers 58 ** (2 ** k), grown as needed
 
-    for coded in coded_bytes:
+CHECKSUM_SIZE = 4
 
-        carry = B58.index(coded)  # may raise ValueError: subsection not found
 
-        # remainder = carry % len(B58)
-        carry = carry // len(B58)
+def main(argv):
 
-    return b"NotImplementedError"
+    args = argdoc.parse_args(argv[1:])
 
+    paths = args.files if args.files else ["-"]
 
-def b58encode(plain_bytes):
+    if "-" in paths:
+        prompt_tty_stdin()
 
-    b58_bytearray = bytearray()  # FIXME: consider bytes() in place of bytearray()
-    encoding_flag = False
-    zero_counter = 0
-    carry = 0
+    exit_status = None
+    for path in paths:
+        readable = "/dev/stdin" if (path == "-") else path
+        try:
+            with open(readable, mode="rb") as incoming:
+                if not b58_lines(incoming, args=args):
+                    exit_status = 1
+        except OSError as exc:
+            stderr_print("_base58.py: error: {}: {}".format(type(exc).__name__, exc))
+            exit_status = 1
 
-    for plain in plain_bytes:
+    return exit_status
 
-        if not encoding_flag:
 
-            if plain == 0:
-                zero_counter += 1
-            else:
-                encoding_flag = True
+def b58_lines(incoming, args):
+    """Encode or decode each line, and return False if any line goes wrong"""
 
-        if encoding_flag:
+    ofile = sys.stdout.buffer
 
-            carry += 0x100 * plain
+    ok = True
+    lines = list()
+    for (index, line) in enumerate(incoming):
+        try:
+            lines.append(b58_line(line.rstrip(b"\r\n"), args=args) + b"\n")
+        except ValueError as exc:
+            stderr_print("_base58.py: error: line {}: {}".format(index + 1, exc))
+            lines.append(b"\n")
+            ok = False
 
-            encoded = B58[carry % len(B58)]
-            carry = carry // len(B58)
+        if len(lines) >= 1024:
+            ofile.write(b"".join(lines))
+            lines = list()
+
+    ofile.write(b"".join(lines))
+    ofile.flush()
+
+    return ok
+
+
+def b58_line(line, args):
+    """Encode or decode one line"""
+
+    if args.decode:
+        plain = b58check_decode(line) if args.check else b58decode(line)
+        encoded = plain.hex().upper().encode() if args.hex else plain
+    else:
+        plain = bytes.fromhex(line.decode()) if args.hex else line
+        encoded = b58check_encode(plain) if args.check else b58encode(plain)
+
+    return encoded
+
+
+def b58encode(plain_bytes):
+    """Encode bytes as base58 chars"""
 
-            b58_bytearray += bytearray([encoded])
+    stripped = plain_bytes.lstrip(b"\x00")
+    zero_counter = len(plain_bytes) - len(stripped)
 
+    natural = int.from_bytes(stripped, byteorder="big")
     b58_encoding = zero_counter * b"1"
-    b58_encoding += bytes(b58_bytearray)
+    if natural:
+        b58_encoding += b58encode_natural(natural)
 
     return b58_encoding
 
 
-def b58test(plain_bytes, coded_bytes):
-    print(plain_bytes)
-    print(b58decode(coded_bytes))
-    print(coded_bytes)
-    print(b58encode(plain_bytes))
-    print()
+def b58encode_natural(natural, width=0):
+    """Spell a natural number in base 58, padded with leading "1" zeroes to the width"""
 
+    # Spell small numbers two digits at a time
+
+    if natural.bit_length() <= SMALL_BITS:
+        pairs = list()
+        while natural:
+            (natural, pair) = divmod(natural, 58 * 58)
+            pairs.append(B58_PAIRS[pair])
+
+        spelled = b"".join(reversed(pairs)).lstrip(b"1")
+
+        return spelled.rjust(width, b"1")
+
+    # Split large numbers in half, near the square root, and spell each half
+
+    while B58_POWERS[-1] <= natural:
+        B58_POWERS.append(B58_POWERS[-1] * B58_POWERS[-1])
+
+    power_index = len(B58_POWERS) - 2
+    while B58_POWERS[power_index] > natural:
+        power_index -= 1
+
+    (high, low) = divmod(natural, B58_POWERS[power_index])
+    low_width = 2**power_index
+
+    spelled = b58encode_natural(high) + b58encode_natural(low, width=low_width)
+
+    return spelled.rjust(width, b"1")
+
+
+def b58decode(coded_bytes):
+    """Decode base58 chars back into bytes"""
+
+    if coded_bytes.translate(None, B58):
+        raise ValueError("invalid base58 char in {!r}".format(coded_bytes))
+
+    stripped = coded_bytes.lstrip(b"1")
+    zero_counter = len(coded_bytes) - len(stripped)
+
+    natural = b58decode_natural(stripped.translate(B58_DIGITS))
+    length = (natural.bit_length() + 7) // 8
+
+    plain_bytes = zero_counter * b"\x00" + natural.to_bytes(length, byteorder="big")
+
+    return plain_bytes
 
-if __name__ == "__main__":
 
-    b58test(b"Hello World!", coded_bytes=b"2NEpo7TZRRrLZSi2U")
+def b58decode_natural(digits):
+    """Add up the values of the base58 digits, given in order of greatest place first"""
 
-    b58test(
-        b"The quick brown fox jumps over the lazy dog.",
-        coded_bytes=b"USm3fpXnKG5EUBx2ndxBDMPVciP5hGey2Jh4NDv6gmeo1LkMeiKrLJUUBk6Z",
-    )
+    # Add up few digits one at a time
 
-    b58test(b"\x00\x00\x28\x7F\xB4\xCD", coded_bytes=b"111233QC4")
+    if len(digits) <= SMALL_DIGITS:
+        natural = 0
+        for digit in digits:
+            natural = natural * 58 + digit
+
+        return natural
+
+    # Split many digits in half, and add up each half
+
+    power_index = (len(digits) - 1).bit_length() - 1
+    while len(B58_POWERS) <= power_index:
+        B58_POWERS.append(B58_POWERS[-1] * B58_POWERS[-1])
+
+    low_width = 2**power_index
+
+    high = b58decode_natural(digits[:-low_width])
+    low = b58decode_natural(digits[-low_width:])
+
+    natural = high * B58_POWERS[power_index] + low
+
+    return natural
+
+
+def b58check_encode(payload):
+    """Encode bytes as base58 chars, after adding a checksum"""
+
+    return b58encode(payload + b58check_sum(payload))
+
+
+def b58check_decode(coded_bytes):
+    """Decode base58 chars back into bytes, after checking and dropping the checksum"""
+
+    plain_bytes = b58decode(coded_bytes)
+    payload = plain_bytes[:-CHECKSUM_SIZE]
+    checksum = plain_bytes[-CHECKSUM_SIZE:]
+
+    if (len(plain_bytes) < CHECKSUM_SIZE) or (checksum != b58check_sum(payload)):
+        raise ValueError("invalid base58check checksum in {!r}".format(coded_bytes))
+
+    return payload
+
+
+def b58check_sum(payload):
+    """Take the leading bytes of two rounds of sha256 as the checksum"""
+
+    digest = hashlib.sha256(hashlib.sha256(payload).digest()).digest()
+
+    return digest[:CHECKSUM_SIZE]
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
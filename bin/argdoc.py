@@ -65,6 +65,8 @@ import textwrap
 
 _89_COLUMNS = 89  # the Black app for styling Python promotes 89 columns per line
 
+_PARSERS_BY_DOC = dict()  # the Parser compiled from each Doc, such as for "bash.py"
+
 
 def b():
     """Break into the Debugger when called"""
@@ -1353,17 +1355,22 @@ def parse_args(args=None, namespace=None, doc=None):
 
     f = inspect.currentframe()
     (alt_doc, alt_file) = module_find_doc_and_file(doc=doc, f=f)
-    parser = ArgumentParser(doc=alt_doc)
-    try:
-        parser_exit_unless_doc_eq(parser, doc=alt_doc)  # Constrain Parse Args Doc
-    except SystemExit:
-        stderr_print(
-            "{}: error: Doc doesn't match Parser compiled from Doc".format(
-                os.path.basename(alt_file)
+
+    parser = _PARSERS_BY_DOC.get(alt_doc)  # compile and check each Doc just once
+    if parser is None:
+        parser = ArgumentParser(doc=alt_doc)
+        try:
+            parser_exit_unless_doc_eq(parser, doc=alt_doc)  # Constrain Parse Args Doc
+        except SystemExit:
+            stderr_print(
+                "{}: error: Doc doesn't match Parser compiled from Doc".format(
+                    os.path.basename(alt_file)
+                )
             )
-        )
 
-        raise
+            raise
+
+        _PARSERS_BY_DOC[alt_doc] = parser
 
     alt_namespace = parser.parse_args(alt_argv, namespace=namespace)
     assert (not namespace) or (alt_namespace is namespace)
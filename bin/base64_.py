@@ -1,11 +1,184 @@
 #!/usr/bin/env python3
 
-# quirks:
-# doesn't redefine the 'import base64' of https://docs.python.org/3/library/base64.html
+"""
+usage: base64_.py [-h] [-d] [-i] [-w COLS] [FILE]
 
+encode bytes as base64 chars, or decode them back, a chunk at a time
+
+positional arguments:
+  FILE                  the file to encode or decode (default: stdin)
+
+options:
+  -h, --help            show this help message and exit
+  -d, --decode          decode base64 chars back into bytes
+  -i, --ignore-garbage  drop chars outside the base64 alphabet, when decoding
+  -w COLS, --wrap COLS  break lines after this many chars, or never if 0 (default: 76)
+
+quirks:
+  reads chunks of whole lines of bytes, so holds only about one MiB in memory at a time
+  rejects chars outside the base64 alphabet, unless told to "-i" ignore them
+  drops the line breaks between chars when decoding, wherever they fall
+
+unsurprising quirks:
+  prompts for stdin, like mac bash "grep -R .", unlike bash "base64"
+  accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
+  takes "-" as meaning "/dev/stdin", like linux "base64 -"
+  doesn't redefine the "import base64" of https://docs.python.org/3/library/base64.html
+
+examples:
+  echo -n 'Hello' |base64_.py  # SGVsbG8=
+  echo SGVsbG8= |base64_.py -d && echo  # Hello
+  base64_.py -w 0 base64_.py |base64_.py -d |diff -brq - base64_.py  # round-trip
+"""
+
+
+import binascii
+import contextlib
+import os
+import string
 import sys
 
-sys.stderr.write("base64.py: error: not implemented\n")
-sys.exit(2)  # exit 2 from rejecting usage
+import argdoc
+
+
+CHUNK_SIZE = 1024 * 1024  # read about one MiB at a time
+
+BASE64_ALPHABET = (string.ascii_letters + string.digits + "+/=").encode()
+BASE64_GARBAGE = bytes(_ for _ in range(0x100) if _ not in BASE64_ALPHABET)
+WHITESPACE = string.whitespace.encode()
+
+
+def main(argv):
+
+    args = argdoc.parse_args(argv[1:])
+
+    try:
+        cols = 76 if (args.wrap is None) else int(args.wrap)
+    except ValueError:
+        cols = -1
+    if cols < 0:
+        stderr_print("base64.py: error: invalid wrap size: {!r}".format(args.wrap))
+        sys.exit(2)  # exit 2 from rejecting usage
+
+    # Encode or decode the file
+
+    path = "-" if (args.file is None) else args.file
+
+    if path == "-":
+        prompt_tty_stdin()
+
+    readable = "/dev/stdin" if (path == "-") else path
+    ofile = sys.stdout.buffer
+    try:
+        with open(readable, mode="rb") as incoming:
+            if args.decode:
+                base64_decode(incoming, ofile=ofile, ignoring=args.ignore_garbage)
+            else:
+                base64_encode(incoming, ofile=ofile, cols=cols)
+    except (OSError, ValueError) as exc:
+        stderr_print("base64.py: error: {}: {}".format(type(exc).__name__, exc))
+        sys.exit(1)
+
+
+def base64_encode(incoming, ofile, cols):
+    """Encode chunks of 3 * COLS bytes, as whole lines of 4 * COLS chars"""
+
+    if not cols:
+        chunk_size = 3 * (CHUNK_SIZE // 3)
+    else:
+        chunk_size = 3 * cols * max(1, CHUNK_SIZE // (3 * cols))
+
+    while True:
+        chunk = incoming.read(chunk_size)  # waits to fill the chunk, else to hit end
+        if not chunk:
+            break
+
+        coded = binascii.b2a_base64(chunk, newline=False)
+        if cols:
+            lines = list(coded[_ : (_ + cols)] for _ in range(0, len(coded), cols))
+            coded = b"\n".join(lines) + b"\n"
+
+        ofile.write(coded)
+
+    ofile.flush()
+
+
+def base64_decode(incoming, ofile, ignoring):
+    """Decode chunks of 4 * N chars, carrying the odd chars into the next chunk"""
+
+    held = b""
+    while True:
+        chunk = incoming.read(CHUNK_SIZE)
+
+        # Drop the line breaks, and drop or reject the other garbage
+
+        coding = chunk.translate(None, WHITESPACE)
+        if ignoring:
+            coding = coding.translate(None, BASE64_GARBAGE)
+        elif coding.translate(None, BASE64_ALPHABET):
+            raise ValueError("invalid input")
+
+        # Decode the whole quads of chars, and hold back the rest
+
+        held += coding
+
+        end = len(held) if not chunk else (len(held) - (len(held) % 4))
+        if end:
+            ofile.write(binascii.a2b_base64(held[:end]))
+            held = held[end:]
+
+        if not chunk:
+            break
+
+    ofile.flush()
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
+
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
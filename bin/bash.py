@@ -14,6 +14,12 @@ quirks:
   returns exit status 127, not 258, for ⌃D EOF pressed while ' or "" input quote open
   changes exit status after next line of input, no matter if input is blank
   defines "--interact" to expand on "-i", whereas "bash" doesn't bother
+  runs most verbs inside this process, importing each verb just once, till edited
+  runs "vi.py", "dd.py", and the other verbs that take the tty, in a fork of this process
+  runs each stage of a "|" pipeline at once, each in a fork of this process
+  takes the redirections "<", ">", ">>", "2>", "2>>", and "2>&1", but no others
+  runs the verbs of its own dir first, then the commands of the $PATH dirs
+  remembers where it found each verb, like "hash", rescanning dirs only when a verb is missing
   leaves most of "bash" unimplemented
 
 examples:
@@ -31,13 +37,19 @@ from __future__ import print_function
 
 import argparse
 import collections
+import functools
 import getpass
+import importlib.util
+import inspect
 import os
 import platform
+import re
 import shlex
+import signal
 import subprocess
 import sys
 import textwrap
+import traceback
 
 import argdoc
 
@@ -46,6 +58,18 @@ import read
 
 FILE_DIR = os.path.split(os.path.realpath(__file__))[0]  # sample before 1st "os.chdir"
 
+FORKING_VERBS = "bash dd help read vi".split()  # run these in a process of their own
+
+VERB_MODULES = dict()  # the (st_mtime_ns, module, forking) of each verb file imported
+
+COMMAND_DIRS = dict()  # the (st_mtime_ns, verbs) of each dir scanned for verbs
+COMMAND_TABLE = dict()  # the wherewhat of each verb found in the dirs, first dir first
+COMMAND_HITS = dict()  # the count of runs of each verb remembered, like Bash "hash"
+
+SH_OPERATORS = "2>&1 2>> 2> >> > < |".split()  # try the longer operators first
+
+ShStage = collections.namedtuple("ShStage", "argv redirects".split())
+
 
 def main(argv):
     _ = argv
@@ -97,9 +121,23 @@ def main(argv):
 
 def compile_and_run_shline(shline):
 
-    argv = _parse_shline(shline)
-    how = _compile_shline(shline, argv=argv)
-    returncode = how(argv)
+    stages = _parse_shline(shline)
+
+    # Run one verb with no redirections, inside this process if it can
+
+    if (not stages) or ((len(stages) == 1) and not stages[0].redirects):
+        argv = stages[0].argv if stages else None
+        how = _compile_shline(shline, argv=argv)
+        returncode = how(argv)
+
+        return returncode
+
+    # Else run the one stage with its redirections, or run all the stages at once
+
+    if len(stages) == 1:
+        returncode = run_redirected_stage(stages[0])
+    else:
+        returncode = run_piped_stages(stages)
 
     return returncode
 
@@ -261,34 +299,217 @@ def builtin_history(argv):
     return None
 
 
+def builtin_hash(argv):
+    """
+    usage: hash [-h] [-r] [NAME ...]
+
+    remember where each verb is found, or forget
+
+    positional arguments:
+      NAME        a verb to find and remember
+
+    options:
+      -h, --help  show this help message and exit
+      -r          forget where every verb was found
+
+    examples:
+      hash
+      hash -r
+    """
+
+    doc = textwrap.dedent(builtin_hash.__doc__).strip()
+    try:
+        args = argdoc.parse_args(args=argv[1:], doc=doc)
+    except SystemExit as exc:
+        returncode = exc.code
+
+        return returncode
+
+    if args.r:
+        COMMAND_DIRS.clear()
+        COMMAND_TABLE.clear()
+        COMMAND_HITS.clear()
+
+    # Find and remember each verb
+
+    returncode = None
+    for name in args.names:
+        if find_command(name):
+            COMMAND_HITS.setdefault(name, 0)
+        else:
+            stderr_print("bash.py: hash: {}: not found".format(name))
+            returncode = 1
+
+    # Else list the verbs remembered
+
+    if not (args.r or args.names):
+        if not COMMAND_HITS:
+            print("hash: hash table empty")
+        else:
+            print("hits\tcommand")
+            for (verb, hits) in COMMAND_HITS.items():
+                print("{:4d}\t{}".format(hits, COMMAND_TABLE[verb]))
+
+    return returncode
+
+
 def builtin_pass(argv):  # think more about  $ : --help
     _ = argv
     # FIXME: stop zeroing last exit status "$?" at each blank input line
 
 
+def builtin_type(argv):
+    """
+    usage: type [-h] [NAME ...]
+
+    say how each verb would run
+
+    positional arguments:
+      NAME        a verb to look up
+
+    options:
+      -h, --help  show this help message and exit
+
+    examples:
+      type cd ls seq
+    """
+
+    doc = textwrap.dedent(builtin_type.__doc__).strip()
+    try:
+        args = argdoc.parse_args(args=argv[1:], doc=doc)
+    except SystemExit as exc:
+        returncode = exc.code
+
+        return returncode
+
+    returncode = None
+    for name in args.names:
+        if name in BUILTINS.keys():
+            print("{} is a shell builtin".format(name))
+        elif name in COMMAND_HITS.keys():
+            print("{} is hashed ({})".format(name, COMMAND_TABLE[name]))
+        elif find_command(name):
+            print("{} is {}".format(name, COMMAND_TABLE[name]))
+        else:
+            stderr_print("bash.py: type: {}: not found".format(name))
+            returncode = 1
+
+    return returncode
+
+
 #
 #
 #
 
 
 def _parse_shline(shline):
-    """Split a line of input into an argv list of words"""
+    """Split a line of input into stages of argv lists of words, and their redirections"""
+
+    if shline.startswith(":!"):  # leave the rest of the line for the sub-shell
+        return [ShStage(argv=[":!"], redirects=list())]
+
+    # Split the line into operators, and into the words between them
 
-    split_argv = None
     try:
-        split_argv = shlex.split(shline)
+        chunks = _split_shline_operators(shline)
+        stages = [ShStage(argv=list(), redirects=list())]
+        redirecting = None
+        for (operating, chunk) in chunks:
+
+            if not operating:
+                for word in shlex.split(chunk):
+                    if redirecting:
+                        stages[-1].redirects.append((redirecting, word))
+                        redirecting = None
+                    else:
+                        stages[-1].argv.append(word)
+
+                continue
+
+            # Reject operators that come too early or too late
+
+            if redirecting or ((chunk == "|") and not stages[-1].argv):
+                raise ValueError(
+                    "syntax error near unexpected token {!r}".format(chunk)
+                )
+
+            if chunk == "|":
+                stages.append(ShStage(argv=list(), redirects=list()))
+            elif chunk == "2>&1":
+                stages[-1].redirects.append((chunk, None))
+            else:
+                redirecting = chunk
+
+        if redirecting or ((len(stages) > 1) and not stages[-1].argv):
+            raise ValueError("syntax error near unexpected token 'newline'")
+
     except ValueError as exc:
         stderr_print("bash.py: warning: {}: {}".format(type(exc).__name__, exc))
+        return None
+
+    return stages
 
-    argv = None
-    if split_argv is not None:
-        argv = list(split_argv)
-        for (index, arg) in enumerate(split_argv):
-            if arg.startswith("#"):
-                argv = split_argv[:index]  # drop "#..." hash comment till end of shline
-                break
 
-    return argv
+def _split_shline_operators(shline):
+    """Split a line of input at each operator outside of quotes, and drop "#" comments
+
+    Return (operating, chunk) pairs, where each chunk is an operator or else unsplit words
+    """
+
+    chunks = list()
+
+    start = 0
+    index = 0
+    quote = None
+    while index < len(shline):
+        ch = shline[index]
+        at_word_start = (not index) or shline[index - 1].isspace()
+
+        # Skip over quoted and escaped chars
+
+        if quote:
+            if (ch == "\\") and (quote == '"'):
+                index += 1
+            elif ch == quote:
+                quote = None
+            index += 1
+            continue
+
+        if ch == "\\":
+            index += 2
+            continue
+
+        if ch in "'\"":
+            quote = ch
+            index += 1
+            continue
+
+        # Drop "#..." hash comment till end of shline
+
+        if (ch == "#") and at_word_start:
+            break
+
+        # Split at each operator, taking "2>" as an operator only at the start of a word
+
+        operator = None
+        for sh_operator in SH_OPERATORS:
+            if shline.startswith(sh_operator, index):
+                if at_word_start or not sh_operator.startswith("2"):
+                    operator = sh_operator
+                    break
+
+        if not operator:
+            index += 1
+            continue
+
+        chunks.append((False, shline[start:index]))
+        chunks.append((True, operator))
+        index += len(operator)
+        start = index
+
+    chunks.append((False, shline[start:index]))
+
+    return chunks
 
 
 def _compile_shline(shline, argv):
@@ -334,31 +555,380 @@ def _compile_shline(shline, argv):
 
         return how
 
-    # Map one plain verb to each Py file
+    # Map one plain verb to a Py file of this dir, else to a file of the $PATH dirs
 
-    wherewhat = _calc_wherewhat(verb)
+    wherewhat = find_command(verb)
+    if wherewhat:
+        COMMAND_HITS[verb] = COMMAND_HITS.get(verb, 0) + 1
 
-    # Plan to call a Py file that exists
+    # Plan to call a Py file of this dir, inside this process if it can
 
-    if os.path.exists(wherewhat):
+    if wherewhat and (os.path.dirname(wherewhat) == FILE_DIR):
 
         def how2(argv):
+            wherewhat_argv = [wherewhat] + argv[1:]
+
+            try:
+                (module, forking) = import_verb_module(wherewhat)
+            except FileNotFoundError:
+                return _forget_command(verb)
+
+            if module and not forking:
+                returncode = run_verb_module(module, argv=wherewhat_argv)
+                return returncode
+            if module and hasattr(os, "fork"):
+                returncode = fork_verb_module(module, argv=wherewhat_argv)
+                return returncode
+
             try:
-                ran = subprocess_run([wherewhat] + argv[1:])
+                ran = subprocess_run(wherewhat_argv)
             except PermissionError as exc:
                 stderr_print("bash.py: error: {}: {}".format(type(exc).__name__, exc))
-                ran.returncode = 126  # exit 126 from executable permission error
+                return 126  # exit 126 from executable permission error
             return ran.returncode
 
         return how2
 
-    # Plan to reject a verb that maps to a Py file that doesn't exist
+    # Plan to call a file of the $PATH dirs
+
+    if wherewhat:
+
+        def how5(argv):
+            try:
+                ran = subprocess_run(argv, executable=wherewhat)
+            except FileNotFoundError:
+                return _forget_command(verb)
+            except PermissionError as exc:
+                stderr_print("bash.py: error: {}: {}".format(type(exc).__name__, exc))
+                return 126  # exit 126 from executable permission error
+            return ran.returncode
+
+        return how5
+
+    # Plan to reject a verb that maps to no file
 
     how = _compile_log_error("bash.py: warning: {}: command not found".format(verb))
 
     return how
 
 
+def import_verb_module(wherewhat):
+    """Import the Py file of a verb just once, unless edited since
+
+    Return the module, else None, and also say if it must run in a fork of this process
+    """
+
+    mtime_ns = os.stat(wherewhat).st_mtime_ns
+    stem = os.path.splitext(os.path.basename(wherewhat))[0]
+
+    # Take the module imported before, if not edited since
+
+    if wherewhat in VERB_MODULES.keys():
+        (imported_mtime_ns, module, forking) = VERB_MODULES[wherewhat]
+        if imported_mtime_ns == mtime_ns:
+            return (module, forking)
+        if module and (sys.modules.get(stem) is module):
+            del sys.modules[stem]
+
+    # Decline to import verbs that don't define "main"
+    # Plan to fork for the verbs that take over the process
+
+    with open(wherewhat) as reading:
+        source = reading.read()
+
+    shebang = source.splitlines()[0] if source else ""
+
+    module = None
+    if shebang == "#!/usr/bin/env python3":
+        if re.search(r"^def main[(]", string=source, flags=re.MULTILINE):
+            module = _import_verb_module_from(wherewhat, stem=stem)
+
+    forking = stem in FORKING_VERBS
+    if re.search(r"^import (termios|tty)$", string=source, flags=re.MULTILINE):
+        forking = True
+
+    VERB_MODULES[wherewhat] = (mtime_ns, module, forking)
+
+    return (module, forking)
+
+
+def _import_verb_module_from(wherewhat, stem):
+    """Import the Py file of a verb, but decline to replace a module of the same name"""
+
+    if stem in sys.modules.keys():
+        module = sys.modules[stem]
+        module_file = getattr(module, "__file__", None)
+        if module_file and (os.path.realpath(module_file) == wherewhat):
+            return module
+
+        return None
+
+    spec = importlib.util.spec_from_file_location(stem, wherewhat)
+    module = importlib.util.module_from_spec(spec)
+    # let "inspect.getmodule" find it for "argdoc.parse_args"
+    sys.modules[stem] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception as exc:
+        del sys.modules[stem]
+        stderr_print("bash.py: warning: {}: {}".format(type(exc).__name__, exc))
+        return None
+
+    return module
+
+
+def run_verb_module(module, argv):
+    """Call the "main" of a verb module, and return its exit status"""
+
+    with_argv = sys.argv
+    sys.argv = argv
+    try:
+        if inspect.signature(module.main).parameters:
+            returncode = module.main(argv)
+        else:
+            returncode = module.main()
+    except SystemExit as exc:
+        returncode = exc.code
+        if (returncode is not None) and not isinstance(returncode, int):
+            stderr_print(returncode)
+            returncode = 1
+    except KeyboardInterrupt:
+        # "128+n if terminated by signal n" <= man bash
+        returncode = 0x80 + signal.SIGINT
+    except BrokenPipeError:
+        returncode = 1
+    except Exception:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        sys.argv = with_argv
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+    return returncode
+
+
+def fork_verb_module(module, argv, fds=None):
+    """Call the "main" of a verb module in a fork of this process, and return its exit status
+
+    Give the fork its own copy of the fd's and the signal handlers, with the Stdio fd's
+    replaced as asked, and don't take the SIGINT KeyboardInterrupt's meant for it
+    """
+
+    how = functools.partial(run_verb_module, module)
+
+    with_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        pid = fork_how(how, argv=argv, fds=fds)
+        returncode = wait_for_forks([pid])[-1]
+    finally:
+        signal.signal(signal.SIGINT, with_handler)
+
+    return returncode
+
+
+def fork_how(how, argv, fds=None, closing_fds=()):
+    """Start to call a callable in a fork of this process, and return the pid of the fork"""
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    pid = os.fork()
+    if not pid:
+        # never returns
+        _run_forked_how(how, argv=argv, fds=fds, closing_fds=closing_fds)
+
+    return pid
+
+
+def wait_for_forks(pids):
+    """Wait for each fork to exit, and return the exit status of each"""
+
+    returncodes = list()
+    for pid in pids:
+        (_, status) = os.waitpid(pid, 0)
+
+        if os.WIFSIGNALED(status):
+            returncode = 0x80 + os.WTERMSIG(status)  # "128+n if terminated by signal n"
+        else:
+            returncode = os.WEXITSTATUS(status)
+
+        returncodes.append(returncode)
+
+    return returncodes
+
+
+def _run_forked_how(how, argv, fds, closing_fds):
+    """Rewire the Stdio fd's and the signal handlers, call the callable, and exit the fork"""
+
+    returncode = 1
+    try:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        if fds:
+            os_dup2_fds(fds)
+            if fds.get(0, 0) != 0:
+                sys.stdin = open(0, closefd=False)  # drop what the shell read ahead
+        for fd in closing_fds:
+            os.close(fd)
+
+        returncode = how(argv)
+        if returncode is None:
+            returncode = 0
+    except SystemExit as exc:
+        returncode = (
+            exc.code if isinstance(exc.code, int) else (0 if not exc.code else 1)
+        )
+    except KeyboardInterrupt:
+        returncode = 0x80 + signal.SIGINT
+    except BrokenPipeError:
+        returncode = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except BrokenPipeError:
+            returncode = 1
+
+        os._exit(returncode & 0xFF)  # skip "atexit" and "finally" in the parent's stack
+
+
+def run_redirected_stage(stage):
+    """Call one verb with its Stdio fd's redirected, inside this process if it can"""
+
+    try:
+        (fds, opened_fds) = _open_redirects(stage.redirects, fds={0: 0, 1: 1, 2: 2})
+    except OSError as exc:
+        stderr_print("bash.py: warning: {}: {}".format(type(exc).__name__, exc))
+        return 1
+
+    argv = stage.argv
+    how = _compile_shline(shline="", argv=argv)
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    with_stdin = sys.stdin
+    with_fds = dict((fd, os.dup(fd)) for fd in fds.keys())
+    try:
+        os_dup2_fds(fds)
+        if fds[0] != 0:
+            sys.stdin = open(0, closefd=False)
+
+        returncode = how(argv)
+
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            sys.stdin = with_stdin
+            os_dup2_fds(with_fds)
+            for fd in list(with_fds.values()) + opened_fds:
+                os.close(fd)
+
+    return returncode
+
+
+def run_piped_stages(stages):
+    """Call each verb at once, in a fork of its own, wired Stdout to Stdin by pipes
+
+    Return the exit status of the last verb, and don't take the SIGINT's meant for them
+    """
+
+    if not hasattr(os, "fork"):
+        stderr_print("bash.py: warning: pipelines need os.fork")
+        return 1
+
+    pids = list()
+
+    with_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+
+        stdin_fd = 0
+        for (index, stage) in enumerate(stages):
+
+            # Pipe the Stdout of this verb to the Stdin of the next verb, if any
+
+            (read_fd, stdout_fd) = (None, 1)
+            if index < (len(stages) - 1):
+                (read_fd, stdout_fd) = os.pipe()
+
+            closing_fds = list(
+                _ for _ in (stdin_fd, stdout_fd, read_fd) if _ not in (None, 0, 1, 2)
+            )
+
+            # Fork a process to run this verb, else to log why it can't
+
+            argv = stage.argv
+            try:
+                (fds, opened_fds) = _open_redirects(
+                    stage.redirects, fds={0: stdin_fd, 1: stdout_fd, 2: 2}
+                )
+                how = _compile_shline(shline="", argv=argv)
+            except OSError as exc:
+                (fds, opened_fds) = (None, list())
+                how = _compile_log_error(
+                    "bash.py: warning: {}: {}".format(type(exc).__name__, exc)
+                )
+
+            closing_fds.extend(opened_fds)
+            pid = fork_how(how, argv=argv, fds=fds, closing_fds=closing_fds)
+            pids.append(pid)
+
+            # Close the copies held here, so each reader sees the end of its input
+
+            for fd in closing_fds:
+                if fd != read_fd:
+                    os.close(fd)
+
+            stdin_fd = read_fd
+
+        returncode = wait_for_forks(pids)[-1]
+
+    finally:
+        signal.signal(signal.SIGINT, with_handler)
+
+    return returncode
+
+
+def _open_redirects(redirects, fds):
+    """Open the files of the redirections, and return the fd's to swap in, and to close"""
+
+    fds = dict(fds)
+    opened_fds = list()
+    try:
+        for (operator, path) in redirects:
+            if operator == "2>&1":
+                fds[2] = fds[1]
+                continue
+
+            if operator == "<":
+                flags = os.O_RDONLY
+            elif operator.endswith(">>"):
+                flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+            else:
+                flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+
+            fd = os.open(path, flags, 0o666)
+            opened_fds.append(fd)
+
+            if operator == "<":
+                fds[0] = fd
+            elif operator.startswith("2"):
+                fds[2] = fd
+            else:
+                fds[1] = fd
+
+    except OSError:
+        for fd in opened_fds:
+            os.close(fd)
+        raise
+
+    return (fds, opened_fds)
+
+
 def _compile_explicit_relpath(verb):
     """Decline to map any explicit relpath to verb"""
 
@@ -378,19 +948,79 @@ def _compile_explicit_relpath(verb):
     return how
 
 
-def _calc_wherewhat(verb):
-    """Map verb to file"""
+def find_command(verb):
+    """Map a verb to its file, else None, rescanning the dirs only if the verb is missing"""
 
-    what = "{}_.py".format(verb)
-    wherewhat = os.path.join(FILE_DIR, what)
-    if not os.path.exists(wherewhat):
-        if not verb.endswith("_"):
-            what = "{}.py".format(verb)
-            wherewhat = os.path.join(FILE_DIR, what)
+    wherewhat = COMMAND_TABLE.get(verb)
+    if not wherewhat:
+        _rescan_command_dirs()
+        wherewhat = COMMAND_TABLE.get(verb)
 
     return wherewhat
 
 
+def _forget_command(verb):
+    """Forget the file of a verb, after it goes missing, and return nonzero"""
+
+    COMMAND_HITS.pop(verb, None)
+    COMMAND_TABLE.pop(verb, None)
+
+    return _log_error("bash.py: warning: {}: command not found".format(verb))
+
+
+def _rescan_command_dirs():
+    """Map each verb to its file, rescanning only the dirs changed since last scanned"""
+
+    dirs = [FILE_DIR]
+    for dir_ in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if os.path.isabs(dir_) and (dir_ not in dirs):
+            dirs.append(dir_)
+
+    COMMAND_TABLE.clear()
+    for dir_ in dirs:
+        try:
+            mtime_ns = os.stat(dir_).st_mtime_ns
+        except OSError:
+            continue
+
+        if (dir_ not in COMMAND_DIRS.keys()) or (COMMAND_DIRS[dir_][0] != mtime_ns):
+            COMMAND_DIRS[dir_] = (mtime_ns, _scan_command_dir(dir_))
+
+        verbs = COMMAND_DIRS[dir_][-1]
+        for (verb, wherewhat) in verbs.items():
+            COMMAND_TABLE.setdefault(verb, wherewhat)
+
+
+def _scan_command_dir(dir_):
+    """Map each verb to a file of one dir, preferring "verb_.py" to "verb.py" in this dir"""
+
+    verbs = dict()
+
+    try:
+        with os.scandir(dir_) as entries:
+            names = sorted(_.name for _ in entries if not _.is_dir())
+    except OSError:
+        return verbs
+
+    if dir_ != FILE_DIR:
+        for name in names:
+            path = os.path.join(dir_, name)
+            if os.access(path, os.X_OK):  # like Bash, take only the files we may run
+                verbs[name] = path
+
+        return verbs
+
+    for name in names:
+        if name.endswith(".py") and not name.startswith("__"):
+            stem = name[: -len(".py")]
+            if stem.endswith("_"):
+                verbs[stem[: -len("_")]] = os.path.join(dir_, name)
+            else:
+                verbs.setdefault(stem, os.path.join(dir_, name))
+
+    return verbs
+
+
 def _compile_log_error(message):
     """Plan to log an error message and return nonzero"""
 
@@ -509,6 +1139,16 @@ def shutil_ps1_tuple():
     #
 
 
+# deffed in many files  # missing from docs.python.org
+def os_dup2_fds(fds):
+    """Replace each fd with a copy of another, all at once, such as for:  2>&1 >out"""
+
+    with_fds = dict((fd, os.dup(with_fd)) for (fd, with_fd) in fds.items())
+    for (fd, with_fd) in with_fds.items():
+        os.dup2(with_fd, fd)
+        os.close(with_fd)
+
+
 # deffed in many files  # missing from docs.python.org
 def stderr_print(*args):
     """Print the Args, but to Stderr, not to Stdout"""
@@ -588,7 +1228,9 @@ BUILTINS = {
     ":": builtin_pass,
     "cd": builtin_cd,
     "exit": builtin_exit,
+    "hash": builtin_hash,
     "history": builtin_history,
+    "type": builtin_type,
 }
 
 
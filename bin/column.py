@@ -1,16 +1,20 @@
 #!/usr/bin/env python3
 
 r"""
-usage: column.py [-h] [-t]
+usage: column.py [-h] [-t] [--sample N]
 
 align words of lines into columns
 
 options:
   -h, --help  show this help message and exit
   -t          print words, but separate columns by two spaces
+  --sample N  choose the widths from the first N lines, then write each line as it comes
 
 quirks:
   aligns cells to the right when two-thirds or more contain decimal digits
+  reads stdin twice if it's a file, else copies it into a temporary file to read it twice
+  holds no rows in memory, except the first N rows when told to --sample N
+  lets the cells after the first N rows stick out, when they don't fit the widths chosen
   doesn't offer to run without arguments a la mac and linux
   doesn't offer the "-csx" of mac, nor the "-censtx" of linux
 
@@ -22,17 +26,24 @@ examples:
   echo 'su per ca $ li fra gil $ is tic ex $ pi a li $ doc ious' |tr '$' '\n' |column -t
   echo '27 735 43 $ 51 785 640 $ 23 391 62 $ 14 6 19 $ 002 8809' |tr '$' '\n' |column -t
   echo 'su per ca $ 51 785 640 $ 23 391 62 $ 14 6 19 $ 002 8809' |tr '$' '\n' |column -t
+  ping localhost |column.py -t --sample 3  # guess the widths, and don't wait for the end
 """
 
 
-import collections
+import contextlib
+import os
 import random
 import re
+import stat
 import sys
+import tempfile
 
 import argdoc
 
 
+DIGIT_REGEX = re.compile(r"[0-9]")
+
+
 def main():
     """Run from the command line"""
 
@@ -43,92 +54,146 @@ def main():
         stderr_print("column.py: error: no arguments not implemented")
         sys.exit(2)  # exit 2 from rejecting usage
 
-    # Fetch all of Stdin
+    sample = None
+    if args.sample is not None:
+        try:
+            sample = int(args.sample)
+        except ValueError:
+            sample = 0
+        if sample < 1:
+            stderr_print("column.py: error: choose --sample 1 or more")
+            sys.exit(2)  # exit 2 from rejecting usage
+
+    # Justify the cells in each column of Stdin
 
     prompt_tty_stdin()
-    lines = sys.stdin.readlines()
 
-    # Divide each line into words
+    justifier = ColumnJustifier()
+    if sample:
+        justifier.justify_after_sample(sys.stdin, sample=sample)
+    else:
+        justifier.justify_in_two_passes(sys.stdin)
 
-    split_lines = list(_.split() for _ in lines)
 
-    # Discard empty lines
+class ColumnJustifier:
+    """Measure the columns of rows of cells, then justify the cells in each column"""
 
-    rows = list(row for row in split_lines if row)
+    def __init__(self):
 
-    # Justify the cells in each column
+        self.row_count = 0
+        self.widths = list()
+        self.right_votes = list()
 
-    justified_rows = justify_cells_in_rows(complete_rows(rows, cell=""))
-    for justified_row in justified_rows:
-        print("  ".join(justified_row).rstrip())
+    def measure_line(self, line):
+        """Measure the cells of a line, and count their votes, and return them"""
 
+        row = line.split()
+        if not row:
+            return row
 
-def complete_rows(rows, cell):
-    """Add cells till every row is as wide as the widest row"""
+        self.row_count += 1
 
-    if not rows:
-        return list(rows)
+        widths = self.widths
+        if len(row) > len(widths):
+            widths.extend((len(row) - len(widths)) * [0])
+            self.right_votes.extend((len(row) - len(self.right_votes)) * [0])
 
-    max_row_width = max(len(row) for row in rows)
+        for (index, cell) in enumerate(row):
+            if len(cell) > widths[index]:
+                widths[index] = len(cell)
 
-    completed_rows = list()
-    for row in rows:
-        completed_row = row + ((max_row_width - len(row)) * [cell])
-        completed_rows.append(completed_row)
+        # Call on each cell to vote for left or right alignment
 
-    return completed_rows
+        if DIGIT_REGEX.search(line):
+            for (index, cell) in enumerate(row):
+                if DIGIT_REGEX.search(cell):
+                    # vote right once if any decimal digits
+                    self.right_votes[index] += 1
 
+        return row
 
-def justify_cells_in_rows(rows):
-    """Justify the cells in each column, when given a rectangular list of rows of cells"""
+    def compile_formats(self):
+        """Choose to align every cell of a column, to left or to right"""
 
-    # Convert each cell to string
+        formats = list()
+        for (width, right_votes) in zip(self.widths, self.right_votes):
 
-    strung_rows = list(list(str(cell) for cell in row) for row in rows)
+            voters = self.row_count  # count the empty cells of short rows as votes left
+            if right_votes >= ((2 * voters) / 3):  # require 2/3's vote to go right
+                formats.append("{:>" + str(width) + "}")
+            else:
+                formats.append("{:<" + str(width) + "}")
 
-    # Call on each cell to vote for left or right alignment
+        return formats
 
-    left = collections.defaultdict(int)
-    right = collections.defaultdict(int)
-    for row in strung_rows:
-        for (index, cell) in enumerate(row):
-            if re.search(
-                r"[0-9]", string=cell
-            ):  # vote right once if one or more decimal digits
-                right[index] += 1
+    def justify_in_two_passes(self, incoming):
+        """Measure every row, then justify every row, holding no rows in memory"""
+
+        # Read Stdin twice if it's a file, else copy it into a temporary file
+
+        with contextlib.ExitStack() as stack:
+
+            readable = incoming
+            seekable = stat.S_ISREG(os.fstat(incoming.fileno()).st_mode)
+            if seekable:
+                start = incoming.tell()
             else:
-                left[index] += 1  # vote left once if zero decimal digits
+                readable = stack.enter_context(
+                    tempfile.TemporaryFile(mode="w+", encoding=incoming.encoding)
+                )
 
-    # Add empty cells till every row is as wide as the widest row
+            # Measure every row
 
-    completed_rows = complete_rows(strung_rows, cell="")
+            for line in incoming:
+                if self.measure_line(line) and not seekable:
+                    readable.write(line)
 
-    # Measure max width per column
+            # Justify every row
 
-    widths = list(list(len(cell) for cell in row) for row in completed_rows)
-    max_column_widths = list(max(column_widths) for column_widths in zip(*widths))
+            readable.seek(start if seekable else 0)
+            formats = self.compile_formats()
+            rows = (_.split() for _ in readable)
+            self.write_rows((_ for _ in rows if _), formats=formats, batch=1024)
 
-    # Align every cell of every row, to left of column or to right of column
+    def justify_after_sample(self, incoming, sample):
+        """Measure the first few rows, then justify those and stream out the rest"""
 
-    justified_rows = list()
-    for row in completed_rows:
+        rows = list()
+        for line in incoming:
+            row = self.measure_line(line)
+            if row:
+                rows.append(row)
+                if len(rows) >= sample:
+                    break
 
-        justified_row = list()
-        for (index, cell) in enumerate(row):
+        formats = self.compile_formats()
+        self.write_rows(rows, formats=formats, batch=1)
 
-            voters = left[index] + right[index]
-            if right[index] >= ((2 * voters) / 3):  # require 2/3's vote to go right
-                justified_cell = cell.rjust(max_column_widths[index])
-            else:
-                justified_cell = cell.ljust(max_column_widths[index])
+        rows = (_.split() for _ in incoming)
+        self.write_rows((_ for _ in rows if _), formats=formats, batch=1)
+
+    def write_rows(self, rows, formats, batch):
+        """Justify each row, add empty cells till it's wide enough, and write a batch at a time"""
+
+        width = len(formats)
+        formats = formats + ["{}"]
+
+        lines = list()
+        for row in rows:
 
-            justified_row.append(justified_cell)
+            if len(row) < width:
+                row = row + ((width - len(row)) * [""])
 
-        justified_rows.append(justified_row)
+            cells = list(formats[min(i, width)].format(c) for (i, c) in enumerate(row))
+            lines.append("  ".join(cells).rstrip() + "\n")
 
-    # Succeed
+            if len(lines) >= batch:
+                sys.stdout.write("".join(lines))
+                sys.stdout.flush()
+                lines = list()
 
-    return justified_rows
+        sys.stdout.write("".join(lines))
+        sys.stdout.flush()
 
 
 def pick_some_digits():
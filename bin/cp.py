@@ -19,6 +19,8 @@ quirks:
   copies without changing the name, when the Cwd doesn't already contain the name
   copies from Remote hostname:path on request, not only from LocalHost
   defaults '-ipR' to True, and gives you no way to turn them off
+  copies without calling "cp", kernel to kernel where it can, a few files at a time
+  traces the "cp" and "touch" it means, but calls "scp" only to copy from Remote
 
 examples:
   cp.py  # backs up last modified file of Cwd (makes it found twice)
@@ -28,40 +30,54 @@ examples:
 
 
 import argparse
-import glob
+import concurrent.futures
+import errno
 import os
 import re
 import shlex
+import stat
 import subprocess
 import sys
 
 import argdoc
 
 
+CHUNK_SIZE = 1024 * 1024  # copy about one MiB at a time, when copying through memory
+
+COPY_THREADS = 8  # copy this many files at a time, when copying a dir of files
+
+KERNEL_COPY_ERRNOS = (errno.EBADF, errno.EINVAL, errno.ENOSYS, errno.EXDEV)
+KERNEL_COPY_ERRNOS += (errno.EOPNOTSUPP, errno.ENOTSOCK, errno.ESPIPE)
+
+
 def main():
 
     args = argdoc.parse_args()
 
-    # Pick a FromPath to copy from
+    # Pick a FromPath to copy from, and list the Cwd just once
 
-    frompath = os_path_choose() if (args.file is None) else args.file
+    with os.scandir() as entries:
+        cwd_entries = list(entries)
+
+    frompath = os_path_choose(cwd_entries) if (args.file is None) else args.file
     if args.file == "-":
         frompath = "/dev/stdin"
 
     # Pick a ToName to copy to
 
+    cwd_names = list(_.name for _ in cwd_entries)
+
     (_, basename) = os.path.split(frompath)
     (base, ext, _) = os_path_partition(basename)
-    toname = os_path_nextname(basename=(base + ext))
+    toname = os_path_nextname(basename=(base + ext), names=cwd_names)
 
     # Copy and touch
 
     isatty = False
-    if ":" not in frompath:
+    if (":" not in frompath) and not os.path.isdir(frompath):
         with open(frompath) as reading:
             isatty = reading.isatty()
 
-    cp_shline = "cp -ipR {} {}".format(frompath, toname)
     if isatty:
         sys.stderr.write("cp.py: Press ⌃D EOF to quit\n")  # or ⌃C SIGINT or ⌃\ SIGQUIT
         cp_shline = "cp -i {} {}".format(frompath, toname)
@@ -75,11 +91,141 @@ def main():
 
     touch_shline = "touch {}".format(toname)
 
-    for shline in (cp_shline, touch_shline):
+    sys.stderr.write("+ {}\n".format(cp_shline))
+    if ":" in frompath:
+        subprocess_run(shlex.split(cp_shline), stdin=None, check=True)
+    else:
+        try:
+            exit_status = cp_path(
+                frompath, topath=toname, preserving=("-ipR" in cp_shline)
+            )
+        except OSError as exc:
+            stderr_print("cp.py: error: {}: {}".format(type(exc).__name__, exc))
+            sys.exit(1)
+        if exit_status:
+            sys.exit(exit_status)
+
+    sys.stderr.write("+ {}\n".format(touch_shline))
+    os.utime(toname)
+
+
+def cp_path(frompath, topath, preserving):
+    """Copy a file, else a dir of dirs and files, else a stream of bytes"""
+
+    st = os.lstat(frompath)
+
+    if stat.S_ISDIR(st.st_mode):
+        return cp_dir_tree(frompath, topath=topath, preserving=preserving)
+    elif stat.S_ISLNK(st.st_mode) and preserving:
+        os.symlink(os.readlink(frompath), topath)
+    else:
+        cp_file(frompath, topath=topath, preserving=preserving)
+
+
+def cp_file(frompath, topath, preserving):
+    """Copy the bytes of a file, and also its permissions and date/time-stamps if preserving"""
+
+    with open(frompath, mode="rb", buffering=0) as reading:
+        with open(topath, mode="xb", buffering=0) as writing:
+
+            ifd = reading.fileno()
+            ofd = writing.fileno()
+
+            os_copy_fd(ifd, ofd=ofd)
+
+            if preserving:
+                st = os.fstat(ifd)
+                if stat.S_ISREG(st.st_mode):
+                    os.chmod(ofd, mode=stat.S_IMODE(st.st_mode))
+                    os.utime(ofd, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def cp_dir_tree(frompath, topath, preserving):
+    """Copy the dirs and files inside a dir, a few files at a time, and return an exit status"""
+
+    exit_status = None
+    dir_stats = list()
+
+    with concurrent.futures.ThreadPoolExecutor(COPY_THREADS) as executor:
+
+        # Make each dir before copying the dirs and files inside it
+
+        futures = list()
+        pending = [(frompath, topath)]
+        while pending:
+            (from_dir, to_dir) = pending.pop()
 
-        shargv = shlex.split(shline)
-        sys.stderr.write("+ {}\n".format(shline))
-        subprocess_run(shargv, stdin=None, check=True)
+            os.mkdir(to_dir)
+            if preserving:
+                dir_stats.append((to_dir, os.stat(from_dir)))
+
+            with os.scandir(from_dir) as entries:
+                for entry in entries:
+                    to_entry = os.path.join(to_dir, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, to_entry))
+                    elif entry.is_symlink() or entry.is_file(follow_symlinks=False):
+                        future = executor.submit(
+                            cp_path, entry.path, topath=to_entry, preserving=preserving
+                        )
+                        futures.append(future)
+                    else:
+                        stderr_print(
+                            "cp.py: warning: skipping not dir, not file: {}".format(
+                                entry.path
+                            )
+                        )
+
+        # Collect the failures, but copy all the rest
+
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except OSError as exc:
+                stderr_print("cp.py: error: {}: {}".format(type(exc).__name__, exc))
+                exit_status = 1
+
+    # Date/time-stamp each dir only after filling it, inner dirs first
+
+    for (to_dir, st) in reversed(dir_stats):
+        os.chmod(to_dir, mode=stat.S_IMODE(st.st_mode))
+        os.utime(to_dir, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    return exit_status
+
+
+def os_copy_fd(ifd, ofd):
+    """Copy to the end of a file or stream, inside the kernel where it can"""
+
+    copy_file_range = getattr(os, "copy_file_range", None)  # Python >= 3.8 at Linux
+    sendfile = getattr(os, "sendfile", None)
+
+    while True:
+
+        # Copy file to file, else file to anything, else through a chunk of memory
+
+        try:
+            if copy_file_range:
+                length = copy_file_range(ifd, ofd, CHUNK_SIZE)
+            elif sendfile:
+                length = sendfile(ofd, ifd, None, CHUNK_SIZE)
+            else:
+                chunk = os.read(ifd, CHUNK_SIZE)
+                os_write_all(ofd, chunk)
+                length = len(chunk)
+        except OSError as exc:
+            if exc.errno not in KERNEL_COPY_ERRNOS:
+                raise
+            if copy_file_range:
+                copy_file_range = None
+            elif sendfile:
+                sendfile = None
+            else:
+                raise
+            continue
+
+        if not length:
+            break
 
 
 #
@@ -88,17 +234,16 @@ def main():
 
 
 # deffed in many files  # missing from docs.python.org
-def os_path_choose():
+def os_path_choose(entries):
     """Find the last modified, else highest name, else '/dev/null' in the Cwd"""
 
-    paths = os.listdir()
-    paths.sort(key=lambda _: os.stat(_).st_mtime)
-
-    if not paths:
-
-        return "/dev/null"
-
-    path = paths[-1]
+    path = "/dev/null"
+    mtime = None
+    for entry in entries:
+        entry_mtime = entry.stat().st_mtime
+        if (mtime is None) or (entry_mtime >= mtime):
+            path = entry.name
+            mtime = entry_mtime
 
     return path
 
@@ -114,12 +259,10 @@ def os_path_intrev(path):
 
 
 # deffed in many files  # missing from docs.python.org
-def os_path_nextname(basename):
+def os_path_nextname(basename, names):
     """Pick the next Filename not already existing in the Cwd"""
 
-    pattern = basename + "*"
-
-    paths = list(glob.glob(pattern))
+    paths = list(_ for _ in names if _.startswith(basename))
 
     last_path = basename
     if not paths:
@@ -184,6 +327,25 @@ def os_path_rev_eval(rev, default):
     return int_rev  # such as 7 from "it~7~" or from "it~7"
 
 
+# deffed in many files  # missing from docs.python.org
+def os_write_all(fd, data):
+    """Write all the bytes, even when the fd takes only some of them at a time"""
+
+    view = memoryview(data)
+    while view:
+        length = os.write(fd, view)
+        view = view[length:]
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
 # deffed in many files  # since Sep/2015 Python 3.5
 def subprocess_run(args, **kwargs):
     """
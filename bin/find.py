@@ -1,69 +1,340 @@
 #!/usr/bin/env python3
 
 r"""
-usage: find.py [-h] [TOP] [HOW ...]
+usage: find.py [-h] [-j N] [TOP] [HOW ...]
 
 print some words
 
 positional arguments:
   TOP         the dir to walk (default: .)
-  HOW         a hint of how to walk
+  HOW         a hint of how to walk, such as "-name '*.py'", "-type d", or "-prune"
 
 options:
   -h, --help  show this help message and exit
+  -j N        list this many dirs at a time, such as for network file systems (default: 1)
 
 quirks:
   searches "./" if called with no args, unlike mac bash
   leads each hit inside "./" with "" not with "./", unlike bash
   leads each hit inside "~/" with "~/" not with "$PWD", unlike bash
   hits the realpath of each sym link, not abspath, unlike bash
+  prints the files of each dir, then the dirs of each dir, each sorted by name
+  lists each dir once, and takes the type of each file from that listing, not from a stat
+  takes only the hints -name, -iname, -type, -newer, -prune, -print, and -o
 
 examples:
   find ~/bin/
   find ~/.bash_history  # file, not dir
   find /dev/null  # device, not dir
+  find . -name .git -prune -o -name '*.py' -print  # skip the ".git/" dirs
+  find -j 16 /mnt/share -type d  # list 16 dirs at a time
 """
 # FIXME: rethink "find.py" quirks
 
 
 from __future__ import print_function
 
+import collections
+import concurrent.futures
 import contextlib
+import fnmatch
 import os
 import signal
+import stat
 import sys
 
 import argdoc
 
 
+FIND_VALUED_HINTS = ("-name", "-iname", "-type", "-newer")
+FIND_HINTS = FIND_VALUED_HINTS + ("-prune", "-print", "-o")
+
+FIND_TYPES = ("d", "f", "l")
+
+FIND_LOOKAHEAD_PER_THREAD = 4  # list no more dirs than this ahead, per thread
+
+
 def main(argv):
 
-    args = argdoc.parse_args(argv[1:])
+    # Take the first word that starts with "-" after the options as the start of the hints
+
+    find_argv_tail = list(argv[1:])
+
+    index = 0
+    while index < len(find_argv_tail):
+        arg = find_argv_tail[index]
+        if arg in ("-h", "--help"):
+            break
+        if arg == "-j":
+            index += 2
+        elif arg.startswith("-j"):
+            index += 1
+        else:
+            break
+
+    if index < len(find_argv_tail):
+        arg = find_argv_tail[index]
+        if arg in FIND_HINTS:
+            find_argv_tail[index:index] = ["--", "."]
+        elif arg not in ("-h", "--help"):
+            find_argv_tail.insert(index, "--")
+
+    args = argdoc.parse_args(find_argv_tail)
+
+    # Parse the hints
+
+    threads = 1
+    if args.j is not None:
+        try:
+            threads = int(args.j)
+        except ValueError:
+            threads = 0
+        if threads < 1:
+            stderr_print("find.py: error: choose -j 1 or more")
+            sys.exit(2)  # exit 2 from rejecting usage
+
+    try:
+        finder = PathFinder(args.hows)
+    except (OSError, ValueError) as exc:
+        stderr_print("find.py: error: {}: {}".format(type(exc).__name__, exc))
+        sys.exit(2)  # exit 2 from rejecting usage
 
-    if args.hows:
-        stderr_print("find.py: error: Got undefined hints: {}".format(args.hows))
-        sys.exit(-1)
+    # Walk the dirs
 
     try:
-        print_os_walk_minpaths(args.top)
+        exit_status = finder.print_os_walk_minpaths(args.top, threads=threads)
     except KeyboardInterrupt:
         sys.exit(0x80 + signal.SIGINT)  # "128+n if terminated by signal n" <= man bash
         # FIXME: Mac Zsh trace of this exit looks a little different for Bash "find" vs "find.py"
 
+    return exit_status
+
+
+class PathFinder:
+    """Walk the dirs, and print the paths that match the hints"""
+
+    def __init__(self, hows):
+
+        self.groups = list()  # print when all the tests of any one group pass
+        self.printing = "-print" not in hows  # print implicitly, unless told explicitly
+        self.stating = "-newer" in hows
+
+        tests = list()
+        index = 0
+        while index < len(hows):
+            how = hows[index]
+
+            if how not in FIND_HINTS:
+                raise ValueError("unknown hint: {!r}".format(how))
+
+            if how == "-o":
+                self.groups.append(tests)
+                tests = list()
+                index += 1
+                continue
+
+            if how not in FIND_VALUED_HINTS:
+                tests.append((how, None))
+                index += 1
+                continue
+
+            if index + 1 >= len(hows):
+                raise ValueError("missing argument to {!r}".format(how))
+            value = hows[index + 1]
+
+            if how == "-type":
+                if value not in FIND_TYPES:
+                    raise ValueError("unknown type: {!r}".format(value))
+            elif how == "-newer":
+                value = os.stat(value).st_mtime_ns
+            elif how == "-iname":
+                value = value.casefold()
+
+            tests.append((how, value))
+            index += 2
+
+        self.groups.append(tests)
+
+    def test_entry(self, entry):
+        """Return (printing, pruning) for an os.DirEntry, or for a TopEntry"""
+
+        pruning = False
+
+        for tests in self.groups:
+            printing = self.printing
+            for (how, value) in tests:
+
+                if how == "-name":
+                    passed = fnmatch.fnmatchcase(entry.name, value)
+                elif how == "-iname":
+                    passed = fnmatch.fnmatchcase(entry.name.casefold(), value)
+                elif how == "-type":
+                    if value == "d":
+                        passed = entry.is_dir(follow_symlinks=False)
+                    elif value == "f":
+                        passed = entry.is_file(follow_symlinks=False)
+                    else:
+                        passed = entry.is_symlink()
+                elif how == "-newer":
+                    passed = entry.stat(follow_symlinks=False).st_mtime_ns > value
+                elif how == "-prune":
+                    pruning = True
+                    passed = True
+                else:
+                    assert how == "-print", how
+                    printing = True
+                    passed = True
+
+                if not passed:
+                    break
+
+            else:
+                return (printing, pruning)
+
+        return (False, pruning)
+
+    def print_os_walk_minpaths(self, top, threads):
+        """Walk the dirs, and print the paths that match, and return an exit status"""
+
+        top_ = "." if (top is None) else top
+        top_realpath = os.path.realpath(top_)
+        formatter = min_path_formatter(top_)
+
+        top_minpath = formatter(top_realpath)
+        prefix = "" if (top_minpath == os.curdir) else os.path.join(top_minpath, "")
+
+        # Test the top
+
+        top_entry = TopEntry(top_realpath)
+        (printing, pruning) = self.test_entry(top_entry)
+        if printing:
+            print(top_minpath)
+
+        if pruning or not top_entry.is_dir(follow_symlinks=False):
+            return None
+
+        # Test each file or dir inside
+
+        exit_status = None
+        walker = os_scandir_walk_sorted(top_realpath, threads=threads)
+
+        for (relpath, listed) in walker:
+
+            if isinstance(listed, OSError):
+                exc = listed
+                stderr_print("find.py: error: {}: {}".format(type(exc).__name__, exc))
+                exit_status = 1
+                continue
+
+            lines = list()
+            for entry in listed:
+                (printing, pruning) = self.test_entry(entry)
+                if printing:
+                    if entry.is_symlink():  # resolve only the sym links we meet
+                        minpath = formatter(os.path.realpath(entry.path))
+                    else:
+                        minpath = prefix + os.path.join(relpath, entry.name)
+                    lines.append(minpath + "\n")
+                if pruning:
+                    walker.send(entry)
+
+            sys.stdout.write("".join(lines))
+
+        return exit_status
 
-def print_os_walk_minpaths(top):
 
-    top_ = "." if (top is None) else top
-    top_realpath = os.path.realpath(top_)
-    formatter = min_path_formatter(top_)
+class TopEntry:
+    """Look like an os.DirEntry, for the top dir"""
 
-    print(formatter(top_realpath))
-    walker = os_walk_sorted_relpaths(top)
-    for relpath in walker:
-        wherewhat = os.path.join(top_realpath, relpath)
+    def __init__(self, path):
 
-        realpath = os.path.realpath(wherewhat)
-        print(formatter(realpath))
+        self.path = path
+        self.name = os.path.basename(path)
+        self.st = os.lstat(path)
+
+    def is_dir(self, follow_symlinks=True):
+        return stat.S_ISDIR(self.st.st_mode)
+
+    def is_file(self, follow_symlinks=True):
+        return stat.S_ISREG(self.st.st_mode)
+
+    def is_symlink(self):
+        return False
+
+    def stat(self, follow_symlinks=True):
+        return self.st
+
+
+def os_scandir_walk_sorted(top, threads):
+    """Yield the sorted files, and then the sorted dirs, of each dir, listing each dir once
+
+    Yield the relpath of each dir, and then its listing, else the OSError of listing it
+    Take each entry sent back as a dir not to walk into
+    """
+
+    lookahead = FIND_LOOKAHEAD_PER_THREAD * threads
+
+    with contextlib.ExitStack() as stack:
+
+        executor = None  # list each dir only when walked into, if given only 1 thread
+        if threads > 1:
+            executor = concurrent.futures.ThreadPoolExecutor(threads)
+            stack.enter_context(executor)
+
+        # Walk depth first, like "os.walk", but list the next few dirs ahead of time
+
+        # the (relpath, path, future) of the dirs to walk, in order
+        pending = collections.deque()
+        pending.append(("", top, None))
+
+        while pending:
+            (relpath, path, future) = pending.popleft()
+            listed = future.result() if future else os_scandir_sorted(path)
+
+            pruned = set()
+            sent = yield (relpath, listed)
+            while sent is not None:
+                pruned.add(sent.name)
+                sent = yield None
+
+            if isinstance(listed, OSError):
+                continue
+
+            # Walk into each dir inside, but not into sym links to dirs
+
+            walkables = list()
+            for entry in listed:
+                if entry.name not in pruned:
+                    if entry.is_dir(follow_symlinks=False):
+                        walkables.append(entry)
+
+            for entry in reversed(walkables):
+                entry_relpath = os.path.join(relpath, entry.name)
+                pending.appendleft((entry_relpath, entry.path, None))
+
+            # List only the next few dirs ahead, so as to hold only a few lists at a time
+
+            if executor:
+                for pending_index in range(min(len(pending), lookahead)):
+                    (entry_relpath, entry_path, future) = pending[pending_index]
+                    if future is None:
+                        future = executor.submit(os_scandir_sorted, entry_path)
+                        pending[pending_index] = (entry_relpath, entry_path, future)
+
+
+def os_scandir_sorted(path):
+    """List the files of a dir, then its dirs, each sorted by name, else return the OSError"""
+
+    try:
+        with os.scandir(path) as entries:
+            listed = list(entries)
+    except OSError as exc:
+        return exc
+
+    files = sorted((_ for _ in listed if not _.is_dir()), key=lambda _: _.name)
+    dirs = sorted((_ for _ in listed if _.is_dir()), key=lambda _: _.name)
+
+    return files + dirs
 
 
 #
@@ -86,32 +357,6 @@ def os_path_homepath(path):
     return homepath
 
 
-# deffed in many files  # missing from docs.python.org
-def os_walk_sorted_relpaths(top):
-    """Walk the dirs and files in a top dir, returning their relpath's, sorted"""
-    # FIXME: change to relpath closer to log messages
-
-    top_ = "." if (top is None) else top
-    top_realpath = os.path.realpath(top_)
-
-    walker = os.walk(top_realpath)
-    for (where, wheres, whats) in walker:  # (dirpath, dirnames, filenames)
-
-        wheres[:] = sorted(wheres)  # sort these now, yield these later
-
-        for what in sorted(whats):
-
-            wherewhat = os.path.join(where, what)
-
-            realpath = os.path.realpath(wherewhat)
-            relpath = os.path.relpath(realpath, start=top_realpath)
-            yield relpath
-
-        for where_ in wheres:
-            wherewhere = os.path.join(where, where_)
-            yield wherewhere  # FIXME: delay yield dir till the walk starts into the dir
-
-
 # deffed in many files  # missing from docs.python.org
 def min_path_formatter(exemplar):
     """Choose the def that abbreviates this path most sharply: abs, real, rel, or home"""
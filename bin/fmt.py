@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 r"""
-usage: fmt.py [-h] [-w WIDTH] [--ruler]
+usage: fmt.py [-h] [-w WIDTH] [--ruler] [--optimal]
 
 join lines of the same indentation, and split at width or before it
 
@@ -9,9 +9,11 @@ options:
   -h, --help  show this help message and exit
   -w WIDTH    width to split at or before (default: don't print into last column of terminal)
   --ruler     show a ruler to count off the columns
+  --optimal   even out the right margin, in place of filling each line as full as it goes
 
 quirks:
-  buffers whole paragraphs, not just lines, but takes each blank line as its own paragraph
+  writes each line as soon as it fills, but takes each blank line as its own paragraph
+  holds back up to 2048 words at a time, to even out the right margin, when --optimal
   joins and splits all lines, not just lines that don't begin with an nroff "." dot
   defaults to fit inside terminal width, not to the prefer 65 within max 75 of bash "fmt"
   guesses -w terminal width from "COLUMNS", else sys.stdout, else "/dev/tty", else guesses 80
@@ -31,6 +33,7 @@ examples:
   echo $(seq 0 39) |fmt.py -42  # split to fit inside width
   echo $(seq 0 39) |tr -d ' ' |fmt.py -42  # no split at width
   echo su-per-ca-li-fra-gil-is-tic-ex-pi-a-li-doc-ious |fmt.py -42  # no split at "-" dashes
+  echo $(seq 0 39) |fmt.py -42 --optimal  # even out the right margin
   :
   fmt.py --ruler -w72  # ends in column 72
   : # 5678_0123456_8901234_6789012_4567890 2345678_0123456_8901234_6789012  # the 72-column ruler
@@ -42,11 +45,15 @@ examples:
 import os
 import re
 import sys
-import textwrap
 
 import argdoc
 
 
+BLANKS_REGEX = re.compile(r"([ \t\n\r\f\v]+)")  # not "\xA0" no-break space
+
+LOOKAHEAD_WORDS = 2048  # even out the right margin across this many words at a time
+
+
 def main(argv):
     """Run from the command line"""
 
@@ -70,7 +77,7 @@ def main(argv):
 
     # Else join and split Stdin
 
-    fmt_paragraphs_of_stdin(width)
+    fmt_paragraphs_of_stdin(width, optimal=args.optimal)
 
 
 def print_ruler(width):
@@ -91,20 +98,20 @@ def print_ruler(width):
     print(ruler.rstrip())
 
 
-def fmt_paragraphs_of_stdin(width):
+def fmt_paragraphs_of_stdin(width, optimal):
     """Join lines of the same indentation, and split at width or before it"""
 
     column = width + 1
     prompt_tty_stdin("Joining words, resplitting before column {}".format(column))
 
-    para = list()
+    filler = None
     para_dent = None
 
     while True:
         line = sys.stdin.readline()
         if not line:
-            if para:
-                fmt_one_paragraph(para_dent, para=para, width=width)
+            if filler:
+                filler.close()
             break
 
         (str_dent, text) = str_splitdent(line)
@@ -113,35 +120,159 @@ def fmt_paragraphs_of_stdin(width):
         dent = str_dent if rstripped else None
 
         if (dent != para_dent) or (not rstripped):
-            if para:
-                fmt_one_paragraph(para_dent, para=para, width=width)
-                para = list()
+            if filler:
+                filler.close()
+                filler = None
             para_dent = dent
 
         if rstripped:
-            para.append(rstripped)
+            if not filler:
+                filler = ParagraphFiller(dent, width=width, optimal=optimal)
+            filler.add_text(rstripped)
         else:
             print()
 
 
-def fmt_one_paragraph(dent, para, width):
-    """Join words of one paragraph, resplit them into fewest wide lines, and print the lines"""
-
-    assert dent is not None
-    assert all(_ for _ in para)
-
-    text = "\n".join(para)
-
-    fill_width = (width - len(dent)) if (len(dent) < width) else 1
-    fill_chars = textwrap.fill(
-        text, width=fill_width, break_on_hyphens=False, break_long_words=False
-    )
-    fill_lines = fill_chars.splitlines()
-
-    assert fill_lines  # TODO: think some more here
-
-    for fill_line in fill_chars.splitlines():
-        print((dent + fill_line).rstrip())
+class ParagraphFiller:
+    """Join words of one paragraph, and resplit them into lines, as the words come"""
+
+    def __init__(self, dent, width, optimal):
+
+        assert dent is not None
+
+        self.dent = dent
+        self.fill_width = (width - len(dent)) if (len(dent) < width) else 1
+        self.optimal = optimal
+
+        self.line = list()  # the words and blanks of the next line, filling greedily
+        self.line_length = 0
+
+        self.gaps = list()  # the blanks before each word held, when filling optimally
+        self.words = list()
+
+    def add_text(self, text):
+        """Take the words of one more line of the paragraph"""
+
+        assert text
+
+        chunks = BLANKS_REGEX.split(text.expandtabs())
+        words = chunks[::2]
+        gaps = [" "] + list((len(_) * " ") for _ in chunks[1::2])  # join lines by " "
+
+        if self.optimal:
+            self.words.extend(words)
+            self.gaps.extend(gaps)
+            if len(self.words) >= LOOKAHEAD_WORDS:
+                self.fill_optimally(closing=False)
+            return
+
+        # Take the whole line at once, when it fits
+
+        text_length = sum(len(_) for _ in chunks)
+        if self.line_length and (
+            (self.line_length + 1 + text_length) <= self.fill_width
+        ):
+            for (gap, word) in zip(gaps, words):
+                self.line.append(gap)
+                self.line.append(word)
+            self.line_length += 1 + text_length
+            return
+
+        # Else fill each line greedily, as full as it will go
+
+        for (gap, word) in zip(gaps, words):
+            if not self.line_length:
+                self.line = [word]
+                self.line_length = len(word)
+            elif (self.line_length + len(gap) + len(word)) <= self.fill_width:
+                self.line.append(gap)
+                self.line.append(word)
+                self.line_length += len(gap) + len(word)
+            else:
+                self.write_line("".join(self.line))
+                self.line = [word]
+                self.line_length = len(word)
+
+    def close(self):
+        """Write the last lines of the paragraph"""
+
+        if self.optimal:
+            self.fill_optimally(closing=True)
+        elif self.line_length:
+            self.write_line("".join(self.line))
+            self.line = list()
+            self.line_length = 0
+
+    def fill_optimally(self, closing):
+        """Split the words held into the lines that leave the least squared slack"""
+
+        words = self.words
+        gaps = self.gaps
+        width = self.fill_width
+
+        # Find where each word starts and ends, if all joined into one line
+
+        starts = list()
+        ends = list()
+        offset = 0
+        for (index, (gap, word)) in enumerate(zip(gaps, words)):
+            offset += len(gap) if index else 0
+            starts.append(offset)
+            offset += len(word)
+            ends.append(offset)
+
+        # Find the least slack squared of the lines up to each word,
+        # counting only the lines that fit, or that hold one too-long word,
+        # and not counting the slack of the last line of the paragraph
+
+        count = len(words)
+        costs = [0] + (count * [None])
+        breaks = (count + 1) * [0]
+        for stop in range(1, count + 1):
+            end = ends[stop - 1]
+            for start in range(stop - 1, -1, -1):
+                slack = width - (end - starts[start])
+                if (slack < 0) and (start < stop - 1):
+                    break
+
+                cost = costs[start]
+                if (slack > 0) and not (closing and (stop == count)):
+                    cost += slack * slack
+
+                if (costs[stop] is None) or (cost < costs[stop]):
+                    costs[stop] = cost
+                    breaks[stop] = start
+
+        # Write the lines, but hold back the last few lines, till the paragraph ends
+
+        stops = list()
+        stop = count
+        while stop:
+            stops.append(stop)
+            stop = breaks[stop]
+        stops.reverse()
+
+        held = 0 if closing else (LOOKAHEAD_WORDS // 4)
+
+        start = 0
+        for stop in stops:
+            if stop > (count - held):
+                break
+            chunks = list()
+            for index in range(start, stop):
+                if index > start:
+                    chunks.append(gaps[index])
+                chunks.append(words[index])
+            self.write_line("".join(chunks))
+            start = stop
+
+        del self.words[:start]
+        del self.gaps[:start]
+
+    def write_line(self, fill_line):
+        """Write one line of the paragraph"""
+
+        print((self.dent + fill_line).rstrip())
 
 
 #
@@ -1,8 +1,57 @@
 #!/usr/bin/env python3
 
+"""
+usage: gunzip.py [-h] [-c] [-f] [-k] [FILE ...]
+
+expand ".gz" files, a chunk at a time
+
+positional arguments:
+  FILE          a file to expand (default: stdin to stdout)
+
+options:
+  -h, --help    show this help message and exit
+  -c, --stdout  write to stdout, and keep the input files
+  -f, --force   replace output files, and copy out input that's not gzip'ped
+  -k, --keep    keep the input files
+
+quirks:
+  runs like 'gzip_.py -d'
+  expands each of the gzip members of a file, one after another
+  keeps the permissions and modified date of each file, but not its owner
+
+unsurprising quirks:
+  prompts for stdin, like mac bash "grep -R .", unlike bash "gunzip"
+  accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
+  takes "-" as meaning "/dev/stdin", like linux "gunzip -"
+
+examples:
+  gunzip.py a.gz  # expand to a, and remove a.gz
+  gunzip.py -k a.gz  # expand to a, and keep a.gz
+  gunzip.py <a.gz >a  # expand stdin to stdout
+"""
+
+
 import sys
 
-sys.stderr.write("gunzip.py: error: not implemented\n")
-sys.exit(2)  # exit 2 from rejecting usage
+import argdoc
+import gzip_
+
+
+def main(argv):
+
+    args = argdoc.parse_args(argv[1:])
+
+    args.decompress = True
+    args.level = None
+    args.processes = None
+    args.rsyncable = False
+
+    return gzip_.gzip_paths(args.files, args=args)
+
+
+if __name__ == "__main__":
+    with gzip_.BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
+
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
@@ -1,9 +1,361 @@
 #!/usr/bin/env python3
 
+"""
+usage: gzip_.py [-h] [-c] [-d] [-f] [-k] [--level LEVEL] [-p N] [--rsyncable] [FILE ...]
+
+compress or expand files, a chunk at a time, in the ".gz" gzip format
+
+positional arguments:
+  FILE                 a file to compress (default: stdin to stdout)
+
+options:
+  -h, --help           show this help message and exit
+  -c, --stdout         write to stdout, and keep the input files
+  -d, --decompress     expand the input, don't compress it
+  -f, --force          replace output files, and copy out input that's not gzip'ped
+  -k, --keep           keep the input files
+  --level LEVEL        compress 1 fastest, 9 smallest, or in between (default: 6)
+  -p N, --processes N  compress blocks across this many threads (default: 1)
+  --rsyncable          cut blocks by content, not by count, so small changes make small diffs
+
+quirks:
+  takes "-1" through "-9" as meaning "--level 1" through "--level 9"
+  writes one gzip member per block when run with "-p" more than 1, like "pigz"
+  writes no file name and no timestamp into the gzip header
+  expands each of the gzip members of a file, one after another
+  keeps the permissions and modified date of each file, but not its owner
+
+unsurprising quirks:
+  prompts for stdin, like mac bash "grep -R .", unlike bash "gzip"
+  accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
+  takes "-" as meaning "/dev/stdin", like linux "gzip -"
+  doesn't redefine the "import gzip" of https://docs.python.org/3/library/gzip.html
+
+examples:
+  gzip_.py -k gzip_.py && ls -l gzip_.py.gz  # compress to a new file
+  gzip_.py -dc gzip_.py.gz |head  # expand to stdout
+  gzip_.py -9 -p 16 --rsyncable <dump.sql >dump.sql.gz  # compress across 16 threads
+  cat a.gz b.gz |gzip_.py -dc  # expand each of the gzip members
+"""
+
+
+import concurrent.futures
+import contextlib
+import os
+import re
+import shutil
+import stat
 import sys
+import zlib
+
+import argdoc
+
+
+CHUNK_SIZE = 1024 * 1024  # read about one MiB at a time
+
+GZIP_MAGIC = b"\x1F\x8B"
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # write and read the gzip header and trailer
+
+BLOCK_SIZE = 4 * 1024 * 1024  # compress about four MiB per thread at a time
+MIN_RSYNC_BLOCK_SIZE = 64 * 1024  # cut rsyncable blocks no smaller than this
+MAX_RSYNC_BLOCK_SIZE = 16 * 1024 * 1024  # cut rsyncable blocks no larger than this
+
+RSYNC_BYTESET = bytes(_ for _ in range(0x100) if ((_ * 0x9D) & 0xFF) < 0x20)
+RSYNC_REGEX = re.compile(b"[" + re.escape(RSYNC_BYTESET) + b"]{7}")
+# matches about once per 2 MiB of random bytes, because (1 / 8) ** 7 == 1 / 2 ** 21
+
+
+def main(argv):
+
+    gzip_argv_tail = list(argv[1:])
+    for (index, arg) in enumerate(argv[1:]):
+        if re.match(r"^[-][1-9]$", string=arg):
+            gzip_argv_tail[index] = "--level={}".format(arg[1:])
+
+    args = argdoc.parse_args(gzip_argv_tail)
+
+    return gzip_paths(args.files, args=args)
+
+
+def gzip_paths(paths, args):
+    """Compress or expand each file, else Stdin to Stdout"""
+
+    level = 6 if (args.level is None) else int(args.level)
+    processes = 1 if (args.processes is None) else int(args.processes)
+    if not (1 <= level <= 9) or (processes < 1):
+        stderr_print("gzip.py: error: choose --level 1..9, and -p 1 or more")
+        sys.exit(2)  # exit 2 from rejecting usage
+
+    args.level = level
+    args.processes = processes
+
+    # Compress or expand each file
+
+    paths = paths if paths else ["-"]
+
+    if "-" in paths:
+        prompt_tty_stdin()
+
+    exit_status = None
+    for path in paths:
+        try:
+            if (path == "-") or args.stdout:
+                gzip_path_to_stdout(path, args=args)
+            else:
+                gzip_path_to_path(path, args=args)
+        except (OSError, zlib.error, ValueError) as exc:
+            stderr_print("gzip.py: error: {}: {}".format(type(exc).__name__, exc))
+            exit_status = 1
+
+    return exit_status
+
+
+def gzip_path_to_stdout(path, args):
+    """Compress or expand one file to Stdout"""
+
+    ofile = sys.stdout.buffer
+    if not (args.decompress or args.force):
+        if ofile.isatty():
+            raise ValueError("compressed data not written to a terminal (add -f)")
+
+    readable = "/dev/stdin" if (path == "-") else path
+    with open(readable, mode="rb", buffering=0) as incoming:
+        gzip_incoming(incoming, ofile=ofile, args=args)
+
+    ofile.flush()
+
+
+def gzip_path_to_path(path, args):
+    """Compress or expand one file to a new file, and then remove the file"""
+
+    # Choose the name of the new file
+
+    if args.decompress:
+        if path.endswith(".tgz"):
+            opath = path[: -len(".tgz")] + ".tar"
+        elif path.endswith(".gz"):
+            opath = path[: -len(".gz")]
+        else:
+            raise ValueError("{}: unknown suffix, not '.gz' nor '.tgz'".format(path))
+    else:
+        if path.endswith(".gz"):
+            raise ValueError("{}: already has '.gz' suffix".format(path))
+        opath = path + ".gz"
+
+    st = os.stat(path)
+    if not stat.S_ISREG(st.st_mode):
+        raise ValueError("{}: not a regular file".format(path))
+
+    # Write the new file, and give it the permissions and modified date of the old file
+
+    xw_mode = "wb" if args.force else "xb"
+    with open(path, mode="rb", buffering=0) as incoming:
+        with open(opath, mode=xw_mode) as ofile:
+            try:
+                gzip_incoming(incoming, ofile=ofile, args=args)
+            except BaseException:
+                os.remove(opath)
+                raise
+
+    shutil.copystat(path, opath)
+
+    if not args.keep:
+        os.remove(path)
+
+
+def gzip_incoming(incoming, ofile, args):
+    """Compress or expand one file"""
+
+    if args.decompress:
+        gunzip_incoming(incoming, ofile=ofile, passing_through=args.force)
+    elif args.processes > 1:
+        gzip_incoming_in_parallel(incoming, ofile=ofile, args=args)
+    else:
+        gzip_incoming_serially(incoming, ofile=ofile, args=args)
+
+
+def gzip_incoming_serially(incoming, ofile, args):
+    """Compress one file as one gzip member"""
+
+    compressor = zlib.compressobj(args.level, zlib.DEFLATED, GZIP_WBITS)
+
+    for block in iter_blocks(incoming, rsyncable=args.rsyncable):
+        ofile.write(compressor.compress(block))
+        if args.rsyncable:
+            ofile.write(compressor.flush(zlib.Z_FULL_FLUSH))  # let rsync resynch here
+
+    ofile.write(compressor.flush())
+
+
+def gzip_incoming_in_parallel(incoming, ofile, args):
+    """Compress each block as its own gzip member, across many threads at once"""
+
+    level = args.level
+    processes = args.processes
+
+    with concurrent.futures.ThreadPoolExecutor(processes) as executor:
+
+        futures = list()
+        for block in iter_blocks(incoming, rsyncable=args.rsyncable):
+            future = executor.submit(gzip_member, block, level=level)
+            futures.append(future)
+
+            # Write each block in order, and hold only a few blocks in memory at a time
+
+            while len(futures) > (2 * processes):
+                ofile.write(futures.pop(0).result())
+
+        for future in futures:
+            ofile.write(future.result())
+
+        if not futures:
+            ofile.write(gzip_member(b"", level=level))
+
+
+def gzip_member(block, level):
+    """Compress one block as one whole gzip member, while releasing the GIL"""
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    member = compressor.compress(block) + compressor.flush()
+
+    return member
+
+
+def iter_blocks(incoming, rsyncable):
+    """Yield blocks of input, cut by content if rsyncable, else by count"""
+
+    if not rsyncable:
+        block = bytearray()
+        while True:
+            chunk = incoming.read(BLOCK_SIZE - len(block))
+            if chunk:
+                block.extend(chunk)
+            if block and ((len(block) >= BLOCK_SIZE) or not chunk):
+                yield bytes(block)
+                block = bytearray()
+            if not chunk:
+                break
+
+        return
+
+    held = b""
+    while True:
+        chunk = incoming.read(CHUNK_SIZE)
+        held += chunk
+
+        while len(held) > MIN_RSYNC_BLOCK_SIZE:
+            match = RSYNC_REGEX.search(held, MIN_RSYNC_BLOCK_SIZE, MAX_RSYNC_BLOCK_SIZE)
+            if match:
+                end = match.end()
+            elif len(held) >= MAX_RSYNC_BLOCK_SIZE:
+                end = MAX_RSYNC_BLOCK_SIZE
+            else:
+                break
+
+            yield held[:end]
+            held = held[end:]
+
+        if not chunk:
+            break
+
+    if held:
+        yield held
+
+
+def gunzip_incoming(incoming, ofile, passing_through):
+    """Expand each gzip member of one file, else copy out the file as is"""
+
+    data = incoming.read(CHUNK_SIZE)
+    if not data.startswith(GZIP_MAGIC):
+        if not passing_through:
+            raise ValueError("not in gzip format")
+
+        while data:
+            ofile.write(data)
+            data = incoming.read(CHUNK_SIZE)
+
+        return
+
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    while data:
+
+        # Expand a chunk, but no more than a chunk at a time, to guard against zip bombs
+
+        ofile.write(decompressor.decompress(data, CHUNK_SIZE))
+        while decompressor.unconsumed_tail and not decompressor.eof:
+            tail = decompressor.unconsumed_tail
+            ofile.write(decompressor.decompress(tail, CHUNK_SIZE))
+
+        # Start again at the start of the next gzip member, if any
+
+        if decompressor.eof:
+            data = decompressor.unused_data
+            if not data:
+                data = incoming.read(CHUNK_SIZE)
+                if not data:
+                    break
+            if not data.startswith(GZIP_MAGIC[: len(data)]):
+                if data.strip(b"\x00"):
+                    stderr_print("gzip.py: warning: trailing garbage ignored")
+                break
+
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+            continue
+
+        data = incoming.read(CHUNK_SIZE)
+
+    if not decompressor.eof:
+        ofile.write(decompressor.flush())
+        if not decompressor.eof:
+            raise ValueError("unexpected end of file")
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
-sys.stderr.write("gzip.py: error: not implemented\n")
-sys.exit(2)  # exit 2 from rejecting usage
 
-# doesn't redefine the "import gzip" of https://docs.python.org/3/library/gzip.html
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
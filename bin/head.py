@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 """
-usage: head.py [-h] [-n COUNT] [FILE ...]
+usage: head.py [-h] [-n COUNT] [-c BYTES] [FILE ...]
 
 show just the leading lines of a file
 
@@ -12,10 +12,14 @@ options:
   -h, --help            show this help message and exit
   -n COUNT, --lines COUNT
                         how many leading lines to show (default: 10)
+  -c BYTES, --bytes BYTES
+                        how many leading bytes to show, in place of lines
 
 quirks:
   takes a count led by "+" as how many trailing lines to drop
   takes "-5" or "+9" and such, like mac "tail", unlike bash "head"
+  quits reading as soon as it has shown enough, so as to close pipes promptly
+  holds back only as many trailing lines as it drops, not the whole file
 
 unsurprising quirks:
   prompts for stdin, like mac bash "grep -R .", unlike bash "head"
@@ -27,25 +31,231 @@ examples:
   head.py head.py
   head.py -5 head.py
   head.py -n 5 head.py
-  head.py -n +40 head.py  # akin to vim +40 head.py
+  head.py -n +40 head.py  # drop the last 40 lines
+  seq 1 19 |head.py +16  # count the trailing lines to drop, not the lines to keep
+  head.py -c 3 head.py  # show the 3 bytes of the "#!/" shebang
+  yes |head.py -3  # quit the pipe promptly
 """
 
 
+import contextlib
+import os
+import re
+import stat
 import sys
 
 import argdoc
 
 
-def main():
-    args = argdoc.parse_args()
-    sys.stderr.write("{}\n".format(args))
-    sys.stderr.write("{}\n".format(argdoc.format_usage().rstrip()))
-    sys.stderr.write("head.py: error: not implemented\n")
-    sys.exit(2)  # exit 2 from rejecting usage
+CHUNK_SIZE = 64 * 1024  # read at most 64 KiB at a time
+
+
+def main(argv):
+    """Run from the command line"""
+
+    count_options = ("-c", "--bytes", "-n", "--lines")
+
+    head_argv_tail = list(argv[1:])
+    for (index, arg) in enumerate(argv[1:]):
+        if re.match(r"^[-+][0-9]+$", string=arg):
+            if (index == 0) or (argv[1:][index - 1] not in count_options):
+                head_argv_tail[index] = "-n{}".format(arg)
+
+    args = argdoc.parse_args(head_argv_tail)
+
+    # Choose to show leading lines or bytes, or to drop trailing lines or bytes
+
+    counting_bytes = args.bytes is not None
+    arg_count = args.bytes if counting_bytes else args.lines
+
+    count = 10
+    dropping = False
+    if arg_count is not None:
+        try:
+            count = abs(int(arg_count))
+        except ValueError:
+            stderr_print("head.py: error: invalid number: {!r}".format(arg_count))
+            sys.exit(2)  # exit 2 from rejecting usage
+        dropping = arg_count.startswith("+")
+
+    # Head each file
+
+    paths = args.files if args.files else ["-"]
+
+    if "-" in paths:
+        prompt_tty_stdin()
+
+    exit_status = None
+
+    for (index, path) in enumerate(paths):
+        readable = "/dev/stdin" if (path == "-") else path
+        try:
+            with open(readable, mode="rb", buffering=0) as incoming:
+
+                if len(paths) > 1:
+                    title = "==> {} <==".format(path)
+                    print(("\n" + title) if index else title)
+                    sys.stdout.flush()
+
+                fd = incoming.fileno()
+                if dropping:
+                    head_fd_dropping(fd, count=count, counting_bytes=counting_bytes)
+                else:
+                    head_fd_keeping(fd, count=count, counting_bytes=counting_bytes)
+
+        except OSError as exc:
+            stderr_print("head.py: error: {}: {}".format(type(exc).__name__, exc))
+            exit_status = 1
+
+    return exit_status
+
+
+def head_fd_keeping(fd, count, counting_bytes):
+    """Copy out the leading lines or bytes, and quit reading as soon as copied"""
+
+    ofd = sys.stdout.fileno()
+
+    kept = 0
+    while kept < count:
+        chunk = os.read(fd, CHUNK_SIZE)
+        if not chunk:
+            break
+
+        # Find the end of the bytes to keep
+
+        end = len(chunk)
+        if counting_bytes:
+            end = min(end, count - kept)
+            kept += end
+        else:
+            index = -1
+            while kept < count:
+                index = chunk.find(b"\n", index + 1)
+                if index < 0:
+                    break
+                kept += 1
+            if kept == count:
+                end = index + 1
+
+        os_write_all(ofd, chunk[:end])
+
+        # Give back what we read but don't copy, when reading from a regular file
+
+        if end < len(chunk):
+            if stat.S_ISREG(os.fstat(fd).st_mode):
+                os.lseek(fd, end - len(chunk), os.SEEK_CUR)
+
+
+def head_fd_dropping(fd, count, counting_bytes):
+    """Copy out all but the trailing lines or bytes, holding back only those"""
+
+    ofd = sys.stdout.fileno()
+
+    held = bytearray()
+    while True:
+        chunk = os.read(fd, CHUNK_SIZE)
+        if not chunk:
+            break
+        held.extend(chunk)
+
+        if len(held) < CHUNK_SIZE:
+            continue
+
+        # Copy out what can't be among the trailing lines or bytes
+
+        if counting_bytes:
+            end = max(0, len(held) - count)
+        else:
+            end = rfind_line_end_index(held, count=(count + 1))
+
+        if end:
+            os_write_all(ofd, held[:end])
+            del held[:end]
+
+    # Copy out all but the trailing lines or bytes, at end of input
+
+    if counting_bytes:
+        end = max(0, len(held) - count)
+    else:
+        end = len(held)
+        if held.endswith(b"\n"):
+            end -= 1  # don't count the line-end of the last line
+        end = rfind_line_end_index(held[:end], count=count)
+
+    os_write_all(ofd, held[:end])
+
+
+def rfind_line_end_index(data, count):
+    """Find the index just past the line-end found by counting line-ends from the end"""
+
+    if not count:
+        return len(data)
+
+    index = len(data)
+    for _ in range(count):
+        index = data.rfind(b"\n", 0, index)
+        if index < 0:
+            return 0
+
+    return index + 1
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def os_write_all(fd, data):
+    """Write all the bytes, even when the fd takes only some of them at a time"""
+
+    view = memoryview(data)
+    while view:
+        length = os.write(fd, view)
+        view = view[length:]
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 r"""
-usage: ls.py [-h] [-1] [-C] [-l] [--headings] [-d] [-a] [--full-time] [-F]
+usage: ls.py [-h] [-1] [-C] [-l] [--headings] [-d] [-a] [-R] [--full-time] [-F]
              [--sort FIELD] [-S] [-X] [-f] [-t] [-v] [--ascending] [--descending] [-r]
              [TOP ...]
 
@@ -18,6 +18,7 @@ options:
   --headings       print as rows (a la -l), but start with one row of column headings
   -d, --directory  list less: each top as itself, omitting dirs and files inside
   -a, --all        list more: add the dirs and files whose names start with a "." dot
+  -R, --recursive  list more: add the dirs inside each dir, and the dirs inside those, etc
   --full-time      detail more: add the %a weekday and %f microseconds
   -F, --classify   detail more: mark names as "/*@" for dirs, "chmod +x", and "ln -s"
   --sort FIELD     choose sort field by name: ext, name, none, time, or size
@@ -46,6 +47,9 @@ quirks:
   shows dirs in just one way, sorts by just one field, chokes when args call for more
   guesses -C terminal width from "COLUMNS", else sys.stdout, else "/dev/tty", else guesses 80
   slams a deleted dir as a "stale file handle", like later Linux, unlike Mac and older Linux
+  stats each file once, or twice for a sym link, and only when sorting or detailing needs it
+  prints each name as soon as listed, when sorting by none, except when printing as -C columns
+  lists a few dirs ahead of time, across threads, when told to list -R recursively
   sees files as hidden if and only if name starts with ".", as if just for Mac and Linux
 
 examples:
@@ -55,6 +59,7 @@ examples:
   ls -C
   ls -alFt |tac  # reverse sort without ls -r at Linux
   ls -alFt |tail -r  # reverse sort without ls -r at Mac
+  ls -lR /mnt/share  # list each dir inside, and each dir inside those, etc
   ls.py --headings
   COLUMNS=101 ls.py -C |tee as-wide-as-you-say.txt
   ls.py -C |tee as-wide-as-tty.txt
@@ -70,7 +75,6 @@ examples:
 # FIXME: add the --color that's missing at Mac
 # FIXME: tell us about sym links that don't resolve
 # FIXME FIXME:  -x               print by filling multiple rows
-# FIXME: add -R recursive walk
 # FIXME: closer match at "ls.py -C" to classic line splits of "ls -C"
 # FIXME argdoc: somehow separate help lines for -1 -C -l --hea / -a --fu -F / --sort ...
 # FIXME: share "def spill_cells" etc with "import column", "import fmt, etc
@@ -80,12 +84,12 @@ examples:
 
 from __future__ import print_function
 
-import argparse
 import collections
+import concurrent.futures
+import contextlib
 import datetime as dt
 import os
 import stat
-import subprocess
 import sys
 
 import argdoc
@@ -93,6 +97,19 @@ import argdoc
 import pkg_resources  # in 2021, actually more native than "import distutils"
 
 
+CHMOD_CHARS = "drwxrwxrwx"  # style chmod permissions
+CHMOD_MASKS = [stat.S_IFDIR]
+CHMOD_MASKS.extend([stat.S_IRUSR, stat.S_IWUSR, stat.S_IXUSR])
+CHMOD_MASKS.extend([stat.S_IRGRP, stat.S_IWGRP, stat.S_IXGRP])
+CHMOD_MASKS.extend([stat.S_IROTH, stat.S_IWOTH, stat.S_IXOTH])
+assert len(CHMOD_CHARS) == len(CHMOD_MASKS)
+
+RECURSIVE_THREADS = 8  # list this many dirs at a time, ahead of printing them
+RECURSIVE_LOOKAHEAD = 4 * RECURSIVE_THREADS  # list no more dirs than this ahead
+
+STREAM_SIZE_WIDTH = 11  # pad sizes out to 11 digits, when printing before listing all
+
+
 def main():
     """Interpret a command line"""
 
@@ -103,11 +120,18 @@ def main():
     correct_args(args, stdout_isatty=stdout_isatty, stdout_columns=stdout_columns)
 
     tops = args.tops if args.tops else [os.curdir]
+
+    exit_status = None
     for index in range(len(tops)):
-        print_one_top_walk(tops=tops, index=index, args=args)
+        exit_status = (
+            print_one_top_walk(tops=tops, index=index, args=args) or exit_status
+        )
         if args.directory:
             break
 
+    if exit_status:
+        sys.exit(exit_status)
+
 
 def correct_args(args, stdout_isatty, stdout_columns):
     """Auto-correct else reject contradictions among the command line args"""
@@ -287,17 +311,97 @@ def _decide_sort_order_args(args):
 
 def print_one_top_walk(tops, index, args):
 
-    (top, names, args_directory) = _plan_one_top_walk(tops, index=index, args=args)
+    (top, finds, args_directory) = _plan_one_top_walk(tops, index=index, args=args)
+
+    if args.recursive and not args_directory:
+        exit_status = print_one_top_walk_recursively(
+            tops, index=index, finds=finds, args=args
+        )
+
+        return exit_status
 
     _run_one_top_walk(
         tops,
         index=index,
         top=top,
-        names=names,
+        finds=finds,
         args=args,
         args_directory=args_directory,
     )
 
+    return None
+
+
+def print_one_top_walk_recursively(tops, index, finds, args):
+    """Print the top dir, then each dir inside it, depth first, listing a few dirs ahead
+
+    Return nonzero if any dir won't list, but print every dir that will
+    """
+
+    top = tops[index]
+
+    exit_status = None
+    with concurrent.futures.ThreadPoolExecutor(RECURSIVE_THREADS) as executor:
+
+        # Print each dir in order, but list the next few dirs in the background
+
+        # the (dir, future) of the dirs to print, in order
+        pending = collections.deque()
+        pending.append((top, executor.submit(list_finds, finds)))
+
+        while pending:
+            (dirpath, future) = pending.popleft()
+
+            if (index > 0) or (dirpath != top):
+                print()
+            print("{}:".format(dirpath))
+
+            try:
+                listed = future.result()
+            except OSError as exc:
+                stderr_print("ls.py: error: {}: {}".format(type(exc).__name__, exc))
+                exit_status = 1
+                continue
+
+            dirnames = _run_one_top_walk(
+                tops,
+                index=index,
+                top=dirpath,
+                finds=listed,
+                args=args,
+                args_directory=False,
+                recursing=True,
+            )
+
+            for dirname in reversed(dirnames):
+                path = os.path.join(dirpath, dirname)
+                pending.appendleft((path, None))
+
+            # List only the next few dirs ahead, so as to hold only a few lists at a time
+
+            for pending_index in range(min(len(pending), RECURSIVE_LOOKAHEAD)):
+                (path, future) = pending[pending_index]
+                if future is None:
+                    finds = os_scandir_finds(path, all_=args.all)
+                    future = executor.submit(list_finds, finds)
+                    pending[pending_index] = (path, future)
+
+    return exit_status
+
+
+def list_finds(finds):
+    """List the finds of a dir, and cache the stat of each, as a background job"""
+
+    listed = list(finds)
+    for (_, entry) in listed:
+        if entry is not None:
+            try:
+                entry.stat(follow_symlinks=False)
+            except OSError:  # such as FileNotFoundError for a name deleted since listed
+                pass
+
+    return listed
+
 
 def _plan_one_top_walk(tops, index, args):
     """Plan to run differently, as per -a and -d or not, as per top is dir or not"""
@@ -316,52 +420,65 @@ def _plan_one_top_walk(tops, index, args):
             names = list(_ for _ in names if not os.path.split(_)[-1].startswith("."))
             # hidden file names start with "." at Mac and Linux, per:  os.name == "posix"
 
-    elif not os.path.isdir(tops[index]):
+        finds = list((_, None) for _ in names)
+
+        return (top, finds, args_directory)
+
+    try:
+        top_stats = os.stat(tops[index])
+    except OSError:
+        top_stats = None
+
+    if not (top_stats and stat.S_ISDIR(top_stats.st_mode)):
 
         args_directory = True
         top = None
-        listed = [tops[index]]
 
-        names = listed
-
-    else:
+        finds = [(tops[index], None)]
 
-        top = tops[index]
+        return (top, finds, args_directory)
 
-        listed = list()
-        listed.append(os.curdir)
-        listed.append(os.pardir)
-        os_listdir_top = os.listdir(top)
-        listed.extend(os_listdir_top)
+    top = tops[index]
 
-        if os_path_isdir_deleted(
-            top
-        ):  # should be False, and unneeded, when not os_listdir_top
-            stderr_print(
-                "ls.py: warning: cannot access {!r}: stale file handle {}".format(
-                    top, "of deleted dir"
-                )
+    if not top_stats.st_nlink:  # zero links to a dir that's been deleted
+        stderr_print(
+            "ls.py: warning: cannot access {!r}: stale file handle {}".format(
+                top, "of deleted dir"
             )
-            sys.exit(2)  # classic exit status 2 for a deleted dir
+        )
+        sys.exit(2)  # classic exit status 2 for a deleted dir
 
-        names = listed
-        if not args.all:
-            names = list(_ for _ in names if not os.path.split(_)[-1].startswith("."))
-            # hidden file names start with "." at Mac and Linux, per:  os.name == "posix"
+    finds = os_scandir_finds(top, all_=args.all)
 
-    return (
-        top,
-        names,
-        args_directory,
-    )
+    return (top, finds, args_directory)
+
+
+def os_scandir_finds(top, all_):
+    """Yield each name inside the dir, with its DirEntry if any, as fast as listed"""
+
+    finds = [(os.curdir, None), (os.pardir, None)]
+    for find in finds:
+        if all_:
+            yield find
 
+    with os.scandir(top) as entries:
+        for entry in entries:
+            if all_ or not entry.name.startswith("."):
+                yield (entry.name, entry)
+                # hidden file names start with "." at Mac and Linux, per:  os.name == "posix"
 
-def _run_one_top_walk(tops, index, top, names, args, args_directory):
-    """Print files and dirs found, as lines of names, as a matrix of names, or as rows of detail"""
+
+def _run_one_top_walk(tops, index, top, finds, args, args_directory, recursing=False):
+    """Print files and dirs found, as lines of names, as a matrix of names, or as rows of detail
+
+    Return the names of the dirs inside, in the order printed
+    """
 
     # Trace the top and separate by blank line, if more than one top
 
-    if not args_directory:
+    if recursing:
+        pass
+    elif not args_directory:
         print_as_plural_if_plural(tops, index)
     elif not args.directory:
         if len(tops) > 1:
@@ -370,39 +487,45 @@ def _run_one_top_walk(tops, index, top, names, args, args_directory):
     # Find dirs and files inside this one top dir
     # FIXME: conform to Linux listing CurDir and ParDir in other places, unlike Mac Bash
 
-    # Collect stats for each
+    # Print each as soon as listed, when not sorting, nor justifying columns of names
 
-    stats_by_name = dict()
-    for name in names:
-        wherewhat = name if args_directory else os.path.join(top, name)
-        try:
-            stats = os.stat(wherewhat)
-        except FileNotFoundError as exc:
-            stderr_print("ls.py: error: {}: {}".format(type(exc).__name__, exc))
-            sys.exit(1)  # FIXME: defer the FileNotFoundError's to list the rest
-        stats_by_name[name] = stats
+    now = dt.datetime.now()
 
-    # Mark each with r"[*/@]" for executable-not-dir, dir, or symbolic link
+    if args._sort_by == "none":
+        if (args._print_as != "columns_of_names") and not args.headings:
+            dirnames = stream_finds(
+                finds,
+                top=top,
+                args=args,
+                now_year=now.year,
+                args_directory=args_directory,
+            )
 
-    names_by_name = {_: _ for _ in names}
+            return dirnames
 
-    markeds_by_name = dict()
-    for name in names:
-        wherewhat = name if args_directory else os.path.join(top, name)
-        rep = mark_name(name=name, wherewhat=wherewhat, stats=stats_by_name[name])
-        markeds_by_name[name] = rep
+    # Collect stats for each, but only when sorting, marking, or detailing needs them
+    # Mark each with r"[*/@]" for executable-not-dir, dir, or symbolic link
 
-    reps_by_name = markeds_by_name if args.classify else names_by_name
+    stats_by_name = dict()
+    reps_by_name = dict()
+    walkables = set()
+    for (name, entry) in finds:
+        (stats, rep) = stat_and_mark_found(
+            name, entry=entry, top=top, args=args, args_directory=args_directory
+        )
+        stats_by_name[name] = stats
+        reps_by_name[name] = rep
+        if (entry is not None) and entry.is_dir(follow_symlinks=False):
+            walkables.add(name)
 
     # Sort finds
 
     items = stats_items_sorted(stats_by_name, by=args._sort_by, order=args._sort_order)
     reps = list(reps_by_name[_[0]] for _ in items)
+    dirnames = list(_[0] for _ in items if _[0] in walkables)
 
     # Print as one name per line, as columns or rows of names, or as rows of details
 
-    now = dt.datetime.now()
-
     if args._print_as == "lines_of_names":
         print_as_lines_of_names(reps)
     elif args._print_as == "columns_of_names":
@@ -418,17 +541,91 @@ def _run_one_top_walk(tops, index, top, names, args, args_directory):
             args_directory=args_directory,
         )
 
+    return dirnames
+
+
+def stream_finds(finds, top, args, now_year, args_directory):
+    """Print each name or row of detail as soon as listed, in fixed-width columns
+
+    Return the names of the dirs inside, in the order printed
+    """
+
+    str_none = "."
+    dirnames = list()
+
+    detailing = args._print_as == "rows_of_detail"
+    if detailing:
+        print_the_total_row(str_none=str_none, args=args, args_directory=args_directory)
+
+    for (name, entry) in finds:
+        (stats, rep) = stat_and_mark_found(
+            name, entry=entry, top=top, args=args, args_directory=args_directory
+        )
+
+        if not detailing:
+            print(rep)
+        else:
+            row = form_row_of_detail(
+                stats, rep=rep, str_none=str_none, args=args, now_year=now_year
+            )
+            cells = list(str(_) for _ in row)
+            cells[4] = cells[4].rjust(STREAM_SIZE_WIDTH)  # FIXME: inconceivable hack
+            print("  ".join(cells))
+
+        if (entry is not None) and entry.is_dir(follow_symlinks=False):
+            dirnames.append(name)
+
+    return dirnames
+
 
-def mark_name(name, wherewhat, stats):
+def stat_and_mark_found(name, entry, top, args, args_directory):
+    """Stat the find only if needed, and mark its name only if asked"""
+
+    stating = args_directory or args.classify
+    stating = stating or (args._print_as == "rows_of_detail")
+    stating = stating or (args._sort_by in "size time".split())
+
+    stats = None
+    islink = None
+    if stating:
+        wherewhat = name if args_directory else os.path.join(top, name)
+        try:
+            (stats, islink) = os_stat_found(wherewhat, entry=entry)
+        except FileNotFoundError as exc:
+            stderr_print("ls.py: error: {}: {}".format(type(exc).__name__, exc))
+            sys.exit(1)  # FIXME: defer the FileNotFoundError's to list the rest
+
+    rep = name
+    if args.classify:
+        rep = mark_name(name=name, stats=stats, islink=islink)
+
+    return (stats, rep)
+
+
+def os_stat_found(wherewhat, entry):
+    """Stat once, from the dir listing if given, and then stat again only for a sym link"""
+
+    lstats = (
+        os.lstat(wherewhat) if (entry is None) else entry.stat(follow_symlinks=False)
+    )
+    if not stat.S_ISLNK(lstats.st_mode):
+        return (lstats, False)
+
+    try:
+        stats = os.stat(wherewhat)
+    except FileNotFoundError:  # FIXME: tell us more about sym links that don't resolve
+        stats = lstats
+
+    return (stats, True)
+
+
+def mark_name(name, stats, islink):
     """Mark name with r"[*/@]" for executable-not-dir, dir, or symbolic link, else no mark"""
 
-    isdir = os.path.isdir(wherewhat)
-    stats_isdir = bool(stats.st_mode & stat.S_IFDIR)
-    assert stats_isdir == isdir
+    isdir = stat.S_ISDIR(stats.st_mode)
 
     isx = bool(stats.st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXGRP))
-
-    islink = os.path.islink(wherewhat)
+    isx = isx and not stat.S_ISLNK(stats.st_mode)  # a sym link that doesn't resolve
 
     mark = ""
     if isdir:
@@ -453,7 +650,8 @@ def stats_items_sorted(stats_by_name, by, order):
     assert order in "ascending descending".split()
     reverse = order == "descending"
 
-    items.sort(key=lambda sw: sw[0])
+    if by != "name":
+        items.sort(key=lambda sw: sw[0])  # break ties by name
     if by == "extension":
         items.sort(key=lambda sw: os.path.splitext(sw[0])[-1], reverse=reverse)
     elif by == "name":  # sort by "name" here meaning sort by name+ext
@@ -516,15 +714,6 @@ def print_as_rows_of_detail(index, args, items, reps_by_name, now_year, args_dir
 
     str_none = "."
 
-    # Style chmod permissions
-
-    chmod_chars = "drwxrwxrwx"
-    chmod_masks = [stat.S_IFDIR]
-    chmod_masks.extend([stat.S_IRUSR, stat.S_IWUSR, stat.S_IXUSR])
-    chmod_masks.extend([stat.S_IRGRP, stat.S_IWGRP, stat.S_IXGRP])
-    chmod_masks.extend([stat.S_IROTH, stat.S_IWOTH, stat.S_IXOTH])
-    assert len(chmod_chars) == len(chmod_masks)
-
     # Form rows
 
     rows = list()
@@ -535,52 +724,65 @@ def print_as_rows_of_detail(index, args, items, reps_by_name, now_year, args_dir
             rows.append(row)
 
     for (name, stats) in items:
+        rep = reps_by_name[name]
+        row = form_row_of_detail(
+            stats, rep=rep, str_none=str_none, args=args, now_year=now_year
+        )
+        rows.append(row)
 
-        chmods = ""
-        for (char, mask) in zip(chmod_chars, chmod_masks):
-            chmods += char if (stats.st_mode & mask) else "-"
+    print_the_formed_rows(
+        rows, str_none=str_none, args=args, args_directory=args_directory
+    )
 
-        links = str_none
-        owner = str_none
-        group = str_none
 
-        stamp = dt.datetime.fromtimestamp(stats.st_mtime)
-        if args.full_time:
-            str_stamp = stamp.strftime("%a %Y-%m-%d %H:%M:%S.%f")
-        else:  # FIXME: emulate the original over-packing date/time-stamp heuristics more closely
-            if stamp.year == now_year:
-                str_stamp = stamp.strftime("%b {:2d} %H:%M".format(stamp.day))
-            else:
-                str_stamp = stamp.strftime("%b {:2d}  %Y".format(stamp.day))
+def form_row_of_detail(stats, rep, str_none, args, now_year):
+    """Form one row of detail:  chmods, links, owner, group, size, date/time-stamp, name"""
 
-        size = str_none
-        if chmods.startswith("-"):
-            size = stats.st_size
+    chmods = ""
+    for (char, mask) in zip(CHMOD_CHARS, CHMOD_MASKS):
+        chmods += char if (stats.st_mode & mask) else "-"
 
-        rep = reps_by_name[name]
+    links = str_none
+    owner = str_none
+    group = str_none
 
-        row = (chmods, links, owner, group, size, str_stamp, rep)
-        rows.append(row)
+    stamp = dt.datetime.fromtimestamp(stats.st_mtime)
+    if args.full_time:
+        str_stamp = stamp.strftime("%a %Y-%m-%d %H:%M:%S.%f")
+    else:  # FIXME: emulate the original over-packing date/time-stamp heuristics more closely
+        if stamp.year == now_year:
+            str_stamp = stamp.strftime("%b {:2d} %H:%M".format(stamp.day))
+        else:
+            str_stamp = stamp.strftime("%b {:2d}  %Y".format(stamp.day))
 
-    print_the_formed_rows(
-        rows, str_none=str_none, args=args, args_directory=args_directory
-    )
+    size = str_none
+    if chmods.startswith("-"):
+        size = stats.st_size
+
+    row = (chmods, links, owner, group, size, str_stamp, rep)
+
+    return row
 
 
 def print_the_formed_rows(rows, str_none, args, args_directory):
 
     # Print rows
 
+    print_the_total_row(str_none=str_none, args=args, args_directory=args_directory)
+
+    justifieds = left_justify_cells_in_rows(rows)
+    for justified in justifieds:
+        print("  ".join(justified))
+
+
+def print_the_total_row(str_none, args, args_directory):
+
     if args._print_total_row:
         if args_directory and not args.directory:
             pass
         else:
             print("total {}".format(str_none))  # not a count of 512-byte data blocks
 
-    justifieds = left_justify_cells_in_rows(rows)
-    for justified in justifieds:
-        print("  ".join(justified))
-
 
 def left_justify_cells_in_rows(rows):
     """Pad each cell on the right till each column lines up vertically"""
@@ -622,9 +824,8 @@ def left_justify_cells_in_rows(rows):
     return justified_rows
 
 
-def spill_cells(cells, columns, sep):  # FIXME FIXME FIXME  # noqa C901
-
-    #
+def spill_cells(cells, columns, sep):
+    """Spill the cells down as many shafts as fit side by side, each shaft as tall as needed"""
 
     cell_strs = list(str(c) for c in cells)
 
@@ -632,57 +833,52 @@ def spill_cells(cells, columns, sep):  # FIXME FIXME FIXME  # noqa C901
     if not cell_strs:
         return no_floors
 
-    #
+    # Measure each cell just once
 
-    floors = None  # FIXME: review spill_cells closely, now that it mostly works
-    widths = None  # FIXME: offer tabulation with 1 to N "\t" in place of 1 to N " "
+    count = len(cell_strs)
+    cell_widths = list(len(_) for _ in cell_strs)
+    sum_cell_widths = sum(cell_widths)
 
-    for width in reversed(range(1, len(cell_strs) + 1)):
-        height = (len(cell_strs) + width - 1) // width
-        assert (width * height) >= len(cell_strs)
+    # Skip past the shaft counts whose seps alone don't fit
 
-        # Fill each shaft in order, let the last shaft stop short
-        # FIXME: Option to fill each floor in order, let the last floor stop short
-
-        shafts = list()
-        for shaft_index in range(width):
-            shaft = cell_strs[(shaft_index * height) :][:height]
-            shafts.append(shaft)
+    max_width = 1
+    if columns > 0:
+        max_width = min(count, ((columns - 1) // len(sep)) + 1)
 
-        floors = list()
-        for floor_index in range(height):
-            floor = list()
-            for shaft in shafts:
-                if floor_index < len(shaft):
-                    str_cell = shaft[floor_index]
-                    floor.append(str_cell)
-            floors.append(floor)
+    # Take the most shafts that fit, else one shaft
+    # FIXME: offer tabulation with 1 to N "\t" in place of 1 to N " "
 
-        # Count out the width of each shaft
+    height = count
+    for width in reversed(range(1, max_width + 1)):
+        height = (count + width - 1) // width
+        if width == 1:
+            break
 
-        widths = collections.defaultdict(int)
-        for floor in floors:
-            for (shaft_index, str_cell) in enumerate(floor):
-                widths[shaft_index] = max(widths[shaft_index], len(str_cell))
+        # Skip past the shaft counts whose average widths don't fit
 
-        # Take the first matrix that fits, else the last matrix tried
-        # FIXME: Print it to see if it fits
+        seps_width = len(sep) * (width - 1)
+        if ((sum_cell_widths + height - 1) // height + seps_width) >= columns:
+            continue
 
-        sep = "  "
-        if (sum(widths.values()) + (len(sep) * (width - 1))) < columns:
-            break
+        # Fill each shaft in order, let the last shaft stop short, and measure each shaft
+        # FIXME: Option to fill each floor in order, let the last floor stop short
 
-        if width == 1:
+        matrix_width = seps_width
+        for shaft_start in range(0, count, height):
+            matrix_width += max(cell_widths[shaft_start:][:height])
+            if matrix_width >= columns:
+                break
+        else:
             break
 
     # Print the matrix
 
+    shaft_widths = list(max(cell_widths[_:][:height]) for _ in range(0, count, height))
+
     rows = list()
-    for floor in floors:
-        row = list()
-        for (shaft_index, str_cell) in enumerate(floor):
-            padded_str_cell = str_cell.ljust(widths[shaft_index])
-            row.append(padded_str_cell)
+    for floor_index in range(height):
+        floor = cell_strs[floor_index::height]
+        row = list(_.ljust(shaft_widths[i]) for (i, _) in enumerate(floor))
         rows.append(row)
 
     return rows
@@ -772,25 +968,6 @@ def sys_stdout_guess_tty_columns_os_environ_int(hint):
     return terminal_width
 
 
-# deffed in many files  # missing from docs.python.org
-def os_path_isdir_deleted(top):  # FIXME: solve this without calling:  bash /dev/null
-    """Mark a deleted dir apart from undeleted dirs, even if working inside of it"""
-
-    run = subprocess_run(
-        "bash /dev/null".split(),
-        cwd=top,
-        stdin=subprocess.PIPE,  # FIXME FIXME: how often should .run.stdin be PIPE?
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-
-    if run.stdout or run.stderr or run.returncode:
-
-        return True
-
-    return False
-
-
 # deffed in many files  # missing from docs.python.org
 def stderr_print(*args):
     """Print the Args, but to Stderr, not to Stdout"""
@@ -800,67 +977,32 @@ def stderr_print(*args):
     sys.stderr.flush()  # like for kwargs["end"] != "\n"
 
 
-# deffed in many files  # since Sep/2015 Python 3.5
-def subprocess_run(args, **kwargs):
-    """
-    Emulate Python 3 "subprocess.run"
-
-    Don't help the caller remember to encode empty Stdin as:  stdin=subprocess.PIPE
-    """
-
-    # Trust the library, if available
-
-    if hasattr(subprocess, "run"):
-        run = subprocess.run(args, **kwargs)  # pylint: disable=subprocess-run-check
-
-        return run
-
-    # Convert KwArgs to Python 2
-
-    kwargs2 = dict(kwargs)  # args, cwd, stdin, stdout, stderr, shell, ...
-
-    for kw in "encoding errors text universal_newlines".split():
-        if kw in kwargs:
-            raise NotImplementedError("keyword {}".format(kw))
-
-    for kw in "check input".split():
-        if kw in kwargs:
-            del kwargs2[kw]  # drop now, catch later
-
-    input2 = None
-    if "input" in kwargs:
-        input2 = kwargs["input"]
-
-        if "stdin" in kwargs:
-            raise ValueError("stdin and input arguments may not both be used.")
-
-        assert "stdin" not in kwargs2
-        kwargs2["stdin"] = subprocess.PIPE
-
-    # Emulate the library roughly, because often good enough
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
 
-    sub = subprocess.Popen(args, **kwargs2)  # pylint: disable=consider-using-with
-    (stdout, stderr) = sub.communicate(input=input2)
-    returncode = sub.poll()
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
 
-    if "check" in kwargs:
-        if returncode != 0:
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
 
-            raise subprocess.CalledProcessError(
-                returncode=returncode, cmd=args, output=stdout
-            )
+    def __enter__(self):
+        return self
 
-    # Succeed
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
 
-    run = argparse.Namespace(
-        args=args, stdout=stdout, stderr=stderr, returncode=returncode
-    )
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
 
-    return run
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with BrokenPipeErrorSink():
+        main()
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
@@ -1,26 +1,36 @@
 #!/usr/bin/env python3
 
-"""
-usage: paste.py [-h] [FILE ...]
+r"""
+usage: paste.py [-h] [-d LIST] [-s] [FILE ...]
 
 copy each file into place as a column
 
 positional arguments:
-  FILE        a file to copy (default: stdin)
+  FILE                  a file to copy (default: stdin)
 
 options:
-  -h, --help  show this help message and exit
+  -h, --help            show this help message and exit
+  -d LIST, --delimiters LIST
+                        separate columns with these chars, in turn (default: "\t")
+  -s, --serial          copy each file into place as a row, not as a column
 
 quirks:
-  no implementation
+  takes the "\\", "\0", "\n", and "\t" escapes inside the -d LIST
+  holds only one line per file in memory, never a whole file
 
 unsurprising quirks:
   prompts for stdin, like mac bash "grep -R .", unlike bash "paste -"
   accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
   takes no args as meaning file stdin, like linux "paste", unlike mac "paste"
+  takes "-" as meaning the next line of stdin, each time it appears
 
 examples:
-  Oh no! No examples disclosed!! 💥 💔 💥
+  seq 1 3 >a.txt && seq 4 6 >b.txt
+  paste.py a.txt b.txt  # two columns
+  paste.py -d, a.txt b.txt  # two columns, split by "," commas
+  paste.py -s a.txt b.txt  # two rows
+  seq 1 6 |paste.py - -  # two columns of stdin
+  seq 1 6 |paste.py -s -d '+' |bc  # add up the lines
 """
 
 # FIXME: left-justify, right-justify, center, with and without sponging
@@ -28,21 +38,171 @@ examples:
 # FIXME: options to take column names as a first row or as a column
 
 
+import contextlib
+import os
 import sys
 
 import argdoc
 
 
-def main():
-    args = argdoc.parse_args()
-    sys.stderr.write("{}\n".format(args))
-    sys.stderr.write("{}\n".format(argdoc.format_usage().rstrip()))
-    sys.stderr.write("wc.py: error: not implemented\n")
-    sys.exit(2)  # exit 2 from rejecting usage
+ESCAPES_BY_CHAR = {"\\": b"\\", "0": b"", "n": b"\n", "t": b"\t"}
+
+
+def main(argv):
+
+    args = argdoc.parse_args(argv[1:])
+
+    delimiters = [b"\t"]
+    if args.delimiters is not None:
+        delimiters = split_delimiters(args.delimiters)
+
+    paths = args.files if args.files else ["-"]
+
+    if "-" in paths:
+        prompt_tty_stdin()
+
+    # Open each file, but open Stdin just once
+
+    with contextlib.ExitStack() as stack:
+
+        readers = list()
+        stdin_reader = None
+        for path in paths:
+            if path == "-":
+                if stdin_reader is None:
+                    stdin_reader = open_or_exit(stack, "/dev/stdin")
+                readers.append(stdin_reader)
+            else:
+                readers.append(open_or_exit(stack, path))
+
+        # Paste the files side by side, else one after another
+
+        ofile = sys.stdout.buffer
+        if args.serial:
+            for reader in readers:
+                paste_serially(reader, delimiters=delimiters, ofile=ofile)
+        else:
+            paste_in_lockstep(readers, delimiters=delimiters, ofile=ofile)
+
+
+def split_delimiters(chars):
+    """Split a -d LIST into one or more delimiters, after taking its escapes"""
+
+    delimiters = list()
+
+    index = 0
+    while index < len(chars):
+        ch = chars[index]
+        if (ch == "\\") and (index + 1 < len(chars)):
+            index += 1
+            ch = chars[index]
+            escaped = ESCAPES_BY_CHAR.get(ch, ch.encode())
+            delimiters.append(escaped)
+        else:
+            delimiters.append(ch.encode())
+        index += 1
+
+    if not delimiters:
+        delimiters.append(b"")
+
+    return delimiters
+
+
+def open_or_exit(stack, path):
+    """Open a file for reading its lines, else exit nonzero"""
+
+    try:
+        reader = stack.enter_context(open(path, mode="rb"))
+    except OSError as exc:
+        stderr_print("paste.py: error: {}: {}".format(type(exc).__name__, exc))
+        sys.exit(1)
+
+    return reader
+
+
+def paste_in_lockstep(readers, delimiters, ofile):
+    """Write the first line of each file as one line, then the second line, etc"""
+
+    width = len(readers)
+    seps = list(delimiters[_ % len(delimiters)] for _ in range(width - 1))
+    joiner = delimiters[0] if (len(set(seps)) <= 1) else None
+
+    cells = (width + width - 1) * [b""]
+    cells[1::2] = seps
+
+    while True:
+        lines = list(_.readline() for _ in readers)
+        if not any(lines):
+            break
+
+        if joiner is not None:
+            line = joiner.join(_.rstrip(b"\n") for _ in lines)
+        else:
+            cells[::2] = (_.rstrip(b"\n") for _ in lines)
+            line = b"".join(cells)
+
+        ofile.write(line + b"\n")
+
+
+def paste_serially(reader, delimiters, ofile):
+    """Write all the lines of one file as one line"""
+
+    index = 0
+    for line in reader:
+        if index:
+            ofile.write(delimiters[(index - 1) % len(delimiters)])
+        ofile.write(line.rstrip(b"\n"))
+        index += 1
+
+    ofile.write(b"\n")
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
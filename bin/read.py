@@ -21,6 +21,9 @@ quirks:
   defines ↑ ↓ up/down history review to skip over blank lines, like Zsh
   undoes edits of input and history at Return or ⌃C, like Zsh
   keeps blank lines in history, like Bash for non-empty blank lines (unstable feature?)
+  keeps the history of "bash.py" on disk, shared by all its sessions, and reads it only as asked
+  keeps that history at "~/.cache/pybashish/stdin.txt", unless told otherwise by $PYBASHISH_HISTFILE
+  searches back through history as each char arrives after ⌃R, like Bash "reverse-i-search"
   doesn't stuff the line into a Bash Environment Variable (unlike Dash requiring var)
   prints the received line as a Python Repr
 
@@ -48,9 +51,15 @@ examples:
 
 from __future__ import print_function
 
+import array
+import bisect
 import contextlib
+import fcntl
+import mmap
 import os
+import re
 import select
+import struct
 import sys
 import termios
 import tty
@@ -74,6 +83,20 @@ assert len(BASIC_LATIN_STDINS) == 95 == (128 - 33) == (0x7F - 0x20)
 X20_LOWER_MASK = 0x20
 X20_UPPER_MASK = 0x20
 
+HISTORY_PATH = os.path.join("~", ".cache", "pybashish", "stdin.txt")
+HISTORY_PATH = os.environ.get("PYBASHISH_HISTFILE", HISTORY_PATH)
+
+HISTORY_OFFSET_FORMAT = "=Q"  # the end of each line, as a 64-bit offset into the file
+HISTORY_OFFSET_SIZE = struct.calcsize(HISTORY_OFFSET_FORMAT)
+
+HISTORY_SEGMENT_LINES = 4096  # index this many lines at a time
+HISTORY_SEGMENT_LINES_MAX = 0x10000  # merge no more lines than a posting "H" can count
+
+HISTORY_SEGMENT_HEADER_FORMAT = "=QQQ"  # first line, stop line, count of keys
+HISTORY_SEGMENT_HEADER_SIZE = struct.calcsize(HISTORY_SEGMENT_HEADER_FORMAT)
+
+HISTORY_LOOKUP_RATIO = 16  # look up each hit in a list this much longer, else scan it
+
 
 def main(argv):
     """Run from the command line"""
@@ -145,16 +168,544 @@ def _parse_read_argv(argv):
 def readline(prompt):
     """Read one line of edited input, or raise KeyboardInterrupt"""
 
+    ShLineHistory.open_file()
+
     with GlassTeletype() as gt:
         shline = gt.readline(prompt)
 
+    ShLineHistory.save(shline)
+
     return shline
 
 
 class ShLineHistory:
     """Remember old lines of edited input"""
 
-    shlines = list()  # FIXME: resume history from "~/.cache/pybashish/stdin.txt"
+    shlines = list()  # the lines of this session
+    file_ = None  # the lines of every session, once opened
+
+    @classmethod
+    def open_file(cls):
+        """Plan to share history with other sessions, but don't read it yet"""
+
+        if cls.file_ is None:
+            cls.file_ = ShLineHistoryFile(HISTORY_PATH)
+
+    @classmethod
+    def save(cls, shline):
+        """Share a line of this session, unless blank, else stop sharing if it won't save"""
+
+        if cls.file_ and shline.strip():
+            try:
+                cls.file_.append(shline.rstrip("\n"))
+            except OSError as exc:
+                stderr_print("read.py: warning: {}: {}".format(type(exc).__name__, exc))
+                cls.file_ = False
+
+    @classmethod
+    def count(cls):
+        """Count the lines of history"""
+
+        if cls.file_:
+            return cls.file_.count()
+
+        return len(cls.shlines)
+
+    @classmethod
+    def any_nonblank(cls, stop):
+        """Say if any line of history before the stop is not blank"""
+
+        if cls.file_:
+            return stop > 0  # blank lines aren't shared
+
+        return any(_.strip() for _ in cls.shlines[:stop])
+
+    @classmethod
+    def line(cls, index):
+        """Fetch one line of history"""
+
+        if cls.file_:
+            return cls.file_.line(index)
+
+        return cls.shlines[index]
+
+    @classmethod
+    def search(cls, query, before):
+        """Find the latest line of history before this one that holds the query, else None"""
+
+        if cls.file_:
+            return cls.file_.search(query, before=before)
+
+        for index in reversed(range(before)):
+            if query in cls.shlines[index]:
+                return index
+
+        return None
+
+
+class ShLineHistoryFile:
+    """Keep lines of input on disk, shared by sessions, and index them to read them lazily
+
+    Append each line to the file, and the end offset of each line to the "-offsets" file.
+    Index the trigrams of each few thousand lines as one segment file of the "-index" dir,
+    and merge segments of equal size, so as to search only a few segments
+    """
+
+    def __init__(self, path):
+
+        self.path = os.path.abspath(os.path.expanduser(path))  # as of when first opened
+        self.offsets_path = self.path + "-offsets"
+        self.index_dir = self.path + "-index"
+
+        self.maps = dict()  # the (size, mmap) of each file mapped
+        self.segments = dict()  # the segment of each (name, inode) of the index read
+
+    def count(self):
+        """Count the lines indexed"""
+
+        ends = self._map_ends()
+
+        return len(ends)
+
+    def line(self, index):
+        """Fetch one line, without reading the lines around it"""
+
+        ends = self._map_ends()
+        (_, text) = self._map(self.path)
+
+        start = ends[index - 1] if index else 0
+        data = text[start : (ends[index] - len(b"\n"))]
+
+        return _decode_history_line(data)
+
+    def search(self, query, before):
+        """Find the latest line before this one that holds the query, else None
+
+        Search the lines not yet indexed from the end back, and then each segment,
+        visiting only the lines that hold every trigram of the query
+        """
+
+        ends = self._map_ends()
+
+        stop = min(before, len(ends))
+        if not (query and stop):
+            return None
+
+        data = query.encode()
+        grams = _split_grams(data, width=3)
+
+        segments = self._list_segments()
+        indexed = segments[0].stop if segments else 0
+
+        if indexed < stop:
+            found = self._search_lines(query, first=indexed, stop=stop)
+            if found is not None:
+                return found
+
+        for segment in segments:
+            if segment.first >= stop:
+                continue
+
+            segment_stop = min(stop, segment.stop)
+
+            if not grams:  # search for 1 or 2 bytes only where they are
+                if segment.holds(data):
+                    found = self._search_lines(
+                        query, first=segment.first, stop=segment_stop
+                    )
+                    if found is not None:
+                        return found
+
+                continue
+
+            for index in segment.find(grams, stop=segment_stop):
+                if query in self.line(index):
+                    return index
+
+        return None
+
+    def _search_lines(self, query, first, stop):
+        """Find the latest line of a range that holds the query, else None"""
+
+        data = _encode_history_line(query)
+
+        ends = self._map_ends()
+        (_, text) = self._map(self.path)
+
+        start = ends[first - 1] if first else 0
+        end = ends[stop - 1]
+        while True:
+            found = text.rfind(data, start, end)
+            if found < 0:
+                return None
+
+            index = bisect.bisect_right(ends, found)
+            if query in self.line(index):  # such as not "n" matching the "n" of "\\n"
+                return index
+
+            end = ends[index - 1] if index else 0
+
+    def append(self, shline):
+        """Add one line to the end, while locking out other sessions"""
+
+        data = _encode_history_line(shline) + b"\n"
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        flags = os.O_RDWR | os.O_CREAT
+        fd = os.open(self.path, flags=(flags | os.O_APPEND), mode=0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)  # unlocked by "os.close"
+
+            offsets_fd = os.open(self.offsets_path, flags=flags, mode=0o600)
+            try:
+
+                os.write(fd, data)
+                count = self._index_tail(fd, offsets_fd=offsets_fd)
+
+            finally:
+                os.close(offsets_fd)
+
+            self._index_segments(count)
+
+        finally:
+            os.close(fd)
+
+    def _index_tail(self, fd, offsets_fd):
+        """Index the lines not yet indexed, else index every line again, and count them"""
+
+        text_size = os.fstat(fd).st_size
+        offsets_size = os.fstat(offsets_fd).st_size
+
+        # Start over if the file shrank, or if the index came apart
+
+        count = offsets_size // HISTORY_OFFSET_SIZE
+        end = 0
+        if count:
+            packed = os.pread(
+                offsets_fd, HISTORY_OFFSET_SIZE, (count - 1) * HISTORY_OFFSET_SIZE
+            )
+            end = struct.unpack(HISTORY_OFFSET_FORMAT, packed)[0]
+
+        if (end > text_size) or (offsets_size % HISTORY_OFFSET_SIZE):
+            os.ftruncate(offsets_fd, 0)
+            (count, end) = (0, 0)
+
+            for segment in self._list_segments():
+                os.remove(self._calc_segment_path(segment.first, stop=segment.stop))
+
+        # Index the end of each whole line of the tail
+
+        tail = os.pread(fd, text_size - end, end)
+        lines = tail.split(b"\n")[:-1]
+
+        ends = list()
+        for line in lines:
+            end += len(line) + len(b"\n")
+            ends.append(end)
+
+        packed = b"".join(struct.pack(HISTORY_OFFSET_FORMAT, _) for _ in ends)
+        os.pwrite(offsets_fd, packed, count * HISTORY_OFFSET_SIZE)
+
+        return count + len(ends)
+
+    def _index_segments(self, count):
+        """Index each whole segment of lines not yet indexed, and merge segments of equal size"""
+
+        segments = list(reversed(self._list_segments()))
+        indexed = segments[-1].stop if segments else 0
+
+        while (count - indexed) >= HISTORY_SEGMENT_LINES:
+
+            # Index the trigrams of a segment of lines, and note the shorter grams too
+
+            (first, stop) = (indexed, indexed + HISTORY_SEGMENT_LINES)
+
+            datas = list(self.line(_).encode() for _ in range(first, stop))
+
+            postings_by_gram = dict()
+            for (posting, data) in enumerate(datas):
+                for gram in _split_grams(data, width=3):
+                    postings_by_gram.setdefault(gram, list()).append(posting)
+
+            joined = b"\n".join(datas)  # may add grams that cross lines, but only grams
+            for width in (1, 2):
+                for gram in _split_grams(joined, width=width):
+                    postings_by_gram[gram] = list()
+
+            postings_by_key = dict(
+                (_calc_gram_key(k), v) for (k, v) in postings_by_gram.items()
+            )
+
+            segments.append(
+                self._write_segment(first, stop=stop, postings_by_key=postings_by_key)
+            )
+            indexed = stop
+
+            # Merge the latest segments, while they are of equal size
+
+            while len(segments) >= 2:
+                (older, newer) = segments[-2:]
+
+                lines = newer.stop - newer.first
+                if (older.stop - older.first) != lines:
+                    break
+                if (2 * lines) > HISTORY_SEGMENT_LINES_MAX:
+                    break
+
+                segments[-2:] = [self._merge_segments(older, newer=newer)]
+
+    def _merge_segments(self, older, newer):
+        """Write one segment in place of two, then remove the two"""
+
+        shift = newer.first - older.first
+
+        postings_by_key = dict()
+        for (segment, plus) in ((older, 0), (newer, shift)):
+            for (index, key) in enumerate(segment.keys):
+                (start, end) = segment.starts[index : (index + 2)]
+                postings = postings_by_key.setdefault(key, list())
+                postings.extend((_ + plus) for _ in segment.postings[start:end])
+
+        merged = self._write_segment(
+            older.first, stop=newer.stop, postings_by_key=postings_by_key
+        )
+
+        os.remove(self._calc_segment_path(older.first, stop=older.stop))
+        os.remove(self._calc_segment_path(newer.first, stop=newer.stop))
+
+        return merged
+
+    def _write_segment(self, first, stop, postings_by_key):
+        """Write one segment of the index, all at once, and return it"""
+
+        keys = sorted(postings_by_key.keys())
+
+        starts = array.array("I", [0])
+        postings = array.array("H")
+        for key in keys:
+            postings.extend(postings_by_key[key])
+            starts.append(len(postings))
+
+        header = struct.pack(HISTORY_SEGMENT_HEADER_FORMAT, first, stop, len(keys))
+        chunks = (header, array.array("I", keys), starts, postings)
+
+        # Write a whole file, then name it, so other sessions see none of it, or all of it
+
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        path = self._calc_segment_path(first, stop=stop)
+        with open(path + "~", mode="wb") as writing:
+            for chunk in chunks:
+                writing.write(chunk)
+
+        os.replace(path + "~", path)
+
+        segment = ShLineHistorySegment(path)
+
+        return segment
+
+    def _calc_segment_path(self, first, stop):
+        """Name the file of a segment by its first and stop lines"""
+
+        name = "{:012d}-{:012d}".format(first, stop)
+        path = os.path.join(self.index_dir, name)
+
+        return path
+
+    def _list_segments(self):
+        """List the segments of the index, latest first, skipping those merged already"""
+
+        try:
+            with os.scandir(self.index_dir) as entries:
+                listed = list(entries)
+        except FileNotFoundError:
+            listed = list()
+
+        spans = list()
+        for entry in listed:
+            match = re.match(r"^([0-9]+)-([0-9]+)$", string=entry.name)
+            if match:
+                (first, stop) = (int(match.group(1)), int(match.group(2)))
+                spans.append((first, stop, entry))
+
+        segments = list()
+        low = None
+        for (first, stop, entry) in sorted(spans, key=lambda _: (-_[1], _[0])):
+            if (low is None) or (stop <= low):
+
+                key = (entry.name, entry.inode())
+                segment = self.segments.get(key)
+                if segment is None:
+                    try:
+                        segment = ShLineHistorySegment(entry.path)
+                    except FileNotFoundError:  # such as merged by another session
+                        continue
+                    self.segments[key] = segment
+
+                segments.append(segment)
+                low = first
+
+        return segments
+
+    def _map_ends(self):
+        """Map the end offset of each line"""
+
+        (size, mapped) = self._map(self.offsets_path)
+        if not size:
+            return ()
+
+        ends = memoryview(mapped)[: (size - size % HISTORY_OFFSET_SIZE)]
+        ends = ends.cast(HISTORY_OFFSET_FORMAT[-1])
+
+        return ends
+
+    def _map(self, path):
+        """Map a file into memory, again if it grew since, and return its size and bytes"""
+
+        try:
+            size = os.stat(path).st_size
+        except FileNotFoundError:
+            size = 0
+
+        (mapped_size, mapped) = self.maps.get(path, (0, b""))
+        if size != mapped_size:
+            mapped = b""
+            if size:
+                with open(path, mode="rb") as reading:
+                    mapped = mmap.mmap(
+                        reading.fileno(), length=size, access=mmap.ACCESS_READ
+                    )
+
+            self.maps[path] = (size, mapped)
+
+        return (size, mapped)
+
+
+class ShLineHistorySegment:
+    """Map each gram of some lines of history to the lines that hold it
+
+    Read a header, then the key of each gram, sorted, then where the postings of each
+    key start, then each posting as the index of a line, counted from the first line
+    """
+
+    def __init__(self, path):
+
+        with open(path, mode="rb") as reading:
+            mapped = mmap.mmap(reading.fileno(), length=0, access=mmap.ACCESS_READ)
+
+        (first, stop, count) = struct.unpack_from(HISTORY_SEGMENT_HEADER_FORMAT, mapped)
+
+        self.first = first
+        self.stop = stop
+
+        view = memoryview(mapped)
+        offset = HISTORY_SEGMENT_HEADER_SIZE
+
+        keys_size = count * struct.calcsize("I")
+        self.keys = view[offset : (offset + keys_size)].cast("I")
+        offset += keys_size
+
+        starts_size = (count + 1) * struct.calcsize("I")
+        self.starts = view[offset : (offset + starts_size)].cast("I")
+        offset += starts_size
+
+        self.postings = view[offset:].cast("H")
+
+    def holds(self, gram):
+        """Say if any line holds the gram"""
+
+        index = self._find_key(gram)
+
+        return index is not None
+
+    def find(self, grams, stop):
+        """Yield each line before the stop that holds every gram, latest first"""
+
+        lists = list()
+        for gram in grams:
+            index = self._find_key(gram)
+            if index is None:
+                return
+
+            postings = self.postings[self.starts[index] : self.starts[index + 1]]
+            lists.append(postings)
+
+        # Intersect the shortest lists first, and look up into the longer lists
+
+        lists.sort(key=len)
+
+        shortest = lists[0]
+        hits = set(shortest[: bisect.bisect_left(shortest, stop - self.first)])
+        for postings in lists[1:]:
+            if not hits:
+                break
+
+            if (HISTORY_LOOKUP_RATIO * len(hits)) < len(postings):
+                hits = set(_ for _ in hits if _sorted_holds(postings, value=_))
+            else:
+                hits.intersection_update(postings)
+
+        for posting in sorted(hits, reverse=True):
+            yield self.first + posting
+
+    def _find_key(self, gram):
+        """Find the index of the key of a gram, else None"""
+
+        key = _calc_gram_key(gram)
+
+        index = bisect.bisect_left(self.keys, key)
+        if (index < len(self.keys)) and (self.keys[index] == key):
+            return index
+
+        return None
+
+
+def _encode_history_line(shline):
+    """Encode a line of history as one line of bytes"""
+
+    escaped = shline.replace("\\", "\\\\").replace("\n", "\\n")
+    data = escaped.encode()
+
+    return data
+
+
+def _decode_history_line(data):
+    """Decode one line of bytes as a line of history"""
+
+    def unescape(match):
+        ch = match.group(1)
+        return "\n" if (ch == "n") else ch
+
+    escaped = bytes(data).decode(errors="replace")
+    shline = re.sub(r"\\(.)", repl=unescape, string=escaped)
+
+    return shline
+
+
+def _split_grams(data, width):
+    """Pick out each distinct run of bytes of one width"""
+
+    grams = set(data[index : (index + width)] for index in range(len(data) - width + 1))
+
+    return grams
+
+
+def _calc_gram_key(gram):
+    """Sort the grams by width, then by bytes"""
+
+    key = (len(gram) << 24) | int.from_bytes(gram, byteorder="big")
+
+    return key
+
+
+def _sorted_holds(values, value):
+    """Say if a sorted sequence holds a value"""
+
+    index = bisect.bisect_left(values, value)
+    holds = (index < len(values)) and (values[index] == value)
+
+    return holds
 
 
 class TerminalShadow:
@@ -209,6 +760,7 @@ class GlassTeletype(contextlib.ContextDecorator):
         self.chars = list()  # insert chars into a shline
         self.echoes = list()  # echo chars of a shline
         self.lines = list()  # keep lines of history
+        self.history_count = None  # count lines of history, but only when first asked
 
         self._bots_by_stdin = self._calc_bots_by_stdin()
 
@@ -293,6 +845,14 @@ class GlassTeletype(contextlib.ContextDecorator):
         result = shline + quitting
         return result
 
+    def _count_history(self):
+        """Count the lines of history, as of the first time asked while editing this line"""
+
+        if self.history_count is None:
+            self.history_count = ShLineHistory.count()
+
+        return self.history_count
+
     def _open_line(self, prompt):
         """Open the line with flushes and the prompt"""
 
@@ -430,9 +990,7 @@ class GlassTeletype(contextlib.ContextDecorator):
 
         for ch in chars:
 
-            stdin = ch.encode()
-            caret_echo = "^{}".format(chr(stdin[0] ^ X40_CONTROL_MASK))
-            echo = caret_echo if (stdin in C0_CONTROL_STDINS) else ch
+            echo = self._calc_echo(ch)
 
             self.chars.append(ch)
             self.echoes.append(echo)
@@ -442,6 +1000,31 @@ class GlassTeletype(contextlib.ContextDecorator):
             else:
                 self.putch(echo)
 
+    def _calc_echo(self, chars):
+        """Spell each C0 Control char with a "^" caret, and each other char as itself"""
+
+        echo = ""
+        for ch in chars:
+            stdin = ch.encode()
+            caret_echo = "^{}".format(chr(stdin[0] ^ X40_CONTROL_MASK))
+            echo += caret_echo if (stdin in C0_CONTROL_STDINS) else ch
+
+        return echo
+
+    def _putch_over(self, echo, new_echo):
+        """Back up over the end of one echo, and print the end of another in its place"""
+
+        common = len(os.path.commonprefix([echo, new_echo]))
+
+        width = len(echo) - common
+        backing = width * "\b"
+        blanking = width * " "
+
+        self.putch(
+            "{backing}{blanking}{backing}".format(backing=backing, blanking=blanking)
+        )
+        self.putch(new_echo[common:])
+
     def _calc_bots_by_stdin(self):
         """Enlist some bots to serve many kinds of keystrokes"""
 
@@ -461,7 +1044,7 @@ class GlassTeletype(contextlib.ContextDecorator):
         bots_by_stdin[b"\x0E"] = self._next_history  # SO, aka ⌃N, aka 14
         bots_by_stdin[b"\x10"] = self._previous_history  # DLE, aka ⌃P, aka 16
         # XON, aka ⌃Q, aka 17
-        bots_by_stdin[b"\x12"] = self._reprint  # DC2, aka ⌃R, aka 18
+        bots_by_stdin[b"\x12"] = self._reverse_search_history  # DC2, aka ⌃R, aka 18
         # XOFF, aka ⌃S, aka 19
         bots_by_stdin[b"\x15"] = self._drop_line  # NAK, aka ⌃U, aka 21
         bots_by_stdin[b"\x16"] = self._quoted_insert  # ACK, aka ⌃V, aka 22
@@ -605,17 +1188,19 @@ class GlassTeletype(contextlib.ContextDecorator):
         # FIXME: stop warping cursor to Eol, here and in _next_history
         # FIXME: step back to match left-of-cursor only, a la Bash history-search-backward/forward
 
+        count = self._count_history()
+
         stepped = False
-        while len(self.lines) < len(ShLineHistory.shlines):
+        while len(self.lines) < count:
 
-            index = len(ShLineHistory.shlines) - len(self.lines)
-            if not any(_.strip() for _ in ShLineHistory.shlines[:index]):
+            index = count - len(self.lines) - 1
+            if not ShLineHistory.any_nonblank(stop=(index + 1)):
                 break
 
             shline = self._join_shline()
             self.lines.append(shline)
 
-            old_shline = ShLineHistory.shlines[-len(self.lines)]
+            old_shline = ShLineHistory.line(index)
 
             self._drop_line(stdin)
             self._insert_chars(old_shline)  # FIXME: insert only last previous choice
@@ -643,13 +1228,86 @@ class GlassTeletype(contextlib.ContextDecorator):
 
         raise KeyboardInterrupt()  # FIXME: also SIGINFO, SIGUSR1, SIGSUSP, SIGQUIT
 
-    def _reprint(self, stdin):
-        """Restart the edit of this line"""
+    def _reverse_search_history(self, stdin):
+        """Search back through history, as each char of the query arrives
 
-        _ = stdin
+        Find older lines at ⌃R, step back to the last search at ⌃H or ⌫ Delete, quit the
+        search at ⌃G, and take the line found at any other key, then serve that key
+        """
+
+        if self.silencing or self.splatter:
+            self._ring_bell(stdin)
+
+            return None
 
-        self.putch("^R\r\n")  # strike this one out, open up another
-        self.putch("".join(self.echoes))  # echo as if inserting each char of this line
+        count = self._count_history()
+        with_shline = self._join_shline()
+
+        searches = list()
+        (query, index, failing) = ("", count, False)
+
+        echo = "".join(self.echoes)
+        while True:
+
+            # Show the search, and the line found
+
+            shline = with_shline if (index >= count) else ShLineHistory.line(index)
+
+            new_echo = "({}reverse-i-search)`{}': {}".format(
+                ("failed " if failing else ""), query, self._calc_echo(shline)
+            )
+            self._putch_over(echo, new_echo=new_echo)
+            echo = new_echo
+
+            # Search again, or back up, or quit, or take the line found
+
+            key = self.getch()
+
+            if key == b"\x12":
+                found = ShLineHistory.search(query, before=index) if query else None
+                if found is None:
+                    self._ring_bell(key)
+                else:
+                    searches.append((query, index, failing))
+                    (index, failing) = (found, False)
+
+            elif key in (b"\x08", b"\x7F"):
+                if not searches:
+                    self._ring_bell(key)
+                else:
+                    (query, index, failing) = searches.pop()
+
+            elif key == b"\x07":
+                self._putch_over(echo, new_echo="".join(self.echoes))
+
+                return None
+
+            elif (
+                key and (key not in C0_CONTROL_STDINS) and not key.startswith(ESC_STDIN)
+            ):
+                searches.append((query, index, failing))
+                query += key.decode()
+                found = ShLineHistory.search(query, before=min(count, index + 1))
+                if found is None:
+                    failing = True
+                else:
+                    (index, failing) = (found, False)
+
+            else:
+                self._putch_over(echo, new_echo="")
+                self.chars = list()
+                self.echoes = list()
+                self._insert_chars(shline)
+
+                bot = self._bots_by_stdin.get(key)
+                if bot is None:
+                    bot = (
+                        self._log_stdin
+                        if (key in C0_CONTROL_STDINS)
+                        else self._insert_stdin
+                    )
+
+                return bot(key)
 
     def _ring_bell(self, stdin):
         """Ring the Terminal bell"""
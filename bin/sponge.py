@@ -15,10 +15,11 @@ options:
 quirks:
   writes more than one output, unlike classic "moreutils" "sponge"
   accepts "--a", "--ap", "--app", ... "--append" in place of classic "-a"
-  doesn't preserve the permissions of replaced output files
-  never renames a temporary file to replace the output file more indivisibly
-  doesn't first write a copy to a temporary file
-  fails if more input than free memory
+  holds up to 64 MiB of input in memory, then spills it to a temporary file beside the first output file
+  replaces each output file by renaming a temporary copy over it, so never half-written
+  keeps the permissions of replaced output files, but not their owner
+  writes into place the outputs that aren't regular files, such as "/dev/stdout"
+  copies out from the temporary file inside the kernel, where the kernel can
 
 unsurprising quirks:
   prompts for stdin, like mac bash "grep -R .", unlike bash "cat -" and "cat"
@@ -29,40 +30,237 @@ examples:
   echo two |sponge.py t.txt && cat t.txt
   cat t.txt |sponge.py t.txt && cat t.txt
   echo three |sponge.py -a t.txt && cat t.txt
+  sort big.txt |sponge.py big.txt  # sort a file larger than memory, in place
 """
 
 # TODO: explore "sponge" with no args and "sponge -" with one arg
 
 
 import contextlib
+import errno
 import os
+import stat
 import sys
+import tempfile
 
 import argdoc
 
 
+CHUNK_SIZE = 1024 * 1024  # read about one MiB at a time
+SPILL_SIZE = 64 * 1024 * 1024  # hold this much in memory, before spilling to disk
+
+KERNEL_COPY_ERRNOS = (errno.EBADF, errno.EINVAL, errno.ENOSYS, errno.EXDEV)
+KERNEL_COPY_ERRNOS += (errno.EOPNOTSUPP,)
+
+
 def main(argv):
 
     args = argdoc.parse_args(argv[1:])
 
     paths = args.files if args.files else ["-"]
 
-    # Catenate each binary (or text) file
+    # Soak up all of Stdin, and spill it beside the first output file, if need be
 
     prompt_tty_stdin()
 
-    with open("/dev/stdin", mode="rb") as incoming:
-        sponge = incoming.read()
-
+    spill_dir = None
     for path in paths:
-        writable = "/dev/stdout" if (path == "-") else path
+        if path != "-":
+            spill_dir = calc_spill_dir(path)
+            break
+
+    exit_status = None
+    with Sponge(spill_dir) as sponge:
+
         try:
-            awb_mode = "ab" if args.append else "wb"
-            with open(writable, mode=awb_mode) as outgoing:
-                os.write(outgoing.fileno(), sponge)
-        except FileNotFoundError as exc:
+            with open("/dev/stdin", mode="rb", buffering=0) as incoming:
+                sponge.soak(incoming)
+        except OSError as exc:
             stderr_print("sponge.py: error: {}: {}".format(type(exc).__name__, exc))
-            sys.exit(1)
+            return 1
+
+        # Write a copy to each output, and rename the spill over the last file replaced
+
+        renaming_index = None
+        if not args.append:
+            for (index, path) in enumerate(paths):
+                if path != "-":
+                    renaming_index = index
+
+        for (index, path) in enumerate(paths):
+            try:
+                if path == "-":
+                    sys.stdout.flush()
+                    sponge.write_fd(sys.stdout.fileno())
+                elif args.append:
+                    with open(path, mode="ab") as outgoing:
+                        sponge.write_fd(outgoing.fileno())
+                else:
+                    sponge.replace_path(path, renaming=(index == renaming_index))
+            except OSError as exc:
+                stderr_print("sponge.py: error: {}: {}".format(type(exc).__name__, exc))
+                exit_status = 1
+
+    return exit_status
+
+
+def calc_spill_dir(path):
+    """Choose the dir of an output file, else None to spill into the default temporary dir"""
+
+    try:
+        st = os.stat(path)  # stat the pipe of "/dev/stdout", not its "realpath"
+    except FileNotFoundError:
+        st = None
+
+    if st and not stat.S_ISREG(st.st_mode):
+        return None
+
+    realpath = os.path.realpath(path)
+
+    return os.path.dirname(realpath)
+
+
+class Sponge:
+    """Hold input in memory, else in a temporary file, till it ends"""
+
+    def __init__(self, spill_dir):
+
+        self.spill_dir = spill_dir
+        self.spill_fd = None
+        self.spill_path = None
+
+        self.chunks = list()
+        self.size = 0
+
+        umask = os.umask(0)
+        os.umask(umask)
+        self.umask = umask
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.spill_fd is not None:
+            os.close(self.spill_fd)
+        if self.spill_path is not None:
+            os.remove(self.spill_path)
+
+    def soak(self, incoming):
+        """Read till end of input, spilling to disk when the input grows large"""
+
+        while True:
+            chunk = incoming.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            self.size += len(chunk)
+            if self.spill_fd is not None:
+                os_write_all(self.spill_fd, chunk)
+                continue
+
+            self.chunks.append(chunk)
+            if self.size > SPILL_SIZE:
+                self.spill()
+
+    def spill(self):
+        """Move what's held in memory into a temporary file"""
+
+        (fd, path) = tempfile.mkstemp(prefix=".sponge.", dir=self.spill_dir)
+        self.spill_fd = fd
+        self.spill_path = path
+
+        for chunk in self.chunks:
+            os_write_all(fd, chunk)
+        self.chunks = list()
+
+    def write_fd(self, ofd):
+        """Write a copy of the input to an open fd"""
+
+        if self.spill_fd is None:
+            for chunk in self.chunks:
+                os_write_all(ofd, chunk)
+        else:
+            os_copy_fd_range(self.spill_fd, ofd=ofd, size=self.size)
+
+    def replace_path(self, path, renaming):
+        """Replace a file with a copy of the input, by renaming a temporary copy over it"""
+
+        try:
+            st = os.stat(path)  # stat the pipe of "/dev/stdout", not its "realpath"
+        except FileNotFoundError:
+            st = None
+
+        if st and not stat.S_ISREG(st.st_mode):
+            with open(path, mode="wb") as outgoing:
+                self.write_fd(outgoing.fileno())
+            return
+
+        realpath = os.path.realpath(path)  # replace the file, not a link to it
+        dirname = os.path.dirname(realpath)
+
+        mode = stat.S_IMODE(st.st_mode) if st else (0o666 & ~self.umask)
+
+        # Rename the spill, when it sits in the same dir
+
+        if renaming and self.spill_path:
+            if os.path.dirname(self.spill_path) == dirname:
+                os.chmod(self.spill_path, mode)
+                os.rename(self.spill_path, realpath)
+                self.spill_path = None
+                return
+
+        # Else write and rename a fresh copy
+
+        prefix = ".{}.".format(os.path.basename(realpath))
+        (fd, temp_path) = tempfile.mkstemp(prefix=prefix, dir=dirname)
+        try:
+            self.write_fd(fd)
+            os.fchmod(fd, mode)
+        except BaseException:
+            os.close(fd)
+            os.remove(temp_path)
+            raise
+
+        os.close(fd)
+        os.rename(temp_path, realpath)
+
+
+def os_copy_fd_range(ifd, ofd, size):
+    """Copy the leading bytes of a file to an fd, inside the kernel where it can"""
+
+    copy_file_range = getattr(os, "copy_file_range", None)  # Python >= 3.8 at Linux
+    sendfile = getattr(os, "sendfile", None)
+
+    offset = 0
+    while offset < size:
+        count = min(SPILL_SIZE, size - offset)
+
+        # Copy file to file, else file to anything, else through a chunk of memory
+
+        try:
+            if copy_file_range:
+                length = copy_file_range(ifd, ofd, count, offset_src=offset)
+            elif sendfile:
+                length = sendfile(ofd, ifd, offset, count)
+            else:
+                chunk = os.pread(ifd, min(CHUNK_SIZE, count), offset)
+                os_write_all(ofd, chunk)
+                length = len(chunk)
+        except OSError as exc:
+            if exc.errno not in KERNEL_COPY_ERRNOS:
+                raise
+            if copy_file_range:
+                copy_file_range = None
+            elif sendfile:
+                sendfile = None
+            else:
+                raise
+            continue
+
+        if not length:
+            raise OSError(errno.EIO, "unexpected end of spill file")
+
+        offset += length
 
 
 #
@@ -70,6 +268,16 @@ def main(argv):
 #
 
 
+# deffed in many files  # missing from docs.python.org
+def os_write_all(fd, data):
+    """Write all the bytes, even when the fd takes only some of them at a time"""
+
+    view = memoryview(data)
+    while view:
+        length = os.write(fd, view)
+        view = view[length:]
+
+
 # deffed in many files  # missing from docs.python.org
 def prompt_tty_stdin():
     if sys.stdin.isatty():
@@ -1,39 +1,279 @@
 #!/usr/bin/env python3
 
-"""
-usage: strings.py [-h] [FILE ...]
+r"""
+usage: strings.py [-h] [-n MIN] [-t RADIX] [-e ENCODING] [FILE ...]
 
 pick out bits from files
 
 positional arguments:
-  FILE        a file to pick over (default: stdin)
+  FILE                  a file to pick over (default: stdin)
 
 options:
-  -h, --help  show this help message and exit
+  -h, --help            show this help message and exit
+  -n MIN, --bytes MIN   pick out runs of at least this many printable chars (default: 4)
+  -t RADIX, --radix RADIX
+                        show the offset of each run, in "d" decimal, "o" octal, or "x" hex
+  -e ENCODING, --encoding ENCODING
+                        pick out "s" us-ascii runs, or "l" utf-16le runs (default: "s")
 
 quirks:
-  don't just pick out printables from binaries, in the way of the classic "strings" app
+  takes r"[\t -~]" as printable, but not "\n" nor "\r"
+  maps each regular file into memory, but reads pipes in chunks, writing long runs as they come
+  doesn't take "-a", "-d", "-f", nor the "-e" choices of "S", "b", "B", nor "L"
+
+unsurprising quirks:
+  prompts for stdin, like mac bash "grep -R .", unlike bash "strings"
+  accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
+  takes "-" as meaning "/dev/stdin", like linux "strings -"
 
 examples:
   cat bin/strings.py |bin/strings.py
+  strings.py -n 8 /bin/sh  # pick out the longer runs
+  strings.py -t x /bin/sh |head  # show the hex offsets of the runs
+  python3 -c 'import sys; sys.stdout.buffer.write("Hello".encode("utf-16le"))' |strings.py -el
 """
 
 
+import contextlib
+import mmap
+import os
+import re
+import stat
 import sys
 
 import argdoc
 
 
-def main():
-    args = argdoc.parse_args()
-    sys.stderr.write("{}\n".format(args))
-    sys.stderr.write("{}\n".format(argdoc.format_usage().rstrip()))
-    sys.stderr.write("strings.py: error: not implemented\n")
-    sys.exit(2)  # exit 2 from rejecting usage
+CHUNK_SIZE = 1024 * 1024  # read pipes about one MiB at a time
+
+OFFSET_FORMATS_BY_RADIX = dict(d="{:7d} ", o="{:7o} ", x="{:7x} ")
+
+PRINTABLE_CHARCLASS = rb"[\t\x20-\x7E]"
+
+
+def main(argv):
+
+    args = argdoc.parse_args(argv[1:])
+
+    # Compile the search
+
+    try:
+        min_length = 4 if (args.bytes is None) else int(args.bytes)
+    except ValueError:
+        min_length = 0
+    if min_length < 1:
+        stderr_print(
+            "strings.py: error: invalid minimum string length: {!r}".format(args.bytes)
+        )
+        sys.exit(2)  # exit 2 from rejecting usage
+
+    radix = args.radix
+    if (radix is not None) and (radix not in OFFSET_FORMATS_BY_RADIX.keys()):
+        stderr_print("strings.py: error: invalid radix: {!r}".format(radix))
+        sys.exit(2)  # exit 2 from rejecting usage
+
+    encoding = "s" if (args.encoding is None) else args.encoding
+    if encoding not in ("l", "s"):
+        stderr_print("strings.py: error: invalid encoding: {!r}".format(encoding))
+        sys.exit(2)  # exit 2 from rejecting usage
+
+    picker = StringsPicker(min_length, radix=radix, encoding=encoding)
+
+    # Pick over each file
+
+    paths = args.files if args.files else ["-"]
+
+    if "-" in paths:
+        prompt_tty_stdin()
+
+    exit_status = None
+    for path in paths:
+        readable = "/dev/stdin" if (path == "-") else path
+        try:
+            with open(readable, mode="rb", buffering=0) as incoming:
+                picker.pick_incoming(incoming)
+        except OSError as exc:
+            stderr_print("strings.py: error: {}: {}".format(type(exc).__name__, exc))
+            exit_status = 1
+
+    return exit_status
+
+
+class StringsPicker:
+    """Pick out the runs of printable chars, via one compiled regex"""
+
+    def __init__(self, min_length, radix, encoding):
+
+        self.min_length = min_length
+        self.unit = 2 if (encoding == "l") else 1
+
+        if encoding == "l":
+            unit_pattern = rb"(?:" + PRINTABLE_CHARCLASS + rb"\x00)"
+        else:
+            unit_pattern = PRINTABLE_CHARCLASS
+
+        self.regex = re.compile(unit_pattern + "{{{},}}".format(min_length).encode())
+        self.more_regex = re.compile(unit_pattern + b"*")
+        self.offset_format = OFFSET_FORMATS_BY_RADIX[radix] if radix else None
+
+    def pick_incoming(self, incoming):
+        """Pick over a regular file mapped into memory, else over chunks of a stream"""
+
+        fd = incoming.fileno()
+        st = os.fstat(fd)
+        if stat.S_ISREG(st.st_mode) and st.st_size:
+            with mmap.mmap(fd, length=0, access=mmap.ACCESS_READ) as mapped:
+                self.pick_data(mapped, base=0, stop=len(mapped), ended=True)
+        else:
+            self.pick_stream(fd)
+
+    def pick_stream(self, fd):
+        """Pick over chunks of a stream, carrying only a short tail across the chunks
+
+        Write out the start of a run as soon as it's long enough, then the rest as it comes
+        """
+
+        ofd = sys.stdout.fileno()
+
+        base = 0
+        data = b""
+        running = False
+        while True:
+            chunk = os.read(fd, CHUNK_SIZE)
+            data = data + chunk
+
+            # Write out more of a long run, till it ends
+
+            if running:
+                end = self.more_regex.match(data).end()
+                os_write_all(ofd, data[:end][:: self.unit])
+
+                base += end
+                data = data[end:]
+
+                if chunk and (len(data) < self.unit):
+                    continue  # the run may go on into the next chunk
+
+                os_write_all(ofd, b"\n")
+                running = False
+
+            if not chunk:
+                self.pick_data(data, base=base, stop=len(data), ended=True)
+                break
+
+            # Pick out the runs that surely end before the data ends
+
+            carry = max(0, len(data) - (self.unit * self.min_length) + 1)
+            carry = self.pick_data(data, base=base, stop=carry, ended=False)
+
+            # Write out the start of a long run now, rather than carry it
+
+            match = self.regex.match(data, carry)
+            if match and (match.end() + self.unit) > len(data):
+                head = match.group()[:: self.unit]
+                if self.offset_format:
+                    offset = self.offset_format.format(base + match.start())
+                    head = offset.encode() + head
+
+                os_write_all(ofd, head)
+                running = True
+
+                carry = match.end()
+
+            base += carry
+            data = data[carry:]
+
+    def pick_data(self, data, base, stop, ended):
+        """Write each run that begins before the stop, and ends before the data ends, or ended"""
+
+        ofd = sys.stdout.fileno()
+
+        lines = list()
+        index = stop
+        for match in self.regex.finditer(data):
+            if match.start() >= stop:
+                break
+            if (not ended) and ((match.end() + self.unit) > len(data)):
+                index = match.start()
+                break
+
+            index = max(stop, match.end())
+
+            run = match.group()
+            if self.unit > 1:
+                run = run[:: self.unit]
+
+            if self.offset_format:
+                offset = self.offset_format.format(base + match.start())
+                lines.append(offset.encode() + run + b"\n")
+            else:
+                lines.append(run + b"\n")
+
+            if len(lines) >= 1024:
+                os_write_all(ofd, b"".join(lines))
+                lines = list()
+
+        os_write_all(ofd, b"".join(lines))
+
+        return index
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def os_write_all(fd, data):
+    """Write all the bytes, even when the fd takes only some of them at a time"""
+
+    view = memoryview(data)
+    while view:
+        length = os.write(fd, view)
+        view = view[length:]
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
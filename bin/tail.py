@@ -19,6 +19,8 @@ options:
 quirks:
   takes a count led by "+" as how many leading lines to drop
   takes "-5" or "+9" and such, like mac "tail", unlike linux "tail -n"
+  reads a file backwards from its end, a block at a time, till finding enough lines
+  polls less often while the files followed go quiet, more often while they grow
 
 unsurprising quirks:
   prompts for stdin, like mac bash "grep -R .", unlike bash "tail"
@@ -30,25 +32,383 @@ examples:
   tail.py tail.py
   tail.py -5 tail.py
   tail.py -n 5 tail.py
+  tail.py +9 tail.py  # drop the first 9 lines
   python3 -c 'import this' |tail.py -n 3 |cat.py -n
+  tail.py -F /var/log/*.log  # follow the logs, even as they rotate
 """
 
 
+import contextlib
+import os
+import re
+import signal
+import stat
 import sys
+import time
 
 import argdoc
 
 
-def main():
-    args = argdoc.parse_args()
-    sys.stderr.write("{}\n".format(args))
-    sys.stderr.write("{}\n".format(argdoc.format_usage().rstrip()))
-    sys.stderr.write("tail.py: error: not implemented\n")
-    sys.exit(2)  # exit 2 from rejecting usage
+BLOCK_SIZE = 64 * 1024  # read 64 KiB at a time
+
+MIN_POLL_SECS = 0.010  # poll often while the followed files grow
+MAX_POLL_SECS = 1.000  # poll rarely while the followed files don't grow
+
+
+def main(argv):
+    """Run from the command line"""
+
+    tail_argv_tail = list(argv[1:])
+    for (index, arg) in enumerate(argv[1:]):
+        if re.match(r"^[-+][0-9]+$", string=arg):
+            if (index == 0) or (argv[1:][index - 1] not in ("-n", "--lines")):
+                tail_argv_tail[index] = "-n{}".format(arg)
+
+    args = argdoc.parse_args(tail_argv_tail)
+
+    following = args.follow or args.F
+    retrying = args.retry or args.F
+
+    # Choose to show trailing lines, or to drop leading lines
+
+    count = 10
+    dropping = False
+    if args.lines is not None:
+        try:
+            count = abs(int(args.lines))
+        except ValueError:
+            stderr_print(
+                "tail.py: error: invalid number of lines: {!r}".format(args.lines)
+            )
+            sys.exit(2)  # exit 2 from rejecting usage
+        dropping = args.lines.startswith("+")
+
+    # Tail each file
+
+    paths = args.files if args.files else ["-"]
+
+    if "-" in paths:
+        prompt_tty_stdin()
+
+    exit_status = None
+
+    followers = list()
+    for path in paths:
+        follower = TailFollower(path, titled=(len(paths) > 1))
+        try:
+            follower.open_()
+        except OSError as exc:
+            stderr_print("tail.py: error: {}: {}".format(type(exc).__name__, exc))
+            exit_status = 1
+            if retrying:
+                followers.append(follower)
+            continue
+
+        if dropping:
+            follower.drop_leading_lines(count)
+        else:
+            follower.show_trailing_lines(count)
+
+        followers.append(follower)
+
+    # Keep on showing the lines appended to each file, if following
+
+    if following:
+        try:
+            follow_till_interrupted(followers, retrying=retrying)
+        except KeyboardInterrupt:
+            sys.exit(0x80 + signal.SIGINT)  # "128+n if terminated by signal n"
+
+    return exit_status
+
+
+def follow_till_interrupted(followers, retrying):
+    """Show the bytes appended to each file, polling less often while none appear"""
+
+    followers = list(_ for _ in followers if _.fd is None or _.regular)
+    if not followers:
+        return
+
+    poll_secs = MIN_POLL_SECS
+    while True:
+        grown = False
+        for follower in followers:
+            if follower.poll(retrying=retrying):
+                grown = True
+
+        if grown:
+            poll_secs = MIN_POLL_SECS
+        else:
+            poll_secs = min(2 * poll_secs, MAX_POLL_SECS)
+
+        time.sleep(poll_secs)
+
+
+class TailFollower:
+    """Show the tail of one file, and then show what gets appended to it"""
+
+    titled_follower = None  # the follower most recently titled, of all the followers
+
+    def __init__(self, path, titled):
+
+        self.path = path
+        self.readable = "/dev/stdin" if (path == "-") else path
+        self.titled = titled
+
+        self.fd = None
+        self.regular = False
+        self.ino = None
+        self.offset = 0
+
+    def open_(self):
+        """Open the file, and remember the inode opened"""
+
+        fd = os.open(self.readable, os.O_RDONLY)
+        st = os.fstat(fd)
+
+        self.fd = fd
+        self.regular = stat.S_ISREG(st.st_mode)
+        self.ino = (st.st_dev, st.st_ino)
+        self.offset = os.lseek(fd, 0, os.SEEK_CUR) if self.regular else 0
+
+    def close(self):
+        """Close the file, if open"""
+
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def show_trailing_lines(self, count):
+        """Copy out the last lines of the file"""
+
+        if self.regular:
+            size = os.fstat(self.fd).st_size
+            start = self.offset
+            self.offset = rfind_lines_offset_in_fd(
+                self.fd, start, stop=size, count=count
+            )
+            self.copy_out_to(size)
+        else:
+            self.write_out(read_last_lines_of_stream(self.fd, count=count))
+
+    def drop_leading_lines(self, count):
+        """Drop the first lines of the file, and copy out the rest"""
+
+        dropped = 0
+        while dropped < count:
+            chunk = os.read(self.fd, BLOCK_SIZE)
+            if not chunk:
+                return
+            self.offset += len(chunk)
+
+            index = -1
+            while dropped < count:
+                index = chunk.find(b"\n", index + 1)
+                if index < 0:
+                    break
+                dropped += 1
+
+            if dropped == count:
+                self.write_out(chunk[(index + 1) :])
+
+        self.copy_out_to(None)
+
+    def copy_out_to(self, stop):
+        """Copy out the bytes from the offset up to a stop, else to the end"""
+
+        if self.regular:
+            os.lseek(self.fd, self.offset, os.SEEK_SET)
+
+        while (stop is None) or (self.offset < stop):
+            length = (
+                BLOCK_SIZE if (stop is None) else min(BLOCK_SIZE, stop - self.offset)
+            )
+            chunk = os.read(self.fd, length)
+            if not chunk:
+                break
+            self.offset += len(chunk)
+            self.write_out(chunk)
+
+    def write_out(self, chunk):
+        """Write the bytes to Stdout, titled by the path, if the title has changed"""
+
+        if not chunk:
+            return
+
+        if self.titled and (TailFollower.titled_follower is not self):
+            if TailFollower.titled_follower is not None:
+                sys.stdout.buffer.write(b"\n")
+            title = "==> {} <==\n".format(self.path)
+            sys.stdout.buffer.write(title.encode())
+            TailFollower.titled_follower = self
+
+        sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+
+    def poll(self, retrying):
+        """Copy out what was appended, and say if anything was"""
+
+        grown = False
+
+        if self.fd is not None:
+            st = os.fstat(self.fd)
+            if st.st_size < self.offset:
+                stderr_print("tail.py: {}: file truncated".format(self.path))
+                self.offset = 0
+            if st.st_size > self.offset:
+                self.copy_out_to(None)
+                grown = True
+
+        if retrying and (self.path != "-"):
+            grown = self.poll_for_rotation() or grown
+
+        return grown
+
+    def poll_for_rotation(self):
+        """Reopen the path, if a new file has replaced the file opened, and say if so"""
+
+        try:
+            st = os.stat(self.readable)
+        except OSError:
+            return False  # keep on following the old file till a new file appears
+
+        if (st.st_dev, st.st_ino) == self.ino:
+            return False
+
+        was_open = self.fd is not None
+        self.close()
+        try:
+            self.open_()
+        except OSError:
+            return False
+
+        if was_open:
+            stderr_print(
+                "tail.py: {!r} has been replaced; following new file".format(self.path)
+            )
+        else:
+            stderr_print(
+                "tail.py: {!r} has appeared; following new file".format(self.path)
+            )
+
+        self.copy_out_to(None)
+
+        return True
+
+
+def rfind_lines_offset_in_fd(fd, start, stop, count):
+    """Find where the last lines begin, reading blocks backwards from the stop"""
+
+    if not count:
+        return stop
+
+    found = 0
+    end = stop
+    while end > start:
+        begin = max(start, end - BLOCK_SIZE)
+        block = os.pread(fd, end - begin, begin)
+
+        index = len(block)
+        if end == stop:
+            if block.endswith(b"\n"):
+                index -= 1  # don't count the line-end of the last line
+
+        while True:
+            index = block.rfind(b"\n", 0, index)
+            if index < 0:
+                break
+            found += 1
+            if found == count:
+                return begin + index + 1
+
+        end = begin
+
+    return start
+
+
+def read_last_lines_of_stream(fd, count):
+    """Read to the end of a stream, but hold only the last lines read"""
+
+    held = bytearray()
+    while True:
+        chunk = os.read(fd, BLOCK_SIZE)
+        if not chunk:
+            break
+        held.extend(chunk)
+
+        if len(held) >= 4 * BLOCK_SIZE:
+            index = rfind_lines_index(held, count=count)
+            del held[:index]
+
+    index = rfind_lines_index(held, count=count)
+
+    return bytes(held[index:])
+
+
+def rfind_lines_index(data, count):
+    """Find where the last lines begin in some bytes, else return zero"""
+
+    if not count:
+        return len(data)
+
+    index = len(data)
+    if data.endswith(b"\n"):
+        index -= 1  # don't count the line-end of the last line
+
+    for _ in range(count):
+        index = data.rfind(b"\n", 0, index)
+        if index < 0:
+            return 0
+
+    return index + 1
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 """
-usage: tar.py [-h] [-t] [-x] [-v] [-k] [-f FILE]
+usage: tar.py [-h] [-t] [-x] [-v] [-k] [-f FILE] [-C DIR] [-j N]
 
 walk the files and dirs found inside a top dir compressed as Tgz
 
@@ -12,14 +12,19 @@ options:
   -v          trace each file or dir name found inside to Stderr
   -k          decline to replace pre-existing output files
   -f FILE     name the file to uncompress
+  -C DIR      write each file into this dir, not to stdout
+  -j N        write files across this many threads, when the file isn't compressed
 
 quirks:
-  accepts only -tvf and -tvkf as options
+  accepts only -tvf and -tvkf as options, with or without -C DIR and -j N
   lets you type out just "tvf" or "tvkf" without their leading "-" dash
   prints only the name for -tvf, not all the "ls -al" columns
   prints all the dirs for -tvf, not only the top dir
   prints names found inside to stderr, not to classic stdout
-  extracts always to stdout, never to the name found inside
+  extracts to stdout, unless given -C DIR
+  walks the file once, in order, and copies out a chunk at a time, never a whole file
+  writes only the dirs and regular files into -C DIR, and only inside of it
+  takes "-j N" to mean threads, unlike linux "tar -j" meaning bzip2
 
 unsurprising quirks:
   prompts for stdin, like linux "tar tvf -", unlike mac "tar tvf -"
@@ -37,17 +42,24 @@ examples:
   tar.py tvf dir.tgz
   tar.py xvkf dir.tgz |wc  # 2 lines, 2 words, 14 bytes
   tar.py -tvf /dev/null/child -tvf dir.tgz  # first args discarded, last args obeyed
+  tar.py xvkf dir.tgz -C ~/Desktop/  # write the files into a dir
+  gunzip -c dir.tgz >dir.tar && tar.py xvkf dir.tar -C ~/Desktop/ -j 8  # across 8 threads
 """
 
 
+import concurrent.futures
 import os
+import shutil
+import stat
 import sys
 import tarfile  # depends on import gzip
 
 import argdoc
 
 
-LIMITED_USAGE = "usage: tar.py [-h] (-tvf|-xvkf) FILE"
+CHUNK_SIZE = 1024 * 1024  # copy out about one MiB at a time
+
+LIMITED_USAGE = "usage: tar.py [-h] (-tvf|-xvkf) FILE [-C DIR] [-j N]"
 
 
 def main(argv):
@@ -69,6 +81,17 @@ def main(argv):
         stderr_print_usage_error(args)
         sys.exit(2)  # exit 2 from rejecting usage
 
+    threads = 1
+    if args.j is not None:
+        try:
+            threads = int(args.j)
+        except ValueError:
+            threads = 0
+        if (threads < 1) or (args.C is None):
+            stderr_print(LIMITED_USAGE)
+            stderr_print("tar.py: error: choose -j 1 or more, and -C DIR")
+            sys.exit(2)  # exit 2 from rejecting usage
+
     # Interpret -tvf or -xvkf
 
     args_f = args.f
@@ -77,11 +100,15 @@ def main(argv):
         prompt_tty_stdin()
 
     try:
-        tar_file_tvf_xvkf(args_f, args_x=args.x)
+        exit_status = tar_file_tvf_xvkf(
+            args_f, args_x=args.x, args_C=args.C, threads=threads
+        )
     except Exception:
         sys.stderr.write("tar.py: error: args={}\n".format(args))
         raise
 
+    return exit_status
+
 
 def stderr_print_usage_error(args):
     """Limit to usage: [-h] (-tvf|xvkf) FILE"""
@@ -105,33 +132,169 @@ def stderr_print_usage_error(args):
         stderr_print("tar.py: error: unrecognized arguments: {}".format(str_args))
 
 
-def tar_file_tvf_xvkf(args_f, args_x):
+def tar_file_tvf_xvkf(args_f, args_x, args_C, threads):
     """Walk the files and dirs found inside a top dir compressed as Tgz"""
 
-    # Walk to each file or dir found inside
+    # Walk the file in place, if uncompressed and seekable, else stream it
+
+    seekable = stat.S_ISREG(os.stat(args_f).st_mode)
+    if args_x and (args_C is not None) and (threads > 1) and seekable:
+        try:
+            untarring = tarfile.open(args_f, mode="r:")
+        except tarfile.ReadError:
+            untarring = tarfile.open(args_f, mode="r|*")
+            threads = 1
+    else:
+        untarring = tarfile.open(args_f, mode="r|*")
+        threads = 1
+
+    # Walk to each file or dir found inside, just once, in order
 
-    with tarfile.open(args_f) as untarring:  # tarfile.TarFile
+    exit_status = None
+    with untarring:  # tarfile.TarFile
+        with concurrent.futures.ThreadPoolExecutor(threads) as executor:
 
-        names = untarring.getnames()
-        for name in names:
-            member = untarring.getmember(name)
+            futures = list()
+            for member in untarring:
+                name = member.name
 
-            # Trace the walk
+                # Trace the walk
 
-            if member.isdir():
-                print(name + os.sep, file=sys.stderr)
-            else:
-                print(name, file=sys.stderr)
+                if member.isdir():
+                    print(name + os.sep, file=sys.stderr)
+                else:
+                    print(name, file=sys.stderr)
 
                 # Option to extract the bytes of the files
 
-                if args_x:
+                if not args_x:
+                    continue
+
+                try:
+                    if args_C is None:
+                        if member.isfile():
+                            copy_member_out(untarring, member=member)
+                    elif threads == 1:
+                        write_member_into(untarring, member=member, top=args_C)
+                    else:
+                        future = submit_member_into(
+                            executor, untarring, member=member, top=args_C
+                        )
+                        if future:
+                            futures.append(future)
+                except (OSError, ValueError) as exc:
+                    stderr_print(
+                        "tar.py: error: {}: {}".format(type(exc).__name__, exc)
+                    )
+                    exit_status = 1
+
+                # Hold only a few writes in flight at a time
+
+                while len(futures) > (2 * threads):
+                    exit_status = future_exit_status(futures.pop(0)) or exit_status
+
+            for future in futures:
+                exit_status = future_exit_status(future) or exit_status
+
+    return exit_status
+
+
+def copy_member_out(untarring, member):
+    """Copy out the bytes of a file found inside, to Stdout, a chunk at a time"""
+
+    ofile = sys.stdout.buffer
+    with untarring.extractfile(member) as incoming:
+        shutil.copyfileobj(incoming, ofile, CHUNK_SIZE)
+    ofile.flush()
+
+
+def write_member_into(untarring, member, top):
+    """Write a dir or file found inside, into a top dir, a chunk at a time"""
+
+    opath = find_member_opath(member, top=top)
+    if opath is None:
+        return
+
+    with open(opath, mode="xb") as ofile:
+        with untarring.extractfile(member) as incoming:
+            shutil.copyfileobj(incoming, ofile, CHUNK_SIZE)
+
+    copy_member_stat(member, opath=opath)
+
+
+def submit_member_into(executor, untarring, member, top):
+    """Start writing a file found inside, into a top dir, from another thread"""
+
+    opath = find_member_opath(member, top=top)
+    if opath is None:
+        return None
 
-                    # Python 2:  with contextlib.closing(untarring.extractfile(name)) as incoming:
-                    with untarring.extractfile(name) as incoming:
-                        file_bytes = incoming.read()
+    if member.issparse():
+        write_member_into(untarring, member=member, top=top)
+        return None
+
+    fd = untarring.fileobj.fileno()
+    future = executor.submit(pwrite_member, fd, member=member, opath=opath)
+
+    return future
+
+
+def pwrite_member(fd, member, opath):
+    """Copy the bytes of a file found inside, by reading from their place in the file"""
+
+    with open(opath, mode="xb") as ofile:
+        offset = member.offset_data
+        remaining = member.size
+        while remaining:
+            chunk = os.pread(fd, min(CHUNK_SIZE, remaining), offset)
+            if not chunk:
+                raise ValueError("{}: unexpected end of file".format(member.name))
+            ofile.write(chunk)
+            offset += len(chunk)
+            remaining -= len(chunk)
+
+    copy_member_stat(member, opath=opath)
+
+
+def find_member_opath(member, top):
+    """Make the dirs to write a file found inside, or return None to write no file"""
+
+    relpath = os.path.normpath(member.name)
+    if os.path.isabs(relpath) or (relpath.split(os.sep)[0] == os.pardir):
+        raise ValueError("{}: not inside the top dir".format(member.name))
+
+    opath = os.path.join(top, relpath)
+
+    if member.isdir():
+        os.makedirs(opath, exist_ok=True)
+        return None
+
+    if not member.isfile():
+        stderr_print("tar.py: warning: {}: not a dir nor a file".format(member.name))
+        return None
+
+    os.makedirs(os.path.dirname(opath) or os.curdir, exist_ok=True)
+
+    return opath
+
+
+def copy_member_stat(member, opath):
+    """Give a file written the permissions and modified date of the file found inside"""
+
+    os.chmod(opath, stat.S_IMODE(member.mode))
+    os.utime(opath, times=(member.mtime, member.mtime))
+
+
+def future_exit_status(future):
+    """Wait for a write to finish, and return 1 if it failed, else None"""
+
+    try:
+        future.result()
+    except (OSError, ValueError) as exc:
+        stderr_print("tar.py: error: {}: {}".format(type(exc).__name__, exc))
+        return 1
 
-                    os.write(sys.stdout.fileno(), file_bytes)
+    return None
 
 
 #
@@ -155,7 +318,7 @@ def stderr_print(*args):
 
 
 if __name__ == "__main__":
-    main(sys.argv)
+    sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
@@ -1,72 +1,353 @@
 #!/usr/bin/env python3
 
 r"""
-usage: tr.py [-h] [-d] [--sort] [--unique-everseen] [CHARSET]
+usage: tr.py [-h] [-c] [-d] [-s] [--sort] [--unique-everseen] [SET1] [SET2]
 
-count lines and words and characters and bytes
+translate chars, or delete them, or squeeze repeats of them
 
 positional arguments:
-  CHARSET            set of characters
+  SET1                  the chars to find, such as "a-z" or "[:upper:]"
+  SET2                  the chars to replace them with, or to squeeze after -d
 
 options:
-  -h, --help         show this help message and exit
-  -d, --delete       delete the characters
-  --sort             sort the characters
-  --unique-everseen  delete all duplicates of any char
+  -h, --help            show this help message and exit
+  -c, --complement      find the chars not in SET1, in place of the chars in SET1
+  -d, --delete          delete the chars of SET1
+  -s, --squeeze-repeats
+                        squeeze each run of a char of the last set given, down to one char
+  --sort                sort the chars
+  --unique-everseen     delete all duplicates of any char
 
 quirks:
-  chokes except when called for -d '[^ -~]\t\r\n'
+  translates bytes when the sets are us-ascii, else translates utf-8 chars
+  reads the input a chunk at a time, and translates each chunk with one compiled table
   runs as "--unique-everseen --sort" when called with no args, unlike Mac and Linux "tr" choking
+  takes "[:class:]" as only the us-ascii chars of the class
+  doesn't take "[c*n]" repeats, nor "-t" truncation
+
+unsurprising quirks:
+  prompts for stdin, like mac bash "grep -R .", unlike bash "tr"
+  accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
+  takes "a-z" as a range, "\n" and "\t" and "\033" and such as escapes, and "[=c=]" as "c"
+  fills out a short SET2 by repeating its last char, like linux "tr", like mac "tr"
 
 examples:
+  echo Hello |tr.py a-z A-Z  # HELLO
+  echo Hello |tr.py -d l  # Heo
+  echo Hello |tr.py -s l  # Helo
+  echo 'a  b   c' |tr.py -s ' ' '\n'  # one word per line
   cat $(git ls-files) |tr.py --unique-everseen -d '[ -~]\t\r\n' && echo
   cat $(git ls-files) |tr.py --unique-everseen --sort -d 'åéîøü←↑→↓⇧⌃⌘⌥💔💥😊😠😢' && echo
   cat $(git ls-files) |tr.py; echo
 """
-# FIXME: get argdoc to require --delete, while usage is limited
-# FIXME: add -s, --squeeze-repeats
-# FIXME: add --c, -C, --complement
 # FIXME: add -t, --truncate-set1
-# FIXME: add the interpretation of charset's, or mix it with Python regex
 # FIXME: count open and close "{[( )]}"
 
 
+import codecs
+import collections
+import contextlib
+import os
+import re
+import string
 import sys
 
 import argdoc
 
 
+CHUNK_SIZE = 1024 * 1024  # read about one MiB at a time
+
+ESCAPES_BY_CHAR = dict(a="\a", b="\b", f="\f", n="\n", r="\r", t="\t", v="\v")
+
+CHARS_BY_CLASS = dict(
+    alnum=(string.ascii_letters + string.digits),
+    alpha=string.ascii_letters,
+    blank=" \t",
+    cntrl="".join(chr(_) for _ in list(range(0x20)) + [0x7F]),
+    digit=string.digits,
+    graph="".join(chr(_) for _ in range(0x21, 0x7F)),
+    lower=string.ascii_lowercase,
+    print="".join(chr(_) for _ in range(0x20, 0x7F)),
+    punct=string.punctuation,
+    space=string.whitespace,
+    upper=string.ascii_uppercase,
+    xdigit=string.hexdigits,
+)
+
+
 def main(argv):
 
-    tr_argv_tail = argv[1:] if argv[1:] else ["--unique-everseen", "--sort", ""]
+    tr_argv_tail = argv[1:] if argv[1:] else ["--unique-everseen", "--sort"]
     args = argdoc.parse_args(tr_argv_tail)
 
-    args_charset = args.charset if args.charset else ""
+    # Parse the sets
 
-    charset = None
-    if args_charset == r"[ -~]\t\r\n":
-        codes = list(range(ord(" "), (ord("~") + 1)))
-        codes.extend([ord("\t"), ord("\r"), ord("\n")])
-        charset = "".join(chr(_) for _ in codes)
-    elif not any(_ in args_charset for _ in r"\[]"):
-        charset = args_charset
+    try:
+        set1 = parse_tr_set(args.set1) if (args.set1 is not None) else None
+        set2 = parse_tr_set(args.set2) if (args.set2 is not None) else None
+    except ValueError as exc:
+        stderr_print("tr.py: error: {}".format(exc))
+        sys.exit(2)  # exit 2 from rejecting usage
+
+    translating = (set2 is not None) and not args.delete
+    if translating and not set2:
+        stderr_print("tr.py: error: SET2 must be non-empty, when translating")
+        sys.exit(2)  # exit 2 from rejecting usage
 
-    if charset is None:
-        stderr_print("usage: tr.py [-h] [-d] [--sort] [--unique-everseen] [CHARSET]")
-        stderr_print("tr.py: error: not much usage implemented")  # FIXME: shlex.join
+    usage_error = None
+    if (args.delete or args.squeeze_repeats or translating) and (set1 is None):
+        usage_error = "missing SET1"
+    elif args.delete and (set2 is not None) and not args.squeeze_repeats:
+        usage_error = "extra SET2, when deleting without squeezing"
+    elif (set1 is not None) and not (args.delete or args.squeeze_repeats):
+        if set2 is None:
+            usage_error = "missing SET2, when translating"
+
+    if usage_error:
+        stderr_print(argdoc.format_usage().rstrip())
+        stderr_print("tr.py: error: {}".format(usage_error))
         sys.exit(2)  # exit 2 from rejecting usage
 
-    stdins = sys.stdin.read()  # FIXME: "utf-8", errors="surrogateescape"
-    takes = stdins
-    if args.delete:
-        takes = list(_ for _ in stdins if _ not in charset)
-    uniques = str_unique_everseen(takes)
+    # Compile the sets into one translator, and translate each chunk of Stdin
+
+    translator = CharsTranslator(
+        charwise=(args.sort or args.unique_everseen),
+        set1=(set1 if set1 else list()),
+        set2=(set2 if set2 else list()),
+        complementing=args.complement,
+        deleting=args.delete,
+        squeezing=args.squeeze_repeats,
+    )
+
+    prompt_tty_stdin()
+
+    counter = collections.Counter() if args.sort else None
+    everseen = CharsEverseen() if args.unique_everseen else None
+
+    with open("/dev/stdin", mode="rb", buffering=0) as incoming:
+        for chunk in translator.iter_translated(incoming):
+
+            if everseen:
+                chunk = everseen.pick_unseen(chunk)
+
+            if counter is not None:
+                counter.update(chunk)
+            else:
+                translator.write(chunk)
+
+    # Sort the chars, at the end of input
+
+    if counter is not None:
+        joiner = b"" if translator.bytewise else ""
+        if translator.bytewise:
+            chars = list(bytes([_]) * counter[_] for _ in sorted(counter.keys()))
+        else:
+            chars = list(_ * counter[_] for _ in sorted(counter.keys()))
+        translator.write(joiner.join(chars))
+
+
+def parse_tr_set(chars):
+    """Spell out the ranges, classes, and escapes of a SET1 or SET2, char by char"""
+
+    spelled = list()
+
+    index = 0
+    while index < len(chars):
+
+        # Take a [:class:] or a [=c=]
+
+        match = re.match(r"\[:([a-z]+):\]", chars[index:])
+        if match:
+            name = match.group(1)
+            if name not in CHARS_BY_CLASS.keys():
+                raise ValueError("invalid character class: {!r}".format(name))
+            spelled.extend(CHARS_BY_CLASS[name])
+            index += len(match.group())
+            continue
+
+        match = re.match(r"\[=(.)=\]", chars[index:])
+        if match:
+            spelled.append(match.group(1))
+            index += len(match.group())
+            continue
+
+        # Take one char, or one escape
+
+        (ch, index) = take_tr_char(chars, index=index)
+
+        # Take a range of chars
+
+        if (chars[index : (index + 1)] == "-") and (index + 1 < len(chars)):
+            (last, index) = take_tr_char(chars, index=(index + 1))
+            if ord(last) < ord(ch):
+                raise ValueError(
+                    "range-endpoints of {!r} out of order".format(ch + last)
+                )
+            spelled.extend(chr(_) for _ in range(ord(ch), ord(last) + 1))
+            continue
+
+        spelled.append(ch)
+
+    return spelled
+
+
+def take_tr_char(chars, index):
+    """Take one char, or one escape, and return it with the index past it"""
+
+    ch = chars[index]
+    if (ch != "\\") or (index + 1 >= len(chars)):
+        return (ch, index + 1)
+
+    match = re.match(r"[0-7]{1,3}", chars[(index + 1) :])
+    if match:
+        return (chr(int(match.group(), 8)), index + 1 + len(match.group()))
+
+    escaped = chars[index + 1]
+    ch = ESCAPES_BY_CHAR.get(escaped, escaped)
+
+    return (ch, index + 2)
+
+
+class CharsTranslator:
+    """Translate, delete, and squeeze chars, a chunk at a time, via one compiled table"""
+
+    def __init__(self, charwise, set1, set2, complementing, deleting, squeezing):
+
+        bytewise = all((ord(_) < 0x80) for _ in (set1 + set2))
+        self.bytewise = bytewise and not charwise
+        self.squeeze_regex = None
+        self.last_char = None
+
+        if self.bytewise:
+            self._compile_bytes(set1, set2, complementing, deleting, squeezing)
+        else:
+            self._compile_str(set1, set2, complementing, deleting, squeezing)
 
-    stdouts = uniques
-    if args.sort:  # sorted(str_unique_everseen.charset) could be faster
-        stdouts = "".join(sorted(uniques))
+        self.ofd = sys.stdout.fileno()
+        self.encoder = codecs.getincrementalencoder("utf-8")(errors="surrogateescape")
 
-    sys.stdout.write("".join(stdouts))
+    def _compile_bytes(self, set1, set2, complementing, deleting, squeezing):
+        """Compile one table of 256 bytes, plus the bytes to delete"""
+
+        finds = bytes(ord(_) for _ in set1)
+        if complementing:
+            finds = bytes(_ for _ in range(0x100) if _ not in finds)
+
+        replaces = bytes(ord(_) for _ in set2)
+
+        table = bytearray(range(0x100))
+        if replaces and not deleting:
+            replaces = replaces.ljust(len(finds), replaces[-1:])
+            for (find, replace) in zip(finds, replaces):
+                table[find] = replace
+
+        self.table = bytes(table)
+        self.deletes = finds if deleting else b""
+
+        if squeezing:
+            squeezes = replaces if (deleting or replaces) else finds
+            if squeezes:
+                charclass = b"[" + re.escape(bytes(sorted(set(squeezes)))) + b"]"
+                self.squeeze_regex = re.compile(b"(" + charclass + rb")\1+")
+
+    def _compile_str(self, set1, set2, complementing, deleting, squeezing):
+        """Compile one table of chars, else one regex of the chars not found"""
+
+        finds = "".join(set1)
+        replaces = "".join(set2)
+
+        if replaces and not deleting:
+            replaces = replaces.ljust(len(finds), replaces[-1:])
+
+        self.table = dict()
+        self.complement_regex = None
+        self.complement_replace = None
+
+        if complementing:
+            charclass = "[^" + re.escape("".join(sorted(set(finds)))) + "]"
+            self.complement_regex = re.compile(charclass)
+            self.complement_replace = "" if deleting else replaces[-1:]
+        elif deleting:
+            self.table = dict((ord(_), None) for _ in finds)
+        elif replaces:
+            for (find, replace) in zip(finds, replaces):
+                self.table[ord(find)] = replace
+
+        if squeezing:
+            squeezes = replaces if (deleting or replaces) else finds
+            negation = "^" if (complementing and (squeezes == finds)) else ""
+            if squeezes or negation:
+                chars = re.escape("".join(sorted(set(squeezes))))
+                charclass = "[" + negation + chars + "]"
+                self.squeeze_regex = re.compile("(" + charclass + r")\1+")
+
+    def iter_translated(self, incoming):
+        """Yield each chunk of input, translated"""
+
+        decoder = None
+        if not self.bytewise:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="surrogateescape")
+
+        while True:
+            chunk = incoming.read(CHUNK_SIZE)
+            if decoder:
+                chunk = decoder.decode(chunk, final=(not chunk))
+            if chunk:
+                yield self.translate(chunk)
+            if not chunk:
+                break
+
+    def translate(self, chunk):
+        """Translate one chunk"""
+
+        if self.bytewise:
+            chunk = chunk.translate(self.table, self.deletes)
+        elif self.complement_regex:
+            chunk = self.complement_regex.sub(self.complement_replace, chunk)
+        elif self.table:
+            chunk = chunk.translate(self.table)
+
+        # Squeeze the runs, even the runs that began in the last chunk
+
+        if self.squeeze_regex and chunk:
+            repl = rb"\1" if self.bytewise else r"\1"
+            chunk = self.squeeze_regex.sub(repl, chunk)
+
+            last_char = self.last_char
+            if last_char and self.squeeze_regex.match(last_char + chunk[:1]):
+                chunk = chunk.lstrip(last_char)
+            if chunk:
+                self.last_char = chunk[-1:]
+
+        return chunk
+
+    def write(self, chunk):
+        """Write one translated chunk"""
+
+        data = chunk if self.bytewise else self.encoder.encode(chunk)
+        os_write_all(self.ofd, data)
+
+
+class CharsEverseen:
+    """Pick out the first of each char, via a set plus a list join"""
+
+    def __init__(self):
+        self.everseen = set()
+
+    def pick_unseen(self, chunk):
+        """Pick out the chars not seen before, in order of first seen"""
+
+        unseen = set(chunk) - self.everseen
+        if not unseen:
+            return chunk[:0]
+
+        self.everseen |= unseen
+
+        firsts = sorted(unseen, key=chunk.index)
+        if isinstance(chunk, bytes):
+            return bytes(firsts)
+
+        return "".join(firsts)
 
 
 #
@@ -75,18 +356,19 @@ def main(argv):
 
 
 # deffed in many files  # missing from docs.python.org
-def str_unique_everseen(chars):
-    """Delete all duplicates of any char"""
+def os_write_all(fd, data):
+    """Write all the bytes, even when the fd takes only some of them at a time"""
 
-    charset = set()
-    uniques = ""
+    view = memoryview(data)
+    while view:
+        length = os.write(fd, view)
+        view = view[length:]
 
-    for char in chars:
-        if char not in charset:
-            charset.add(char)
-            uniques += char
 
-    return uniques
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
 
 
 # deffed in many files  # missing from docs.python.org
@@ -98,8 +380,32 @@ def stderr_print(*args):
     sys.stderr.flush()  # like for kwargs["end"] != "\n"
 
 
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
+
+
 if __name__ == "__main__":
-    main(sys.argv)
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
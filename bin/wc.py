@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-"""
+r"""
 usage: wc.py [-h] [-l] [-w] [-m] [-c] [-L] [FILE ...]
 
 count lines and words and characters and bytes
@@ -11,7 +11,7 @@ positional arguments:
 options:
   -h, --help            show this help message and exit
   -l, --lines           count lines
-  -w, --words           count lines
+  -w, --words           count words
   -m, --chars           count characters
   -c, --bytes           count bytes
   -L, --max-line-length
@@ -19,6 +19,9 @@ options:
 
 quirks:
   acts like 'wc -l' if called without args, unlike Bash 'wc' and 'wc -lwc'
+  counts each utf-8 lead byte as a character, counts each byte of an encoding error too
+  counts each \t tab as one character of -L, unlike Linux 'wc -L'
+  counts two or more files in parallel, in as many processes as cores
 
 unsurprising quirks:
   prompts Tty Stdin, like Mac 'grep -R .', unlike Bash 'wc'
@@ -27,25 +30,240 @@ unsurprising quirks:
   takes '--help' as an option, like Linux 'wc --help', unlike Mac 'wc --help'
 
 examples:
-  Oh no! No examples disclosed!! 💥 💔 💥
+  wc.py wc.py  # count the lines of this file
+  wc.py -lwmcL wc.py  # count everything
+  echo 'åéîøü' |wc.py -mc  # count 6 chars in 11 bytes
+  cat *.log |wc.py  # count the lines of all the logs, as a total
+  wc.py *.log  # count the lines of each log, in parallel, and count the total
 """
 
+# FIXME: count -L as the Linux 'wc -L' does, with each \t tab moving out to a tab stop
+
 
+import concurrent.futures
+import contextlib
+import os
 import sys
 
 import argdoc
 
 
-def main():
-    args = argdoc.parse_args()
-    sys.stderr.write("{}\n".format(args))
-    sys.stderr.write("{}\n".format(argdoc.format_usage().rstrip()))
-    sys.stderr.write("wc.py: error: not implemented\n")
-    sys.exit(2)  # exit 2 from rejecting usage
+CHUNK_SIZE = 1024 * 1024  # read about one MiB at a time
+
+UTF_8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))  # b"\x80" .. b"\xBF"
+
+
+def main(argv):
+
+    args = argdoc.parse_args(argv[1:])
+
+    if not (
+        args.lines or args.words or args.chars or args.bytes or args.max_line_length
+    ):
+        args.lines = True
+
+    paths = args.files if args.files else ["-"]
+
+    # Count each file, in parallel if more than one
+
+    if "-" in paths:
+        prompt_tty_stdin()
+
+    counters = list()
+    if len(paths) == 1:
+        counters.append(wc_path_in_parallel(paths[0]))
+    else:
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            counters.extend(executor.map(wc_path_in_parallel, paths))
+
+    # Print the counts of each file, and print the total if more than one
+
+    exit_status = None
+
+    rows = list()
+    for (path, counter) in zip(paths, counters):
+        if isinstance(counter, str):
+            stderr_print(counter)
+            exit_status = 1
+        else:
+            rows.append(counter.format_cells(args, path=path if args.files else None))
+
+    if len(paths) > 1:
+        total = WordCounter()
+        for counter in counters:
+            if not isinstance(counter, str):
+                total.add(counter)
+        rows.append(total.format_cells(args, path="total"))
+
+    print_right_justified_rows(rows)
+
+    return exit_status
+
+
+def wc_path_in_parallel(path):
+    """Count one file, and return the counter, else an error message"""
+
+    readable = "/dev/stdin" if (path == "-") else path
+    try:
+        with open(readable, mode="rb", buffering=0) as incoming:
+            counter = WordCounter()
+            counter.count_incoming(incoming)
+    except OSError as exc:
+        error = "wc.py: error: {}: {}".format(type(exc).__name__, exc)
+        return error
+
+    return counter
+
+
+def print_right_justified_rows(rows):
+    """Print each count justified right in a column of the width of the widest count"""
+
+    widths = list(len(_) for row in rows for _ in row[:-1])
+    width = max(widths, default=0)
+
+    for row in rows:
+        cells = list(_.rjust(width) for _ in row[:-1])
+        if row[-1] is not None:
+            cells.append(row[-1])
+        print(" ".join(cells))
+
+
+class WordCounter:
+    """Count lines and words and characters and bytes, a chunk at a time"""
+
+    def __init__(self):
+
+        self.lines = 0
+        self.words = 0
+        self.chars = 0
+        self.bytes = 0
+        self.max_line_length = 0
+
+        self.line_length = 0  # chars seen since the last b"\n"
+        self.in_word = False  # true when the last chunk ended inside a word
+
+    def add(self, counter):
+        """Add the counts of another counter to these counts"""
+
+        self.lines += counter.lines
+        self.words += counter.words
+        self.chars += counter.chars
+        self.bytes += counter.bytes
+        self.max_line_length = max(self.max_line_length, counter.max_line_length)
+
+    def count_incoming(self, incoming):
+        """Count each chunk of a file, in the order read"""
+
+        buffer = bytearray(CHUNK_SIZE)
+        while True:
+            length = incoming.readinto(buffer)
+            if not length:
+                break
+
+            chunk = buffer if (length == len(buffer)) else buffer[:length]
+            self.count_chunk(chunk)
+
+        self.max_line_length = max(self.max_line_length, self.line_length)
+
+    def count_chunk(self, chunk):
+        """Count one chunk, carrying a word or a line across to the next chunk"""
+
+        self.bytes += len(chunk)
+        self.lines += chunk.count(b"\n")
+
+        # Count words, but count once a word split across chunks
+
+        splits = chunk.split()
+        self.words += len(splits)
+        if splits and self.in_word and not chunk[:1].isspace():
+            self.words -= 1
+
+        self.in_word = not chunk[-1:].isspace()
+
+        # Count characters as utf-8 lead bytes, without decoding the bytes
+
+        leads = chunk.translate(None, UTF_8_CONTINUATION_BYTES)
+        self.chars += len(leads)
+
+        # Count the characters per line, if the chunk ends any line
+
+        lines = leads.split(b"\n")
+        if len(lines) == 1:
+            self.line_length += len(leads)
+        else:
+            first_length = self.line_length + len(lines[0])
+            middle_length = max((len(_) for _ in lines[1:-1]), default=0)
+            self.max_line_length = max(
+                self.max_line_length, first_length, middle_length
+            )
+            self.line_length = len(lines[-1])
+
+    def format_cells(self, args, path):
+        """Format the chosen counts, in the Linux order, and then the path"""
+
+        cells = list()
+        if args.lines:
+            cells.append(str(self.lines))
+        if args.words:
+            cells.append(str(self.words))
+        if args.chars:
+            cells.append(str(self.chars))
+        if args.bytes:
+            cells.append(str(self.bytes))
+        if args.max_line_length:
+            cells.append(str(self.max_line_length))
+
+        cells.append(path)
+
+        return cells
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
+
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
+
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
+
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
@@ -1,49 +1,363 @@
 #!/usr/bin/env python3
 
 r"""
-usage: xargs.py [-h] [-n MAX_ARGS]
+usage: xargs.py [-h] [-n MAX_ARGS] [-s MAX_CHARS] [-P MAX_PROCS] [-0] [-I REPLSTR] [-k] [-r] [-t] [WORD ...]
 
-split and rejoin the words of all lines of input into one line of output
+split the words of all lines of input, and run a command with some of them, again and again
+
+positional arguments:
+  WORD                  word of command (default: echo)
 
 options:
   -h, --help            show this help message and exit
   -n MAX_ARGS, --max-args MAX_ARGS
-                        words per line
+                        words per command (default: as many as fit)
+  -s MAX_CHARS, --max-chars MAX_CHARS
+                        bytes per command, counting one more per word (default: ARG_MAX)
+  -P MAX_PROCS, --max-procs MAX_PROCS
+                        run this many commands at a time (default: 1)
+  -0, --null            split input at each 0 byte, not at whitespace
+  -I REPLSTR            run once per line of input, in place of this word inside the command
+  -k, --keep-order      write the output of each command in order, when run with -P
+  -r, --no-run-if-empty
+                        run no command when the input has no words (always true here)
+  -t, --verbose         trace each command to stderr, before running it
+
+quirks:
+  reads the input a chunk at a time, and runs commands before the input ends
+  splits input at whitespace, but doesn't take quotes nor backslashes, unlike classic "xargs"
+  runs no command when the input has no words, like mac "xargs", unlike linux "xargs"
+  writes the output of each command as it comes, unless told to -k keep order
+  exits 123 when a command fails, 124 when one exits 255, and 125 when one dies by signal
+  gives each command "/dev/null" as its stdin
+  joins the words of lines into one line of output, when given no command
+
+unsurprising quirks:
+  prompts for stdin, like mac bash "grep -R .", unlike bash "xargs"
+  accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
+  takes the first word that isn't an option as the start of the command
 
 examples:
   echo 'a  b  c$  d  e$$f  g$' |tr '$' '\n' |xargs.py  # join words of lines into one line
   echo a b c d e f g |xargs.py -n 1  # split words of lines into one word per line
   expand.py |xargs.py -n 1  # convert &nbsp; to spaces, etc, before trying to split it
+  find.py . -name '*.log' -print0 |xargs.py -0 -P 8 gzip -9  # compress 8 files at a time
+  cat urls.txt |xargs.py -P 16 -k -I {} curl -s {}  # fetch 16 at a time, show in order
 """
 
 
+import concurrent.futures
+import contextlib
+import os
+import signal
+import subprocess
 import sys
 
 import argdoc
 
 
-def main():
+CHUNK_SIZE = 64 * 1024  # read about 64 KiB at a time
+
+ARG_MAX_HEADROOM = 2048  # leave this many bytes free below the ARG_MAX limit
+ARG_MAX_CEILING = 128 * 1024  # cut lines no longer than this, by default
+
+XARGS_VALUED_OPTIONS = ("-n", "--max-args", "-s", "--max-chars", "-P", "--max-procs")
+XARGS_VALUED_OPTIONS += ("-I",)
+
+
+def main(argv):
     """Run from the command line"""
 
-    args = argdoc.parse_args()
+    # Take the first word that isn't an option as the start of the command
+
+    xargs_argv_tail = list(argv[1:])
+
+    index = 0
+    while index < len(xargs_argv_tail):
+        arg = xargs_argv_tail[index]
+        if arg == "--":
+            break
+        if (arg == "-") or not arg.startswith("-"):
+            xargs_argv_tail.insert(index, "--")
+            break
+        index += 2 if (arg in XARGS_VALUED_OPTIONS) else 1
+
+    args = argdoc.parse_args(xargs_argv_tail)
+
+    # Choose how to batch the words
+
+    try:
+        max_args = None if (args.max_args is None) else int(args.max_args)
+        max_chars = None if (args.max_chars is None) else int(args.max_chars)
+        max_procs = 1 if (args.max_procs is None) else int(args.max_procs)
+    except ValueError as exc:
+        stderr_print("xargs.py: error: {}".format(exc))
+        sys.exit(2)  # exit 2 from rejecting usage
+
+    if ((max_args is not None) and (max_args < 1)) or (max_procs < 1):
+        stderr_print("xargs.py: error: choose -n 1 or more, and -P 1 or more")
+        sys.exit(2)  # exit 2 from rejecting usage
+
+    if max_chars is None:
+        max_chars = find_default_max_chars()
+
+    command = list(os.fsencode(_) for _ in args.words)
+
+    # Split the input into words or lines, and batch them into commands
+
+    prompt_tty_stdin()
+
+    sep = b"\x00" if args.null else None
+    fd = sys.stdin.fileno()
+
+    if args.I is None:
+        words = iter_words(fd, sep=sep)
+        batches = iter_batches(
+            words, command=command, max_args=max_args, max_chars=max_chars
+        )
+    else:
+        replstr = os.fsencode(args.I)
+        command = command if command else [replstr]
+        lines = iter_words(fd, sep=(sep if sep else b"\n"))
+        batches = iter_replaced_batches(lines, command=command, replstr=replstr)
+
+    # Run each command, or else echo each batch of words
+
+    try:
+        if not args.words:
+            exit_status = echo_batches(batches)
+        else:
+            exit_status = run_batches(
+                batches,
+                max_procs=max_procs,
+                keeping_order=args.keep_order,
+                verbose=args.verbose,
+            )
+    except ValueError as exc:
+        stderr_print("xargs.py: error: {}".format(exc))
+        exit_status = 1
+
+    return exit_status
+
+
+def find_default_max_chars():
+    """Guess how many bytes of args we can pass, after the environment and some headroom"""
+
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, ValueError, OSError):
+        arg_max = ARG_MAX_CEILING
+
+    environ_size = sum((len(k) + len(v) + 2) for (k, v) in os.environb.items())
+    max_chars = arg_max - environ_size - ARG_MAX_HEADROOM
+
+    return max(1, min(max_chars, ARG_MAX_CEILING))
+
+
+def iter_words(fd, sep):
+    """Yield each word of input, split at whitespace or at the separator, as it arrives"""
+
+    held = b""
+    while True:
+        chunk = os.read(fd, CHUNK_SIZE)
+        if not chunk:
+            break
+
+        data = held + chunk
+
+        # Hold back the last word, when the chunk may have cut it short
+
+        if sep is not None:
+            words = data.split(sep)
+            held = words.pop()
+        else:
+            words = data.split()
+            held = b""
+            if words and not data[-1:].isspace():
+                held = words.pop()
+
+        for word in words:
+            yield word
+
+    if held:
+        yield held
+
+
+def iter_batches(words, command, max_args, max_chars):
+    """Yield the words of each command, with no more words nor bytes than fit"""
+
+    base_size = sum((len(_) + 1) for _ in command)
+
+    batch = list()
+    size = base_size
+    for word in words:
+        word_size = len(word) + 1
+
+        if batch:
+            if (max_args and (len(batch) >= max_args)) or (
+                (size + word_size) > max_chars
+            ):
+                yield command + batch
+                batch = list()
+                size = base_size
+
+        if (base_size + word_size) > max_chars:
+            raise ValueError("argument line too long")
+
+        batch.append(word)
+        size += word_size
+
+    if batch:
+        yield command + batch
+
+
+def iter_replaced_batches(lines, command, replstr):
+    """Yield the words of one command per line, with the line in place of the replstr"""
+
+    for line in lines:
+        arg = line.lstrip()
+        if arg:
+            yield list(_.replace(replstr, arg) for _ in command)
+
+
+def echo_batches(batches):
+    """Write the words of each command as one line, in place of running echo"""
+
+    ofile = sys.stdout.buffer
+    for argv in batches:
+        ofile.write(b" ".join(argv) + b"\n")
+    ofile.flush()
+
+
+def run_batches(batches, max_procs, keeping_order, verbose):
+    """Run a command for each batch, a few at a time, and return an exit status"""
+
+    exit_status = None
+    ofile = sys.stdout.buffer
+    capturing = keeping_order and (max_procs > 1)
+
+    with concurrent.futures.ThreadPoolExecutor(max_procs) as executor:
+
+        futures = list()
+        for argv in batches:
+
+            if verbose:
+                stderr_print(" ".join(os.fsdecode(_) for _ in argv))
+
+            future = executor.submit(run_argv, argv, capturing=capturing)
+            futures.append(future)
+
+            # Wait for the oldest command, else for any command, when enough are running
+
+            if capturing:
+                while len(futures) >= (2 * max_procs):
+                    exit_status = (
+                        take_result(futures.pop(0), ofile=ofile) or exit_status
+                    )
+            else:
+                while len(futures) >= max_procs:
+                    (done, _) = concurrent.futures.wait(
+                        futures, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        futures.remove(future)
+                        exit_status = take_result(future, ofile=ofile) or exit_status
+
+            if exit_status in (124, 125, 126, 127):
+                break
+
+        for future in futures:
+            exit_status = take_result(future, ofile=ofile) or exit_status
+
+    return exit_status
+
+
+def run_argv(argv, capturing):
+    """Run one command, and return its returncode and its captured output, if any"""
+
+    stdout = subprocess.PIPE if capturing else None
+    try:
+        run = subprocess.run(argv, stdin=subprocess.DEVNULL, stdout=stdout)
+    except FileNotFoundError as exc:
+        return (127, b"", exc)
+    except PermissionError as exc:
+        return (126, b"", exc)
+
+    return (run.returncode, run.stdout, None)
+
+
+def take_result(future, ofile):
+    """Write out the captured output of a command, and return its exit status"""
+
+    (returncode, stdout, exc) = future.result()
+
+    if stdout:
+        ofile.write(stdout)
+        ofile.flush()
+
+    if exc is not None:
+        stderr_print("xargs.py: error: {}: {}".format(type(exc).__name__, exc))
+        return returncode
+
+    if returncode == 255:
+        stderr_print("xargs.py: error: command exited with status 255; aborting")
+        return 124
+    if returncode < 0:
+        signame = signal.Signals(-returncode).name
+        stderr_print("xargs.py: error: command killed by signal {}".format(signame))
+        return 125
+    if returncode:
+        return 123
+
+    return None
+
+
+#
+# Define some Python idioms
+#
+
+
+# deffed in many files  # missing from docs.python.org
+def prompt_tty_stdin():
+    if sys.stdin.isatty():
+        stderr_print("Press ⌃D EOF to quit")
+
+
+# deffed in many files  # missing from docs.python.org
+def stderr_print(*args):
+    """Print the Args, but to Stderr, not to Stdout"""
+
+    sys.stdout.flush()
+    print(*args, file=sys.stderr)
+    sys.stderr.flush()  # like for kwargs["end"] != "\n"
+
+
+# deffed in many files  # missing from docs.python.org
+class BrokenPipeErrorSink(contextlib.ContextDecorator):
+    """Cut unhandled BrokenPipeError down to sys.exit(1)
+
+    Test with large Stdout cut sharply, such as:  find.py ~ |head
 
-    stdin = sys.stdin.read()
+    More narrowly than:  signal.signal(signal.SIGPIPE, handler=signal.SIG_DFL)
+    As per https://docs.python.org/3/library/signal.html#note-on-sigpipe
+    """
 
-    words = stdin.split()
-    len_words = len(words)
-    words_per_line = len_words if (args.max_args is None) else int(args.max_args)
+    def __enter__(self):
+        return self
 
-    if len_words:
-        for index in range(0, len_words, words_per_line):
+    def __exit__(self, *exc_info):
+        (_, exc, _) = exc_info
+        if isinstance(exc, BrokenPipeError):  # catch this one
 
-            argv_tail = words[index:][:words_per_line]
+            null_fileno = os.open(os.devnull, flags=os.O_WRONLY)
+            os.dup2(null_fileno, sys.stdout.fileno())  # avoid the next one
 
-            stdout = "{}\n".format(" ".join(argv_tail))
-            sys.stdout.write(stdout)
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    with BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
 
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git
@@ -1,8 +1,57 @@
 #!/usr/bin/env python3
 
+"""
+usage: zcat.py [-h] [FILE ...]
+
+expand each ".gz" file to stdout, or copy it out as is, if not gzip'ped
+
+positional arguments:
+  FILE        a file to expand (default: stdin)
+
+options:
+  -h, --help  show this help message and exit
+
+quirks:
+  runs like 'gzip_.py -dcf'
+  expands each of the gzip members of a file, one after another
+  copies out input that's not gzip'ped, like Linux 'zcat -f', unlike Mac 'zcat'
+
+unsurprising quirks:
+  prompts for stdin, like mac bash "grep -R .", unlike bash "zcat"
+  accepts the "stty -a" line-editing c0-control's, not also the "bind -p" c0-control's
+  takes "-" as meaning "/dev/stdin", like linux "zcat -"
+
+examples:
+  zcat.py a.gz  # expand to stdout
+  cat a.gz b.gz |zcat.py  # expand each of the gzip members
+  zcat.py zcat.py  # copy out as is
+"""
+
+
 import sys
 
-sys.stderr.write("zcat.py: error: not implemented\n")
-sys.exit(2)  # exit 2 from rejecting usage
+import argdoc
+import gzip_
+
+
+def main(argv):
+
+    args = argdoc.parse_args(argv[1:])
+
+    args.stdout = True
+    args.decompress = True
+    args.force = True
+    args.keep = True
+    args.level = None
+    args.processes = None
+    args.rsyncable = False
+
+    return gzip_.gzip_paths(args.files, args=args)
+
+
+if __name__ == "__main__":
+    with gzip_.BrokenPipeErrorSink():
+        sys.exit(main(sys.argv))
+
 
 # copied from:  git clone https://github.com/pelavarre/pybashish.git